@@ -1,6 +1,11 @@
 """
 ASGI config for elms project.
 It exposes the ASGI callable as a module-level variable named ``application``.
+
+The read-heavy hr views (dashboard, lists, exports, employee lookups) are
+async, so under an ASGI server such as ``uvicorn elms.asgi:application``
+one process keeps serving small lookups while exports stream. Compare with
+the WSGI profile using ``manage.py benchmark_load``.
 """
 
 import os
@@ -40,6 +40,8 @@ INSTALLED_APPS = [
 # ---------------------------------------------------------------------
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'hr.staticfiles.StaticFilesMiddleware',  # STATIC_ROOT with far-future caching, when HR_STATIC_SERVE is on
+    'hr.perf.PerfMiddleware',  # per-view latency/query stats, see /admin/perf/
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -49,6 +51,26 @@ MIDDLEWARE = [
     'django_htmx.middleware.HtmxMiddleware',  # HTMX support
 ]
 
+# HR_FAST_AUTH=cached_db or =signed_cookies keeps the session and user
+# lookups of every request (HTMX fragments included) off the database (see
+# hr.auth). cached_db reads sessions from the cache and writes them through
+# to the database; signed_cookies keeps them in the cookie itself, so they
+# can't be revoked server-side before they expire. Users are cached for
+# HR_USER_CACHE_TIMEOUT seconds and dropped from the cache when saved, which
+# needs a shared cache backend (see CACHES below); startup fails without one.
+# Switching the session engine logs everyone out once.
+HR_FAST_AUTH = os.environ.get('HR_FAST_AUTH', '')
+HR_USER_CACHE_TIMEOUT = 5 * 60
+if HR_FAST_AUTH:
+    SESSION_ENGINE = f'django.contrib.sessions.backends.{HR_FAST_AUTH}'
+    AUTHENTICATION_BACKENDS = [
+        'hr.auth.CachedUserBackend',
+        'django.contrib.auth.backends.ModelBackend',  # sessions started before the switch
+    ]
+    MIDDLEWARE[MIDDLEWARE.index('django.contrib.auth.middleware.AuthenticationMiddleware')] = (
+        'hr.auth.AuthenticationMiddleware'
+    )
+
 ROOT_URLCONF = 'elms.urls'
 
 
@@ -71,19 +93,155 @@ TEMPLATES = [
     },
 ]
 
+# DJANGO_TEMPLATE_PROFILE=production pins the cached loader (compiled
+# templates stay in memory and are never re-checked on disk), turns off
+# template debug info and compiles every hr template at startup, so the
+# first request to each page doesn't pay for parsing.
+HR_TEMPLATE_PROFILE = os.environ.get('DJANGO_TEMPLATE_PROFILE', 'development')
+HR_TEMPLATE_WARMUP = HR_TEMPLATE_PROFILE == 'production'
+if HR_TEMPLATE_PROFILE == 'production':
+    TEMPLATES[0]['APP_DIRS'] = False
+    TEMPLATES[0]['OPTIONS']['debug'] = False
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+
 WSGI_APPLICATION = 'elms.wsgi.application'
 
 
 # ---------------------------------------------------------------------
 # Database
 # ---------------------------------------------------------------------
-DATABASES = {
+# SQLite by default. Set DJANGO_DB_ENGINE=postgresql (plus DJANGO_DB_NAME,
+# _USER, _PASSWORD, _HOST, _PORT) for production. Connections are kept for
+# DJANGO_DB_CONN_MAX_AGE seconds and health-checked before reuse;
+# DJANGO_DB_POOL=1 uses psycopg's connection pool instead (psycopg 3 with
+# psycopg[pool] installed).
+#
+# SQLite connections run in WAL mode so readers never block the writer,
+# wait up to DJANGO_DB_TIMEOUT seconds for a lock instead of failing with
+# "database is locked", and take the write lock when a transaction starts
+# (IMMEDIATE) rather than failing when a read transaction tries to upgrade.
+DB_ENGINE = os.environ.get('DJANGO_DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DJANGO_DB_NAME', 'elms'),
+            'USER': os.environ.get('DJANGO_DB_USER', ''),
+            'PASSWORD': os.environ.get('DJANGO_DB_PASSWORD', ''),
+            'HOST': os.environ.get('DJANGO_DB_HOST', ''),
+            'PORT': os.environ.get('DJANGO_DB_PORT', ''),
+            'CONN_MAX_AGE': int(os.environ.get('DJANGO_DB_CONN_MAX_AGE', 60)),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
+    }
+    if os.environ.get('DJANGO_DB_POOL') == '1':
+        # pooled connections are returned after each request, so persistent ones are not allowed
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.environ.get('DJANGO_DB_POOL_MIN', 2)),
+            'max_size': int(os.environ.get('DJANGO_DB_POOL_MAX', 10)),
+        }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DJANGO_DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'CONN_MAX_AGE': int(os.environ.get('DJANGO_DB_CONN_MAX_AGE', 60)),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'timeout': int(os.environ.get('DJANGO_DB_TIMEOUT', 20)),
+                'transaction_mode': 'IMMEDIATE',
+                'init_command': (
+                    'PRAGMA journal_mode=WAL;'
+                    'PRAGMA synchronous=NORMAL;'
+                    'PRAGMA temp_store=MEMORY;'
+                    'PRAGMA mmap_size=134217728;'  # 128 MiB
+                    'PRAGMA cache_size=-20000;'    # ~20 MiB
+                ),
+            },
+        }
+    }
+
+
+# ---------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------
+# Local memory by default (and in tests); point DJANGO_CACHE_BACKEND at
+# e.g. django.core.cache.backends.filebased.FileBasedCache or
+# django.core.cache.backends.redis.RedisCache with DJANGO_CACHE_LOCATION
+# so every worker process shares one cache in production. Local memory
+# can't see invalidations made by other processes, so the response cache
+# (hr.caching) and HR_FAST_AUTH are only available with a shared backend.
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': os.environ.get('DJANGO_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('DJANGO_CACHE_LOCATION', 'elms'),
     }
 }
 
+# Lifetime of cached list/dashboard/export responses (hr.caching); entries
+# are also invalidated as soon as a row in their period changes.
+HR_CACHE_TIMEOUT = int(os.environ.get('HR_CACHE_TIMEOUT', 60 * 60))
+# Streamed exports larger than this are served but not cached.
+HR_CACHE_MAX_STREAM_SIZE = 5 * 1024 * 1024
+
+# Rendered list rows (hr.fragments). Keys include the row's updated_at, so
+# edits never serve a stale row and old entries simply age out.
+HR_FRAGMENT_CACHE_TIMEOUT = 24 * 60 * 60
+
+# The Attendance and Salary admin changelists take their row count from the
+# rollups, instead of COUNT(*), once it reaches this many rows.
+HR_ADMIN_ROLLUP_COUNT_FROM = 10_000
+
+# Employee ID lookups (hr.lookups): per-process LRU size and lifetime, shared
+# cache lifetime, and how long browsers may reuse a lookup response.
+HR_LOOKUP_LRU_SIZE = 2048
+HR_LOOKUP_LRU_TTL = 30
+HR_LOOKUP_CACHE_TIMEOUT = 60 * 60
+HR_LOOKUP_MAX_AGE = 60
+
+# Worker processes used to convert bulk letters to PDF (hr.letters).
+HR_LETTER_PDF_WORKERS = int(os.environ.get('HR_LETTER_PDF_WORKERS', os.cpu_count() or 1))
+
+# The change feed (export/<kind>/changes/) only returns changes at least
+# this many seconds old, so rows from transactions still committing are
+# picked up by the next sync instead of being skipped.
+HR_CHANGE_FEED_LAG = 5
+
+# Background jobs (hr.jobs, manage.py run_hr_worker). Results are written
+# under MEDIA_ROOT/HR_JOB_DIR. Failed jobs are retried after
+# HR_JOB_RETRY_DELAY seconds, doubling on each attempt. Running jobs with
+# no heartbeat for HR_JOB_STALE_AFTER seconds are requeued. Finished jobs
+# and their files are deleted HR_JOB_RETENTION seconds after they end; the
+# workers check every HR_JOB_PURGE_INTERVAL seconds (or run
+# `manage.py purge_hr_jobs` from cron).
+HR_JOB_WORKERS = int(os.environ.get('HR_JOB_WORKERS', 2))
+HR_JOB_POLL_INTERVAL = 1.0
+HR_JOB_MAX_ATTEMPTS = 3
+HR_JOB_RETRY_DELAY = 30
+HR_JOB_STALE_AFTER = 5 * 60
+HR_JOB_DIR = 'hr_jobs'
+HR_JOB_RETENTION = int(os.environ.get('HR_JOB_RETENTION', 7 * 24 * 60 * 60))
+HR_JOB_PURGE_INTERVAL = 60 * 60
+
+# Request instrumentation (hr.perf). The last HR_PERF_BUFFER_SIZE requests
+# are kept in memory for /admin/perf/; set HR_PERF_LOG_FILE to also append
+# every request as a JSON line. HR_PERF_QUERY_BUDGETS maps view names
+# ('hr:employee_list', or '*' for any view) to a query limit; with
+# HR_PERF_STRICT on (e.g. in tests) going over it raises an error.
+HR_PERF_ENABLED = os.environ.get('HR_PERF_ENABLED', '1') == '1'
+HR_PERF_BUFFER_SIZE = 5000
+HR_PERF_LOG_FILE = os.environ.get('HR_PERF_LOG_FILE', '')
+HR_PERF_STRICT = os.environ.get('HR_PERF_STRICT', '0') == '1'
+HR_PERF_QUERY_BUDGETS = {}
+
 
 # ---------------------------------------------------------------------
 # Password validation
@@ -126,6 +284,33 @@ STATICFILES_DIRS = [
 # Final collected static files (after running collectstatic)
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
+# DJANGO_STATIC_PROFILE=production makes collectstatic store every file
+# under a content-hashed name with .gz (and, with the brotli package, .br)
+# copies next to it, and serves STATIC_ROOT from the app itself
+# (hr.staticfiles.StaticFilesMiddleware): hashed names are cached by
+# browsers for HR_STATIC_MAX_AGE and never revalidated. Set
+# HR_STATIC_SERVE=0 when a web server in front serves STATIC_ROOT instead.
+# Release builds run `manage.py vendor_static` before collectstatic to
+# serve Bootstrap, Font Awesome, htmx, particles.js and Chart.js locally
+# instead of from their CDNs; `check --deploy` fails in production without
+# them.
+HR_STATIC_PROFILE = os.environ.get('DJANGO_STATIC_PROFILE', 'development')
+HR_STATIC_SERVE = os.environ.get('HR_STATIC_SERVE', '1' if HR_STATIC_PROFILE == 'production' else '0') == '1'
+HR_STATIC_MAX_AGE = 365 * 24 * 60 * 60
+HR_STATIC_UNHASHED_MAX_AGE = 60 * 60
+HR_STATIC_COMPRESS_MIN_SIZE = 512
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'hr.staticfiles.CompressedManifestStaticFilesStorage' if HR_STATIC_PROFILE == 'production'
+            else 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        ),
+    },
+}
+
 # Media (user-uploaded content)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / "media"
@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from hr.views import perf_report
 
 # Admin branding
 admin.site.site_header = "MARS BPO Admin"
@@ -9,6 +10,7 @@ admin.site.site_title = "MARS BPO Portal"
 admin.site.index_title = "Welcome to MARS BPO"
 
 urlpatterns = [
+    path('admin/perf/', perf_report, name='perf_report'),  # per-view latency/query report
     path('admin/', admin.site.urls),
     path('', include(('hr.urls', 'hr'), namespace='hr')),  # HR app routes
 ]
@@ -1,5 +1,14 @@
-from django.contrib import admin
-from .models import Employee, Attendance, Salary
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.admin.views.main import (
+    ALL_VAR, ERROR_FLAG, IS_FACETS_VAR, IS_POPUP_VAR, ORDER_VAR, PAGE_VAR, SEARCH_VAR, TO_FIELD_VAR,
+)
+from django.core.paginator import Paginator
+
+from .caching import invalidate_periods
+from .models import Employee, Attendance, Salary, SalaryPayment, Job, MonthlyRollup
+from .payroll import mark_paid
+from .rollups import rebuild_rollups, rollup_row_count
 
 @admin.register(Employee)
 class EmployeeAdmin(admin.ModelAdmin):
@@ -8,17 +17,160 @@ class EmployeeAdmin(admin.ModelAdmin):
     search_fields = ('employee_id', 'name', 'cnic')
     list_editable = ('is_active',)
 
-@admin.register(Attendance)
-class AttendanceAdmin(admin.ModelAdmin):
-    list_display = ('employee', 'month', 'year', 'total_days', 'leaves', 'present_days')
-    list_filter = ('month', 'year', 'employee__designation')
+
+# ------------------- LARGE PERIOD TABLES -------------------
+# Attendance and Salary grow by one row per employee per month, so their
+# changelists avoid anything that scans the table: the employee is joined
+# into the page query, filter choices come from small tables, and
+# unfiltered or period-filtered pages take their count from the rollups.
+
+class PeriodYearFilter(admin.SimpleListFilter):
+    """Years listed from the rollup table instead of SELECT DISTINCT over every row."""
+    title = 'year'
+    parameter_name = 'year'
+
+    def lookups(self, request, model_admin):
+        years = MonthlyRollup.objects.order_by('-year').values_list('year', flat=True).distinct()
+        return [(str(year), str(year)) for year in years]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(year=self.value())
+        return queryset
+
+class DesignationFilter(admin.SimpleListFilter):
+    """Designations listed from the employee table instead of joining every row."""
+    title = 'designation'
+    parameter_name = 'designation'
+
+    def lookups(self, request, model_admin):
+        designations = (Employee.objects.exclude(designation__isnull=True).exclude(designation='')
+                        .order_by('designation').values_list('designation', flat=True).distinct())
+        return [(designation, designation) for designation in designations]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(employee__designation=self.value())
+        return queryset
+
+
+class EstimatedCountPaginator(Paginator):
+    def __init__(self, object_list, per_page, count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.estimated_count = count
+
+    @property
+    def count(self):
+        return self.estimated_count
+
+# query string parameter -> rollup_row_count() argument
+ROLLUP_COUNT_FILTERS = {'year': 'year', 'month__exact': 'month', 'status__exact': 'status'}
+NON_FILTER_PARAMS = {ALL_VAR, ERROR_FLAG, IS_FACETS_VAR, IS_POPUP_VAR, ORDER_VAR, PAGE_VAR, SEARCH_VAR, TO_FIELD_VAR}
+
+class PeriodTableAdmin(admin.ModelAdmin):
+    list_select_related = ('employee',)  # the row checkbox label uses __str__, which reads the employee
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
     search_fields = ('employee__name', 'employee__employee_id')
     autocomplete_fields = ('employee',)
+    actions = ['regenerate_rollups']
+    cache_kind = None
+
+    @admin.display(description='employee ID', ordering='employee__employee_id')
+    def employee_code(self, obj):
+        return obj.employee.employee_id
+
+    @admin.display(description='name', ordering='employee__name')
+    def employee_name(self, obj):
+        return obj.employee.name
+
+    def rollup_count(self, request):
+        """Row count from the rollups when only period/status filters are applied, else None."""
+        filters = {}
+        for key, value in request.GET.items():
+            if key in ROLLUP_COUNT_FILTERS:
+                filters[ROLLUP_COUNT_FILTERS[key]] = value
+            elif key == SEARCH_VAR and value:
+                return None
+            elif key not in NON_FILTER_PARAMS:
+                return None
+        try:
+            for key in ('year', 'month'):
+                if key in filters:
+                    filters[key] = int(filters[key])
+        except ValueError:
+            return None
+        return rollup_row_count(self.model, **filters)
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        count = self.rollup_count(request)
+        if count is not None and count >= settings.HR_ADMIN_ROLLUP_COUNT_FROM:
+            return EstimatedCountPaginator(
+                queryset, per_page, count, orphans=orphans, allow_empty_first_page=allow_empty_first_page,
+            )
+        return super().get_paginator(request, queryset, per_page, orphans, allow_empty_first_page)
+
+    @admin.action(description='Regenerate rollups for the selected periods')
+    def regenerate_rollups(self, request, queryset):
+        periods = list(queryset.order_by().values_list('year', 'month').distinct())
+        count = rebuild_rollups(periods)
+        invalidate_periods(self.cache_kind, periods)
+        self.message_user(request, f"Rebuilt {count} monthly rollup(s).", messages.SUCCESS)
+
+@admin.register(Attendance)
+class AttendanceAdmin(PeriodTableAdmin):
+    list_display = ('employee_code', 'employee_name', 'month', 'year', 'total_days', 'leaves', 'present_days')
+    list_filter = ('month', PeriodYearFilter, DesignationFilter)
+    cache_kind = 'attendance'
+
+class SalaryPaymentInline(admin.TabularInline):
+    """The ledger is append-only: payments are posted from the salary list or a bank file."""
+    model = SalaryPayment
+    fields = ('paid_on', 'amount', 'reference', 'batch', 'recorded_by', 'created_at')
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
 
 @admin.register(Salary)
-class SalaryAdmin(admin.ModelAdmin):
-    list_display = ('employee', 'month', 'year', 'total_salary', 'received_salary', 'status', 'payment_date')
-    list_filter = ('status', 'month', 'year', 'payment_date')
-    search_fields = ('employee__name', 'employee__employee_id')
-    autocomplete_fields = ('employee',)
-    readonly_fields = ('created_at', 'updated_at')
\ No newline at end of file
+class SalaryAdmin(PeriodTableAdmin):
+    list_display = ('employee_code', 'employee_name', 'month', 'year', 'total_salary', 'received_salary', 'status', 'payment_date')
+    list_filter = ('status', 'month', PeriodYearFilter, 'payment_date')
+    readonly_fields = ('received_salary', 'status', 'created_at', 'updated_at')
+    inlines = [SalaryPaymentInline]
+    actions = ['mark_selected_paid', 'regenerate_rollups']
+    cache_kind = 'salary'
+
+    @admin.action(description='Mark selected salaries as paid in full')
+    def mark_selected_paid(self, request, queryset):
+        updated = mark_paid(queryset, user=request.user)
+        self.message_user(request, f"Marked {updated} salary row(s) as paid.", messages.SUCCESS)
+
+@admin.register(SalaryPayment)
+class SalaryPaymentAdmin(admin.ModelAdmin):
+    list_display = ('salary', 'amount', 'paid_on', 'reference', 'batch', 'recorded_by', 'created_at')
+    list_filter = ('paid_on',)
+    list_select_related = ('salary__employee', 'recorded_by')
+    search_fields = ('reference', 'batch', 'salary__employee__employee_id')
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'status', 'progress', 'attempts', 'worker', 'created_by', 'created_at', 'finished_at')
+    list_filter = ('status', 'kind')
+    list_select_related = ('created_by',)
+    readonly_fields = ('created_at', 'finished_at', 'heartbeat_at', 'worker', 'file', 'error')
@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class HrConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'hr'
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401
+        if settings.HR_TEMPLATE_WARMUP:
+            from .fragments import warmup_templates
+            warmup_templates()
@@ -0,0 +1,86 @@
+"""
+Fast authentication path, switched on with HR_FAST_AUTH (see settings).
+
+With the database session backend and ModelBackend, every request, HTMX
+fragments included, reads its session row and its User row before the
+view runs. In fast mode:
+
+- sessions come from the cache (``cached_db``, written through to the
+  database) or from the signed cookie itself (``signed_cookies``);
+- ``CachedUserBackend`` keeps users in the cache for
+  HR_USER_CACHE_TIMEOUT seconds. Saving or deleting a user drops the entry
+  (hr.signals), so deactivation and password changes apply on the next
+  request; the session auth hash is still checked against the cached user.
+  That only holds when every process shares the cache, so fast mode refuses
+  to start with a per-process one (hr.caching.shared_cache);
+- ``AuthenticationMiddleware`` memoizes one user per request for both
+  ``request.user`` and ``request.auser()``. Django keeps a separate copy
+  for each, so an async view whose template reads ``user`` looks it up
+  twice.
+
+Sessions are only written when the view changed them
+(SESSION_SAVE_EVERY_REQUEST stays off).
+"""
+from functools import partial
+
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.middleware import AuthenticationMiddleware as DjangoAuthenticationMiddleware
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.functional import SimpleLazyObject
+
+from .caching import KEY_PREFIX, shared_cache
+
+
+def user_cache_key(user_id):
+    return f'{KEY_PREFIX}:user:{user_id}'
+
+def forget_user(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+class CachedUserBackend(ModelBackend):
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, timeout=settings.HR_USER_CACHE_TIMEOUT)
+        return user
+
+    async def aget_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = await cache.aget(key)
+        if user is None:
+            user = await super().aget_user(user_id)
+            if user is not None:
+                await cache.aset(key, user, timeout=settings.HR_USER_CACHE_TIMEOUT)
+        return user
+
+
+def get_user(request):
+    if not hasattr(request, '_cached_user'):
+        request._cached_user = auth.get_user(request)
+    return request._cached_user
+
+async def auser(request):
+    if not hasattr(request, '_cached_user'):
+        request._cached_user = await auth.aget_user(request)
+    return request._cached_user
+
+class AuthenticationMiddleware(DjangoAuthenticationMiddleware):
+    def __init__(self, get_response):
+        if not shared_cache():
+            raise ImproperlyConfigured(
+                "HR_FAST_AUTH needs a cache shared by every process (DJANGO_CACHE_BACKEND); with "
+                f"{settings.CACHES['default']['BACKEND']} a user saved in one worker stays cached in the others."
+            )
+        super().__init__(get_response)
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_user(request))
+        request.auser = partial(auser, request)
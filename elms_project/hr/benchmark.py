@@ -0,0 +1,378 @@
+"""
+Benchmark runner for the HR views.
+
+Each scenario drives a real URL from hr/urls.py through the Django test
+client as a logged-in staff user, and streamed responses are read to the
+end. Per scenario it reports throughput, latency percentiles and query
+counts, plus the process's peak RSS. Everything runs inside one transaction
+that is rolled back at the end, so the create/edit scenarios leave the
+database as they found it.
+
+``run_write_benchmark`` measures write throughput with N concurrent writers,
+which is where SQLite's journal mode and lock timeout show, and
+``run_load_test`` drives a running server (WSGI or ASGI) over HTTP.
+
+Run ``manage.py seed_hr`` first to get a dataset of the size you care about.
+"""
+import platform
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from contextlib import nullcontext
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connection, connections, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from .caching import invalidate_kind
+from .models import Attendance, Employee, MONTH_NAMES, Salary
+from .perf import percentile
+
+
+class Rollback(Exception):
+    pass
+
+
+class Scenario:
+    def __init__(self, name, path, method='get', data=None, htmx=False):
+        self.name = name
+        self.path = path   # context -> URL
+        self.method = method
+        self.data = data   # (context, iteration) -> POST data
+        self.htmx = htmx
+
+    def request(self, client, context, iteration):
+        headers = {'HX-Request': 'true'} if self.htmx else {}
+        data = self.data(context, iteration) if self.data else None
+        return getattr(client, self.method)(self.path(context), data, headers=headers)
+
+
+def employee_form_data(context, iteration, employee_id=None):
+    return {
+        'employee_id': employee_id or f"BENCH-{context['token']}-{iteration}",
+        'name': 'Benchmark Employee',
+        'designation': 'Customer Service Agent',
+        'date_joined': '2024-01-01',
+        'base_salary': '50000',
+        'is_active': 'on',
+    }
+
+def grid_form_data(context, iteration):
+    data = {'year': context['year'], 'month': context['month']}
+    for pk in context['batch_pks']:
+        data[f'cell-{pk}-leaves'] = iteration % 3
+    return data
+
+def period_query(context):
+    return f"year={context['year']}&month={context['month']}"
+
+SCENARIOS = [
+    Scenario('dashboard', lambda c: reverse('hr:dashboard')),
+    Scenario('employee_list', lambda c: reverse('hr:employee_list')),
+    Scenario('employee_search', lambda c: reverse('hr:employee_list') + f"?q={c['search']}"),
+    Scenario('employee_list_htmx', lambda c: reverse('hr:employee_list'), htmx=True),
+    Scenario('attendance_list', lambda c: reverse('hr:attendance_list') + '?' + period_query(c)),
+    Scenario('salary_list', lambda c: reverse('hr:salary_list') + '?' + period_query(c)),
+    Scenario('salary_list_htmx', lambda c: reverse('hr:salary_list') + '?' + period_query(c), htmx=True),
+    Scenario('export_employees', lambda c: reverse('hr:export_employees_csv')),
+    Scenario('export_attendance', lambda c: reverse('hr:export_attendance_csv') + '?' + period_query(c)),
+    Scenario('export_salary', lambda c: reverse('hr:export_salary_csv') + '?' + period_query(c)),
+    Scenario('employee_timeline', lambda c: reverse('hr:employee_timeline', args=[c['employee_pk']])),
+    Scenario('chart_series', lambda c: reverse('hr:chart_series') + f"?from={c['year'] - 1}&to={c['year']}"),
+    Scenario('attendance_grid', lambda c: reverse('hr:attendance_grid') + '?' + period_query(c)),
+    Scenario('attendance_grid_save', lambda c: reverse('hr:attendance_grid'), 'post', grid_form_data, htmx=True),
+    Scenario('employee_create', lambda c: reverse('hr:employee_create'), 'post', employee_form_data, htmx=True),
+    Scenario(
+        'employee_edit', lambda c: reverse('hr:employee_edit', args=[c['employee_pk']]), 'post',
+        lambda c, i: employee_form_data(c, i, employee_id=c['employee_id']), htmx=True,
+    ),
+    Scenario(
+        'generate_letter', lambda c: reverse('hr:generate_letter'), 'post',
+        lambda c, i: {'employee_id': c['employee_id'], 'letter_type': 'experience_letter'},
+    ),
+    Scenario(
+        'generate_letters_bulk', lambda c: reverse('hr:generate_letters_bulk'), 'post',
+        lambda c, i: {'employee_ids': ' '.join(c['batch_ids']), 'letter_type': 'offer_letter', 'format': 'html'},
+    ),
+]
+
+
+# ------------------- ENVIRONMENT -------------------
+def peak_rss_bytes():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def client_host():
+    hosts = [host for host in settings.ALLOWED_HOSTS if host != '*' and not host.startswith('.')]
+    return hosts[0] if hosts else 'localhost'
+
+def build_context():
+    employee = Employee.objects.order_by('pk').first()
+    latest = Attendance.objects.order_by('-year', '-month').values('year', 'month').first()
+    if employee is None or latest is None:
+        raise ValueError("The database has no employees or attendance; run manage.py seed_hr first.")
+    return {
+        'token': uuid.uuid4().hex[:8],
+        'employee_pk': employee.pk,
+        'employee_id': employee.employee_id,
+        'search': employee.name.split()[0],
+        'year': latest['year'],
+        'month': latest['month'],
+        'batch_ids': list(Employee.objects.order_by('pk').values_list('employee_id', flat=True)[:50]),
+        'batch_pks': list(Employee.objects.order_by('pk').values_list('pk', flat=True)[:50]),
+    }
+
+
+# ------------------- RUNNING -------------------
+def run_scenario(client, scenario, context, iterations, warmup):
+    for iteration in range(warmup):
+        consume(scenario.request(client, context, -1 - iteration))
+
+    latencies, queries, errors = [], [], 0
+    started = time.perf_counter()
+    for iteration in range(iterations):
+        with CaptureQueriesContext(connection) as captured:
+            request_started = time.perf_counter()
+            response = scenario.request(client, context, iteration)
+            consume(response)
+            latencies.append((time.perf_counter() - request_started) * 1000)
+        queries.append(len(captured))
+        if response.status_code >= 400:
+            errors += 1
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': iterations,
+        'errors': errors,
+        'throughput_rps': iterations / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 0.50),
+        'p95_ms': percentile(latencies, 0.95),
+        'p99_ms': percentile(latencies, 0.99),
+        'max_ms': latencies[-1] if latencies else 0.0,
+        'avg_queries': sum(queries) / len(queries) if queries else 0.0,
+        'max_queries': max(queries, default=0),
+    }
+
+def consume(response):
+    if response.streaming:
+        for _ in response.streaming_content:
+            pass
+    return response
+
+NO_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+def run_benchmark(iterations=20, warmup=2, only=None, use_cache=True):
+    """
+    Run every scenario (or those named in ``only``) ``iterations`` times after
+    ``warmup`` untimed requests. Without ``use_cache`` the response cache is
+    swapped for a dummy one, so every request takes the full render path.
+    The returned dict is JSON-serialisable.
+    """
+    scenarios = [scenario for scenario in SCENARIOS if not only or scenario.name in only]
+    results = {}
+    try:
+        with nullcontext() if use_cache else override_settings(CACHES=NO_CACHE), transaction.atomic():
+            user = get_user_model().objects.create_superuser(f'hr-benchmark-{uuid.uuid4().hex[:8]}', password=None)
+            client = Client(SERVER_NAME=client_host())
+            client.force_login(user)
+            context = build_context()
+            for scenario in scenarios:
+                results[scenario.name] = run_scenario(client, scenario, context, iterations, warmup)
+            dataset = {
+                'employees': Employee.objects.count(),
+                'attendance': Attendance.objects.count(),
+                'salary': Salary.objects.count(),
+                'period': f"{MONTH_NAMES[context['month']]} {context['year']}",
+            }
+            raise Rollback
+    except Rollback:
+        pass
+    finally:
+        # responses cached during the run may show rows that were rolled back
+        for kind in ('employee', 'attendance', 'salary'):
+            invalidate_kind(kind)
+
+    return {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'iterations': iterations,
+        'cache': use_cache,
+        'dataset': dataset,
+        'peak_rss_bytes': peak_rss_bytes(),
+        'scenarios': results,
+    }
+
+def compare(previous, current):
+    """Rows of (scenario, metric, before, after, ratio) for the headline metrics."""
+    rows = []
+    for name, result in current['scenarios'].items():
+        before = previous.get('scenarios', {}).get(name)
+        if not before:
+            continue
+        for metric in ('p95_ms', 'throughput_rps', 'avg_queries'):
+            ratio = result[metric] / before[metric] if before[metric] else None
+            rows.append((name, metric, before[metric], result[metric], ratio))
+    return rows
+
+
+# ------------------- WRITE CONCURRENCY -------------------
+def database_profile():
+    profile = {'vendor': connection.vendor, 'conn_max_age': connection.settings_dict['CONN_MAX_AGE']}
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            for pragma in ('journal_mode', 'synchronous', 'busy_timeout'):
+                cursor.execute(f'PRAGMA {pragma}')
+                profile[pragma] = cursor.fetchone()[0]
+    return profile
+
+def write_worker(attendance_pks, pairs, barrier, results):
+    """Edit attendance rows through the ORM, each +1 followed by -1 so the data ends unchanged."""
+    latencies, errors = [], 0
+    barrier.wait()
+    try:
+        for pair in range(pairs):
+            pk = attendance_pks[pair % len(attendance_pks)]
+            for step in (1, -1):
+                started = time.perf_counter()
+                try:
+                    with transaction.atomic():
+                        attendance = Attendance.objects.get(pk=pk)
+                        attendance.present_days += step
+                        attendance.save()
+                except OperationalError:
+                    errors += 1
+                    break
+                finally:
+                    latencies.append((time.perf_counter() - started) * 1000)
+    finally:
+        connections.close_all()
+    results.append((latencies, errors))
+
+def run_write_benchmark(writers, writes=200):
+    """
+    Start ``writers`` threads, each with its own database connection, that
+    save ``writes`` attendance edits concurrently. The edits go through the
+    same save() path, rollup signals and cache invalidation as the HTMX
+    forms. Failures such as "database is locked" are counted as errors.
+    """
+    latest = Attendance.objects.order_by('-year', '-month').values('year', 'month').first()
+    if latest is None:
+        raise ValueError("The database has no attendance; run manage.py seed_hr first.")
+    attendance_pks = list(Attendance.objects.filter(**latest).order_by('pk').values_list('pk', flat=True)[:100])
+
+    results = []
+    barrier = threading.Barrier(writers + 1)
+    threads = [
+        threading.Thread(target=write_worker, args=(attendance_pks, writes // 2, barrier, results))
+        for _ in range(writers)
+    ]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for worker_latencies, _ in results for latency in worker_latencies)
+    errors = sum(worker_errors for _, worker_errors in results)
+    succeeded = len(latencies) - errors
+    return {
+        'writers': writers,
+        'writes': len(latencies),
+        'errors': errors,
+        'throughput_wps': succeeded / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 0.50),
+        'p95_ms': percentile(latencies, 0.95),
+        'p99_ms': percentile(latencies, 0.99),
+    }
+
+
+# ------------------- LIVE SERVER LOAD -------------------
+def session_cookie(username):
+    """A logged-in session cookie for ``username``, created as an active non-staff user if missing."""
+    user, _ = get_user_model().objects.get_or_create(username=username)
+    client = Client()
+    client.force_login(user)
+    name = settings.SESSION_COOKIE_NAME
+    return f'{name}={client.cookies[name].value}'
+
+def run_load_test(base_url, paths, concurrency, total, cookie):
+    """
+    Fire ``total`` GETs, cycling through ``paths``, at a running server from
+    ``concurrency`` threads, and report throughput and latency per path.
+    Run it against the WSGI and the ASGI deployment with the same arguments
+    to compare how many concurrent requests each profile sustains.
+    """
+    counter = iter(range(total))
+    lock = threading.Lock()
+    samples = []  # (path, ms, ok)
+
+    def worker():
+        while True:
+            with lock:
+                index = next(counter, None)
+            if index is None:
+                return
+            path = paths[index % len(paths)]
+            request = urllib.request.Request(base_url.rstrip('/') + path, headers={'Cookie': cookie})
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=60) as response:
+                    while response.read(65536):
+                        pass
+                    ok = response.status < 400
+            except (urllib.error.URLError, OSError):
+                ok = False
+            samples.append((path, (time.perf_counter() - started) * 1000, ok))
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    def summary(entries):
+        latencies = sorted(ms for _, ms, _ in entries)
+        return {
+            'requests': len(entries),
+            'errors': sum(1 for _, _, ok in entries if not ok),
+            'p50_ms': percentile(latencies, 0.50),
+            'p95_ms': percentile(latencies, 0.95),
+            'p99_ms': percentile(latencies, 0.99),
+        }
+
+    return {
+        'base_url': base_url,
+        'concurrency': concurrency,
+        'throughput_rps': len(samples) / elapsed if elapsed else 0.0,
+        'overall': summary(samples),
+        'paths': {path: summary([sample for sample in samples if sample[0] == path]) for path in paths},
+    }
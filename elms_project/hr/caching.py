@@ -0,0 +1,230 @@
+"""
+Response cache for period-scoped pages (attendance/salary lists, dashboard,
+exports).
+
+Every cached response is keyed by its URL plus the current version of each
+scope it depends on. A scope is a kind of record ('attendance', 'salary' or
+'employee') narrowed to a (year, month) period, a whole year, or everything.
+Saving or deleting a row bumps the versions of its period, its year and its
+kind's 'all' scope (see hr.signals), so exactly the entries that could
+include that row stop matching and everything else keeps hitting.
+"""
+import hashlib
+import uuid
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+
+from .models import parse_month
+
+KEY_PREFIX = 'hr'
+
+# per-process backends: an invalidation in one worker (or in a management
+# command) never reaches the others
+LOCAL_CACHE_BACKENDS = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+def shared_cache():
+    return settings.CACHES['default']['BACKEND'] not in LOCAL_CACHE_BACKENDS
+
+
+# ------------------- VERSIONS -------------------
+def scope_key(kind, year=None, month=None):
+    if year and month:
+        return f'{KEY_PREFIX}:ver:{kind}:{year}:{month}'
+    if year:
+        return f'{KEY_PREFIX}:ver:{kind}:{year}'
+    return f'{KEY_PREFIX}:ver:{kind}:all'
+
+def new_version():
+    # random rather than a counter, so an evicted version key can never come
+    # back with a value that old entries were stored under
+    return uuid.uuid4().hex
+
+def get_versions(keys):
+    versions = cache.get_many(keys)
+    missing = {key: new_version() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+async def aget_versions(keys):
+    versions = await cache.aget_many(keys)
+    missing = {key: new_version() for key in keys if key not in versions}
+    if missing:
+        await cache.aset_many(missing, timeout=None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+def invalidate_period(kind, year, month):
+    cache.set_many({
+        scope_key(kind, year, month): new_version(),
+        scope_key(kind, year): new_version(),
+        scope_key(kind): new_version(),
+    }, timeout=None)
+
+def invalidate_periods(kind, periods):
+    for year, month in set(periods):
+        invalidate_period(kind, year, month)
+
+def invalidate_kind(kind):
+    cache.set(scope_key(kind), new_version(), timeout=None)
+
+
+# ------------------- COUNTERS -------------------
+def count(event):
+    key = f'{KEY_PREFIX}:stats:{event}'
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # evicted between add() and incr()
+        cache.set(key, 1, timeout=None)
+
+async def acount(event):
+    key = f'{KEY_PREFIX}:stats:{event}'
+    await cache.aadd(key, 0, timeout=None)
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        await cache.aset(key, 1, timeout=None)
+
+def cache_stats():
+    hits = cache.get(f'{KEY_PREFIX}:stats:hits', 0)
+    misses = cache.get(f'{KEY_PREFIX}:stats:misses', 0)
+    total = hits + misses
+    return {'hits': hits, 'misses': misses, 'hit_rate': hits / total if total else 0.0}
+
+
+# ------------------- RESPONSES -------------------
+def request_period(request):
+    """The (year, month) a request is filtered to; either may be None."""
+    year = request.GET.get('year', '')
+    month = request.GET.get('month', '')
+    year = int(year) if year.isdigit() else None
+    month = parse_month(month) if month else None
+    return year, month
+
+def cache_key(request, versions):
+    raw = '|'.join([
+        request.path,
+        request.GET.urlencode(),
+        request.headers.get('HX-Request', ''),
+        *versions,
+    ])
+    return f'{KEY_PREFIX}:resp:' + hashlib.md5(raw.encode()).hexdigest()
+
+def response_key(request, scopes):
+    return cache_key(request, get_versions([scope_key(*scope) for scope in scopes]))
+
+async def aresponse_key(request, scopes):
+    return cache_key(request, await aget_versions([scope_key(*scope) for scope in scopes]))
+
+def store(key, status, headers, content):
+    cache.set(key, {'status': status, 'headers': headers, 'content': content},
+              timeout=settings.HR_CACHE_TIMEOUT)
+
+async def astore(key, status, headers, content):
+    await cache.aset(key, {'status': status, 'headers': headers, 'content': content},
+                     timeout=settings.HR_CACHE_TIMEOUT)
+
+def teed(key, response, content, limit):
+    """Pass streamed chunks through, keeping a copy to cache if it stays under ``limit`` bytes."""
+    chunks, size = [], 0
+    for chunk in content:
+        if chunks is not None:
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > limit:
+                chunks = None
+        yield chunk
+    if chunks is not None:
+        store(key, response.status_code, dict(response.items()), b''.join(chunks))
+
+async def ateed(key, response, content, limit):
+    """teed() for async streaming content."""
+    chunks, size = [], 0
+    async for chunk in content:
+        if chunks is not None:
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > limit:
+                chunks = None
+        yield chunk
+    if chunks is not None:
+        await astore(key, response.status_code, dict(response.items()), b''.join(chunks))
+
+def cached_response(cached):
+    response = HttpResponse(cached['content'], status=cached['status'], headers=cached['headers'])
+    response['X-Cache'] = 'HIT'
+    return response
+
+def cache_period_response(kinds, period=request_period):
+    """
+    Cache GET responses of a view whose output depends on ``kinds`` of rows
+    in the period returned by ``period(request)``. Employee rows are always
+    a dependency because every page shows employee names. Works on sync and
+    async views alike. Responses are only cached when the cache is shared
+    by every process (see shared_cache()); otherwise the view always runs.
+    """
+    def scopes(request):
+        year, month = period(request)
+        return [(kind, year, month) for kind in kinds] + [('employee',)]
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                if request.method != 'GET' or not shared_cache():
+                    return await view(request, *args, **kwargs)
+
+                key = await aresponse_key(request, scopes(request))
+                cached = await cache.aget(key)
+                if cached is not None:
+                    await acount('hits')
+                    return cached_response(cached)
+
+                await acount('misses')
+                response = await view(request, *args, **kwargs)
+                if response.status_code == 200:
+                    limit = settings.HR_CACHE_MAX_STREAM_SIZE
+                    if not isinstance(response, StreamingHttpResponse):
+                        await astore(key, response.status_code, dict(response.items()), response.content)
+                    elif response.is_async:
+                        response.streaming_content = ateed(key, response, response.streaming_content, limit)
+                    else:
+                        response.streaming_content = teed(key, response, response.streaming_content, limit)
+                response['X-Cache'] = 'MISS'
+                return response
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET' or not shared_cache():
+                return view(request, *args, **kwargs)
+
+            key = response_key(request, scopes(request))
+            cached = cache.get(key)
+            if cached is not None:
+                count('hits')
+                return cached_response(cached)
+
+            count('misses')
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200:
+                if isinstance(response, StreamingHttpResponse):
+                    response.streaming_content = teed(
+                        key, response, response.streaming_content, settings.HR_CACHE_MAX_STREAM_SIZE
+                    )
+                else:
+                    store(key, response.status_code, dict(response.items()), response.content)
+            response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,93 @@
+"""
+Monthly attendance and payroll series for the dashboard charts.
+
+A whole range of years comes from MonthlyRollup in one query: the rollups
+are already the per-(year, month) GROUP BY of the attendance and salary
+tables, kept current as rows change. Periods without a rollup are filled
+with zeros, so every series has one value per month.
+
+The ETag is built from the response cache's version of each year in the
+range (hr.caching), which changes whenever a row in that year does. A
+poll whose If-None-Match still matches is answered from the cache alone;
+a changed range is queried once and the result cached under its new tag.
+When the cache is local to each process those versions can miss writes
+made elsewhere, so the series is queried on every request and the ETag is
+a hash of the payload instead.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.http import quote_etag
+
+from .caching import KEY_PREFIX, get_versions, scope_key, shared_cache
+from .models import MONTH_NAMES, MonthlyRollup
+
+CHART_MAX_YEARS = 10
+CHART_KINDS = ('attendance', 'salary')
+
+
+def chart_range(params, default_year):
+    """``(first_year, last_year)`` from ``?from=&to=``; raises ValueError for a bad range."""
+    try:
+        first = int(params.get('from') or default_year)
+        last = int(params.get('to') or first)
+    except ValueError:
+        raise ValueError('from and to must be years')
+    if not 2000 <= first <= last <= 2100:
+        raise ValueError('from and to must be years between 2000 and 2100, from <= to')
+    if last - first >= CHART_MAX_YEARS:
+        raise ValueError(f'At most {CHART_MAX_YEARS} years per request')
+    return first, last
+
+def chart_etag(first, last):
+    versions = get_versions([scope_key(kind, year) for year in range(first, last + 1) for kind in CHART_KINDS])
+    return quote_etag(hashlib.md5(f'{first}:{last}:{":".join(versions)}'.encode()).hexdigest())
+
+def period_series(first, last):
+    """``(payload, last_modified)`` for the years ``first``..``last``; last_modified is the newest rollup's updated_at."""
+    rollups = {
+        (rollup.year, rollup.month): rollup
+        for rollup in MonthlyRollup.objects.filter(year__gte=first, year__lte=last)
+    }
+    periods = [(year, month) for year in range(first, last + 1) for month in range(1, 13)]
+    empty = MonthlyRollup()
+    rows = [rollups.get(period, empty) for period in periods]
+    payload = {
+        'from': first,
+        'to': last,
+        'labels': [f'{MONTH_NAMES[month][:3]} {year}' for year, month in periods],
+        'periods': [{'year': year, 'month': month} for year, month in periods],
+        'attendance': {
+            'records': [row.attendance_count for row in rows],
+            'present_days': [row.present_days for row in rows],
+            'leaves': [row.leaves for row in rows],
+        },
+        'payroll': {
+            'payable': [row.total_payable for row in rows],
+            'paid': [row.total_paid for row in rows],
+            'outstanding': [row.total_payable - row.total_paid for row in rows],
+            'paid_count': [row.paid_count for row in rows],
+            'unpaid_count': [row.unpaid_count for row in rows],
+        },
+    }
+    last_modified = max((rollup.updated_at for rollup in rollups.values()), default=None)
+    return payload, last_modified
+
+def cached_series(first, last, etag):
+    """period_series() stored under ``etag``, so each version of a range is queried once."""
+    key = f'{KEY_PREFIX}:chart:{first}:{last}:{etag}'
+    cached = cache.get(key)
+    if cached is None:
+        payload, last_modified = period_series(first, last)
+        cached = {'payload': payload, 'last_modified': last_modified.timestamp() if last_modified else None}
+        cache.set(key, cached, timeout=settings.HR_CACHE_TIMEOUT)
+    return cached['payload'], cached['last_modified']
+
+def local_series(first, last):
+    """``(etag, payload, last_modified)`` queried now, for caches other processes can't invalidate."""
+    payload, last_modified = period_series(first, last)
+    etag = quote_etag(hashlib.md5(json.dumps(payload, cls=DjangoJSONEncoder).encode()).hexdigest())
+    return etag, payload, last_modified.timestamp() if last_modified else None
@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.checks import Error, Warning, register
+
+from .caching import shared_cache
+from .staticfiles import VENDOR_ASSETS, VENDOR_FILES
+
+
+@register(deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    if shared_cache():
+        return []
+    return [Warning(
+        "The default cache is local to each process, so the response cache "
+        "(hr.caching) is turned off.",
+        hint=(
+            "Set DJANGO_CACHE_BACKEND to a cache every worker and management "
+            "command shares, e.g. django.core.cache.backends.redis.RedisCache."
+        ),
+        id='hr.W001',
+    )]
+
+
+@register(deploy=True)
+def check_vendored_assets(app_configs, **kwargs):
+    if settings.HR_STATIC_PROFILE != 'production':
+        return []
+    paths = [path for path, _ in VENDOR_ASSETS.values()] + [path for path, _ in VENDOR_FILES]
+    missing = [path for path in paths if finders.find(path) is None]
+    if not missing:
+        return []
+    return [Error(
+        f"{len(missing)} vendored static file(s) are missing, e.g. {missing[0]}, so pages "
+        "would load them from third-party CDNs.",
+        hint="Run `manage.py vendor_static` before collectstatic when building a release.",
+        id='hr.E001',
+    )]
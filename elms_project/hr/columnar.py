@@ -0,0 +1,180 @@
+"""
+Typed columnar exports (Parquet / Arrow IPC) and the analytics snapshot.
+
+Rows are read with values_list().iterator() and turned into Arrow record
+batches of COLUMNAR_BATCH_SIZE rows, so memory stays bounded however big
+the table is. Salaries keep their exact decimal type, dates and timestamps
+stay dates and timestamps. Attendance and salary carry the employee's ID,
+name and designation.
+
+pyarrow is optional: views and commands check arrow_available() first.
+"""
+import json
+import os
+import shutil
+from itertools import islice
+
+from django.db.models import F
+from django.utils import timezone
+
+from .exports import filter_period
+from .models import Attendance, Employee, Salary
+
+COLUMNAR_BATCH_SIZE = 10_000
+FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+EMPLOYEE_COLUMNS = [
+    ('employee_id', 'string'), ('name', 'string'), ('father_name', 'string'), ('mother_name', 'string'),
+    ('cnic', 'string'), ('designation', 'string'), ('contact_number', 'string'), ('address', 'string'),
+    ('date_joined', 'date'), ('base_salary', 'money'), ('is_active', 'bool'), ('updated_at', 'timestamp'),
+]
+EMPLOYEE_ON_ROW = [('employee_id', 'string'), ('employee_name', 'string'), ('designation', 'string')]
+# int32 to match the types pyarrow.dataset infers for the year=/month= directories
+PERIOD_COLUMNS = [('year', 'int32'), ('month', 'int32')]
+ATTENDANCE_COLUMNS = EMPLOYEE_ON_ROW + PERIOD_COLUMNS + [
+    ('total_days', 'int16'), ('leaves', 'int16'), ('present_days', 'int16'), ('updated_at', 'timestamp'),
+]
+SALARY_COLUMNS = EMPLOYEE_ON_ROW + PERIOD_COLUMNS + [
+    ('total_salary', 'money'), ('received_salary', 'money'), ('status', 'string'),
+    ('payment_date', 'date'), ('updated_at', 'timestamp'),
+]
+
+
+def arrow_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def arrow_type(name):
+    import pyarrow as pa
+    return {
+        'string': pa.string(),
+        'date': pa.date32(),
+        'timestamp': pa.timestamp('us', tz='UTC'),
+        'money': pa.decimal128(12, 2),
+        'bool': pa.bool_(),
+        'int32': pa.int32(),
+        'int16': pa.int16(),
+    }[name]
+
+def arrow_schema(columns):
+    import pyarrow as pa
+    return pa.schema([(name, arrow_type(kind)) for name, kind in columns])
+
+
+# ------------------- QUERIES -------------------
+def filter_rows(qs, params):
+    """The CSV exports' filters; raises ValueError for a bad year or month."""
+    qs = filter_period(qs, params)
+    status = params.get('status', '')
+    if status and qs.model is Salary: qs = qs.filter(status=status)
+    return qs
+
+def employee_rows(params):
+    return Employee.objects.order_by('employee_id').values_list(*[name for name, _ in EMPLOYEE_COLUMNS])
+
+def period_rows(model, columns):
+    def rows(params):
+        qs = filter_rows(model.objects.all(), params).annotate(
+            employee_code=F('employee__employee_id'), employee_name=F('employee__name'),
+            employee_designation=F('employee__designation'),
+        )
+        own = [name for name, _ in columns[len(EMPLOYEE_ON_ROW):]]
+        return qs.order_by('year', 'month', 'employee_code').values_list(
+            'employee_code', 'employee_name', 'employee_designation', *own,
+        )
+    return rows
+
+COLUMNAR_TABLES = {
+    'employees': (employee_rows, EMPLOYEE_COLUMNS),
+    'attendance': (period_rows(Attendance, ATTENDANCE_COLUMNS), ATTENDANCE_COLUMNS),
+    'salary': (period_rows(Salary, SALARY_COLUMNS), SALARY_COLUMNS),
+}
+
+
+# ------------------- WRITING -------------------
+def record_batches(qs, schema, batch_size=COLUMNAR_BATCH_SIZE):
+    import pyarrow as pa
+    rows = qs.iterator(chunk_size=batch_size)
+    while batch := list(islice(rows, batch_size)):
+        columns = zip(*batch)
+        yield pa.record_batch(
+            [pa.array(values, type=field.type) for values, field in zip(columns, schema)], schema=schema,
+        )
+
+def open_writer(sink, schema, fmt, compression):
+    import pyarrow as pa
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        return pq.ParquetWriter(sink, schema, compression=compression or 'none')
+    return pa.ipc.new_file(sink, schema, options=pa.ipc.IpcWriteOptions(compression=compression))
+
+def write_table(sink, name, params, fmt='parquet', compression='zstd', progress=None):
+    """
+    Write table ``name`` filtered by ``params`` to ``sink`` (a path or binary
+    file) and return the row count. ``progress(rows written)`` is called
+    after each batch.
+    """
+    rows, columns = COLUMNAR_TABLES[name]
+    qs = rows(params)  # a bad filter raises ValueError before anything is written
+    schema = arrow_schema(columns)
+    written = 0
+    with open_writer(sink, schema, fmt, compression) as writer:
+        for batch in record_batches(qs, schema):
+            writer.write_batch(batch)
+            written += batch.num_rows
+            if progress is not None:
+                progress(written)
+    return written
+
+
+# ------------------- SNAPSHOT -------------------
+def snapshot_periods():
+    periods = set(Attendance.objects.values_list('year', 'month').distinct())
+    periods |= set(Salary.objects.values_list('year', 'month').distinct())
+    return sorted(periods)
+
+def write_snapshot(output, fmt='arrow', compression=None, stdout=None):
+    """
+    Write employees plus attendance and salary partitioned by period, hive
+    style (``attendance/year=2025/month=3/part-0.arrow``), and a
+    manifest.json. The snapshot is built next to ``output`` and renamed
+    into place, so readers never see a half-written one. Uncompressed
+    Arrow files can be memory-mapped without copying.
+    """
+    extension = FORMATS[fmt]
+    building = f'{output}.partial-{os.getpid()}'
+    os.makedirs(building)
+    manifest = {
+        'created_at': timezone.now().isoformat(), 'format': fmt, 'compression': compression,
+        'tables': {},
+    }
+    try:
+        count = write_table(os.path.join(building, f'employees{extension}'), 'employees', {}, fmt, compression)
+        manifest['tables']['employees'] = {'rows': count, 'partitioning': None}
+
+        periods = snapshot_periods()
+        for name in ('attendance', 'salary'):
+            partitions = []
+            for year, month in periods:
+                directory = os.path.join(building, name, f'year={year}', f'month={month}')
+                os.makedirs(directory)
+                count = write_table(
+                    os.path.join(directory, f'part-0{extension}'), name, {'year': str(year), 'month': str(month)},
+                    fmt, compression,
+                )
+                partitions.append({'year': year, 'month': month, 'rows': count})
+                if stdout is not None:
+                    stdout.write(f"{name} {month}/{year}: {count} rows")
+            manifest['tables'][name] = {'rows': sum(p['rows'] for p in partitions), 'partitioning': ['year', 'month'],
+                                        'partitions': partitions}
+
+        with open(os.path.join(building, 'manifest.json'), 'w') as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+        os.replace(building, output)
+    except BaseException:
+        shutil.rmtree(building, ignore_errors=True)
+        raise
+    return manifest
@@ -0,0 +1,116 @@
+"""
+CSV export definitions, shared by the streaming export views and the
+background export jobs (hr.jobs). Each takes the filter parameters (a
+QueryDict or plain dict) and returns ``(filename, header, values_list()
+queryset, row)``, where ``row(*values)`` builds one CSV row. A bad year
+or month filter raises ValueError.
+"""
+from django.db.models import Value
+
+from .models import Attendance, Employee, Salary, Tombstone, MONTH_NAMES, parse_month
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+def export_period(params):
+    """``(year, month)`` from ``?year=&month=``, None where not given; raises ValueError for a bad one."""
+    year = str(params.get('year', '')).strip()
+    month = str(params.get('month', '')).strip()
+    if year and not year.isdigit():
+        raise ValueError('year must be a number')
+    if month and parse_month(month) is None:
+        raise ValueError('month must be 1-12 or a month name')
+    return int(year) if year else None, parse_month(month) if month else None
+
+def filter_period(qs, params):
+    year, month = export_period(params)
+    if month: qs = qs.filter(month=month)
+    if year: qs = qs.filter(year=year)
+    return qs
+
+def employee_export(params):
+    qs = Employee.objects.order_by('employee_id').values_list(
+        'employee_id', 'name', 'father_name', 'mother_name', 'cnic',
+        'designation', 'contact_number', 'address', 'date_joined', 'is_active'
+    )
+
+    def row(emp_id, name, father, mother, cnic, designation, contact, address, date_joined, is_active):
+        return [emp_id, name, father or '', mother or '', cnic or '', designation or '',
+                contact or '', address or '', date_joined, 'Active' if is_active else 'Inactive']
+
+    header = ['Employee ID','Name','Father Name','Mother Name','CNIC','Designation','Contact','Address', 'Date Joined', 'Status']
+    return 'employees.csv', header, qs, row
+
+def attendance_export(params):
+    month = params.get('month', '')
+    year = params.get('year', '')
+    qs = filter_period(Attendance.objects.all(), params).values_list(
+        'employee__employee_id', 'employee__name', 'employee__cnic',
+        'month', 'year', 'total_days', 'leaves', 'present_days'
+    )
+
+    def row(emp_id, name, cnic, m, y, total_days, leaves, present_days):
+        return [emp_id, name, cnic or '', MONTH_NAMES[m], y, total_days, leaves, present_days]
+
+    header = ['Employee ID','Name','CNIC','Month','Year','Total Days','Leaves','Present Days']
+    return f'attendance_{month}_{year}.csv', header, qs, row
+
+def salary_export(params):
+    month = params.get('month', '')
+    year = params.get('year', '')
+    status = params.get('status', '')
+    qs = filter_period(Salary.objects.all(), params)
+    if status: qs = qs.filter(status=status)
+    qs = qs.values_list(
+        'employee__employee_id', 'employee__name', 'employee__cnic',
+        'month', 'year', 'total_salary', 'received_salary', 'status', 'payment_date'
+    )
+
+    def row(emp_id, name, cnic, m, y, total, received, s_status, payment_date):
+        return [emp_id, name, cnic or '', MONTH_NAMES[m], y, total, received, s_status, payment_date or '']
+
+    header = ['Employee ID','Name','CNIC','Month','Year','Total Salary','Received Salary','Status','Payment Date']
+    return f'salary_{month}_{year}.csv', header, qs, row
+
+EXPORTS = {
+    'employees': employee_export,
+    'attendance': attendance_export,
+    'salary': salary_export,
+}
+
+
+# ------------------- CHANGE FEED -------------------
+CHANGE_FEEDS = {
+    'attendance': (Attendance, ['total_days', 'leaves', 'present_days']),
+    'salary': (Salary, ['total_salary', 'received_salary', 'status', 'payment_date']),
+}
+
+def change_export(kind, since, until):
+    """
+    Rows of ``kind`` saved, and tombstones of rows deleted, in the window
+    ``since < time <= until``, oldest change first. ``since`` may be None
+    for a full initial sync. Each row starts with ``op`` ('upsert' or
+    'delete') and ``changed_at``; deletes leave the data columns null.
+    Both halves read the (updated_at, id) and (kind, deleted_at) indexes.
+    """
+    model, fields = CHANGE_FEEDS[kind]
+    rows = model.objects.filter(updated_at__lte=until).order_by()
+    deleted = Tombstone.objects.filter(kind=kind, deleted_at__lte=until).order_by()
+    if since is not None:
+        rows = rows.filter(updated_at__gt=since)
+        deleted = deleted.filter(deleted_at__gt=since)
+
+    rows = rows.annotate(op=Value('upsert')).values_list(
+        'op', 'updated_at', 'id', 'employee__employee_id', 'year', 'month', *fields,
+    )
+    blanks = {f'blank_{field}': Value(None, output_field=model._meta.get_field(field)) for field in fields}
+    deleted = deleted.annotate(op=Value('delete'), **blanks).values_list(
+        'op', 'deleted_at', 'object_id', 'employee_code', 'year', 'month', *blanks,
+    )
+    qs = rows.union(deleted, all=True).order_by('updated_at', 'id')
+
+    def row(op, changed_at, pk, employee_id, year, month, *values):
+        return [op, changed_at.isoformat(), pk, employee_id, year, month, *values]
+
+    header = ['op', 'changed_at', 'id', 'employee_id', 'year', 'month', *fields]
+    return f'{kind}_changes.csv', header, qs, row
@@ -1,5 +1,5 @@
 from django import forms
-from .models import Employee, Attendance, Salary
+from .models import Employee, Attendance, Salary, SalaryPayment, MONTH_CHOICES
 from django.utils import timezone
 
 class EmployeeForm(forms.ModelForm):
@@ -16,14 +16,6 @@ class AttendanceForm(forms.ModelForm):
         model = Attendance
         fields = '__all__'
         widgets = {
-            'month': forms.Select(choices=[
-                ('January', 'January'), ('February', 'February'), 
-                ('March', 'March'), ('April', 'April'), 
-                ('May', 'May'), ('June', 'June'), 
-                ('July', 'July'), ('August', 'August'), 
-                ('September', 'September'), ('October', 'October'), 
-                ('November', 'November'), ('December', 'December')
-            ]),
             'year': forms.NumberInput(attrs={
                 'min': 2000, 
                 'max': 2100,
@@ -34,16 +26,9 @@ class AttendanceForm(forms.ModelForm):
 class SalaryForm(forms.ModelForm):
     class Meta:
         model = Salary
-        fields = '__all__'
+        # received_salary only moves through the payment ledger (hr.payments); status follows from it
+        exclude = ('received_salary', 'status')
         widgets = {
-            'month': forms.Select(choices=[
-                ('January', 'January'), ('February', 'February'), 
-                ('March', 'March'), ('April', 'April'), 
-                ('May', 'May'), ('June', 'June'), 
-                ('July', 'July'), ('August', 'August'), 
-                ('September', 'September'), ('October', 'October'), 
-                ('November', 'November'), ('December', 'December')
-            ]),
             'year': forms.NumberInput(attrs={
                 'min': 2000, 
                 'max': 2100,
@@ -51,5 +36,34 @@ class SalaryForm(forms.ModelForm):
             }),
             'payment_date': forms.DateInput(attrs={'type': 'date'}),
             'total_salary': forms.NumberInput(attrs={'step': '0.01'}),
-            'received_salary': forms.NumberInput(attrs={'step': '0.01'}),
-        }
\ No newline at end of file
+        }
+
+class SalaryPaymentForm(forms.ModelForm):
+    class Meta:
+        model = SalaryPayment
+        fields = ('amount', 'paid_on', 'reference')
+        widgets = {
+            'amount': forms.NumberInput(attrs={'step': '0.01'}),
+            'paid_on': forms.DateInput(attrs={'type': 'date'}),
+        }
+        help_texts = {'amount': "A negative amount reverses an earlier payment."}
+
+    def clean_amount(self):
+        amount = self.cleaned_data['amount']
+        if not amount:
+            raise forms.ValidationError("Enter a non-zero amount.")
+        return amount
+
+class PayrollImportForm(forms.Form):
+    KIND_CHOICES = (('attendance', 'Attendance'), ('salary', 'Salary'), ('payments', 'Salary payments (bank file)'))
+    kind = forms.ChoiceField(choices=KIND_CHOICES)
+    file = forms.FileField(help_text=(
+        "CSV or XLSX with the same columns as the CSV export; bank files have "
+        "Employee ID, Year, Month, Amount and optional Paid On and Reference columns."
+    ))
+    dry_run = forms.BooleanField(required=False, label="Validate only")
+
+class PayrollGenerateForm(forms.Form):
+    month = forms.TypedChoiceField(choices=MONTH_CHOICES, coerce=int, initial=lambda: timezone.now().month)
+    year = forms.IntegerField(min_value=2000, max_value=2100, initial=lambda: timezone.now().year)
+    skip_existing = forms.BooleanField(required=False, label="Skip employees who already have a salary for this month")
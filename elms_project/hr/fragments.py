@@ -0,0 +1,64 @@
+"""
+Rendered-row cache for the list pages, and template warmup.
+
+``{% cached_rows %}`` (hr_fragments tag library) renders a page of rows
+through one ``get_many``. Only the rows missing from the cache are
+rendered, and those are stored back with one ``set_many``. A row's key
+covers the partial's source, the row's pk, its ``updated_at`` and the
+``updated_at`` of its employee, so any edit gives the row a new key. Rows
+without an ``updated_at`` are rendered every time. Row partials are
+rendered with only the row in their context, so they must not use the
+request, the user or other page variables.
+"""
+import hashlib
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+
+from .caching import KEY_PREFIX
+
+
+def row_stamps(obj):
+    stamps = [obj.updated_at]
+    employee = getattr(obj, 'employee', None)
+    if employee is not None:
+        stamps.append(employee.updated_at)
+    if None in stamps:
+        return None
+    return ':'.join(str(stamp.timestamp()) for stamp in stamps)
+
+def render_rows(template_name, objects, name):
+    template = get_template(template_name)
+    digest = hashlib.md5(f'{template_name}\n{template.template.source}'.encode()).hexdigest()[:12]
+    keys = {}
+    for obj in objects:
+        stamps = row_stamps(obj)
+        if stamps is not None:
+            keys[obj.pk] = f'{KEY_PREFIX}:row:{digest}:{obj.pk}:{stamps}'
+
+    cached = cache.get_many(list(keys.values())) if keys else {}
+    rendered, missing = [], {}
+    for obj in objects:
+        key = keys.get(obj.pk)
+        html = cached.get(key)
+        if html is None:
+            html = template.render({name: obj})
+            if key is not None:
+                missing[key] = html
+        rendered.append(html)
+    if missing:
+        cache.set_many(missing, timeout=settings.HR_FRAGMENT_CACHE_TIMEOUT)
+    return mark_safe(''.join(rendered))
+
+
+def warmup_templates():
+    """Compile every template under hr/templates into the cached loader; returns how many."""
+    root = Path(apps.get_app_config('hr').path) / 'templates'
+    names = sorted(path.relative_to(root).as_posix() for path in root.rglob('*.html'))
+    for name in names:
+        get_template(name)
+    return len(names)
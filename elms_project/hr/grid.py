@@ -0,0 +1,98 @@
+"""
+Month grid for bulk attendance entry.
+
+The grid posts only the cells that changed, named ``cell-<employee pk>-<field>``.
+All changed rows are validated together. If any row is invalid nothing is
+saved; otherwise existing rows go through one bulk_update and new ones
+through one bulk_create in a single transaction.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .caching import invalidate_periods
+from .importers import to_int
+from .models import Attendance, Employee
+from .rollups import rebuild_rollups
+
+GRID_FIELDS = ('total_days', 'leaves', 'present_days')
+GRID_PAGE_SIZE = 200
+
+
+class GridRow:
+    def __init__(self, employee, attendance=None, submitted=None, error=None, saved=False):
+        self.employee = employee
+        self.attendance = attendance
+        self.submitted = submitted or {}
+        self.error = error
+        self.saved = saved
+
+    @property
+    def cells(self):
+        """(field, value shown, value stored) for each editable column."""
+        for field in GRID_FIELDS:
+            stored = getattr(self.attendance, field) if self.attendance else None
+            yield field, self.submitted.get(field, stored), stored
+
+
+def grid_rows(employees, year, month):
+    attendance = {
+        a.employee_id: a
+        for a in Attendance.objects.filter(year=year, month=month, employee__in=[e.pk for e in employees])
+    }
+    return [GridRow(employee, attendance.get(employee.pk)) for employee in employees]
+
+def parse_cells(data):
+    """``{employee pk: {field: raw value}}`` from the posted ``cell-<pk>-<field>`` names."""
+    changes = {}
+    for name, value in data.items():
+        prefix, _, rest = name.partition('-')
+        pk, _, field = rest.partition('-')
+        if prefix == 'cell' and pk.isdigit() and field in GRID_FIELDS:
+            changes.setdefault(int(pk), {})[field] = value
+    return changes
+
+def save_grid(year, month, changes):
+    """
+    Validate and apply ``changes`` for one period. Returns a GridRow per
+    changed employee, with errors on the invalid ones and nothing saved if
+    there are any.
+    """
+    employees = Employee.objects.in_bulk(list(changes))
+    existing = {
+        a.employee_id: a
+        for a in Attendance.objects.filter(year=year, month=month, employee_id__in=list(employees))
+    }
+
+    cleaned, rows = {}, {}
+    for pk, cells in changes.items():
+        if pk not in employees:
+            continue
+        try:
+            cleaned[pk] = {field: to_int(cells, field, 0, 31, default=0) for field in cells}
+        except ValueError as exc:
+            rows[pk] = GridRow(employees[pk], existing.get(pk), cells, error=str(exc))
+    if rows:
+        for pk in cleaned:
+            rows[pk] = GridRow(employees[pk], existing.get(pk), changes[pk])
+        return list(rows.values())
+
+    now = timezone.now()
+    updated, created = [], []
+    for pk, values in cleaned.items():
+        attendance = existing.get(pk)
+        if attendance is None:
+            created.append(Attendance(employee_id=pk, year=year, month=month, **values))
+            continue
+        for field, value in values.items():
+            setattr(attendance, field, value)
+        attendance.updated_at = now
+        updated.append(attendance)
+
+    with transaction.atomic():
+        Attendance.objects.bulk_update(updated, [*GRID_FIELDS, 'updated_at'])
+        Attendance.objects.bulk_create(created)
+        # bulk writes skip the model signals that keep these in step
+        rebuild_rollups([(year, month)])
+        transaction.on_commit(lambda: invalidate_periods('attendance', [(year, month)]))
+
+    return [GridRow(employees[a.employee_id], a, saved=True) for a in updated + created]
@@ -0,0 +1,237 @@
+import csv
+import io
+import time
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .models import Attendance, Employee, Salary, SalaryPayment, parse_month
+from .caching import invalidate_periods
+from .rollups import period_filter, rebuild_rollups
+
+IMPORT_BATCH_SIZE = 1000
+
+
+class ImportResult:
+    def __init__(self):
+        self.rows = 0
+        self.imported = 0
+        self.errors = []  # (line number, message)
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+
+# ------------------- READING -------------------
+def normalise_header(name):
+    return str(name or '').strip().lower().replace(' ', '_')
+
+def read_rows(fileobj, filename):
+    """
+    Yield ``(line number, row dict)`` from a CSV or XLSX file one row at a
+    time. Headers are matched case-insensitively, so the files produced by the
+    CSV exports can be imported back as they are.
+    """
+    workbook = None
+    if filename.lower().endswith('.xlsx'):
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise ValueError("Importing .xlsx files requires openpyxl (pip install openpyxl).")
+        workbook = load_workbook(fileobj, read_only=True, data_only=True)
+        rows = workbook.active.iter_rows(values_only=True)
+    else:
+        rows = csv.reader(io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline=''))
+
+    try:
+        header = next(rows, None)
+        if header is None:
+            return
+        keys = [normalise_header(name) for name in header]
+        for line, values in enumerate(rows, start=2):
+            if all(value in (None, '') for value in values):
+                continue
+            yield line, dict(zip(keys, values))
+    finally:
+        if workbook is not None:
+            workbook.close()
+
+
+# ------------------- VALIDATION -------------------
+def text(row, field):
+    value = row.get(field)
+    return '' if value is None else str(value).strip()
+
+def to_int(row, field, minimum, maximum, default=None):
+    value = text(row, field)
+    if value == '' and default is not None:
+        return default
+    try:
+        number = Decimal(value)
+        if not number.is_finite():
+            raise ValueError(value)
+        number = int(number)
+    except (InvalidOperation, ValueError):
+        raise ValueError(f"{field}: {value!r} is not a whole number")
+    if not minimum <= number <= maximum:
+        raise ValueError(f"{field}: {number} is outside {minimum}-{maximum}")
+    return number
+
+def to_decimal(row, field, default=None):
+    value = text(row, field).replace(',', '')
+    if value == '' and default is not None:
+        return default
+    try:
+        amount = Decimal(value)
+        if not amount.is_finite():
+            raise ValueError(value)
+        amount = amount.quantize(Decimal('0.01'))
+    except (InvalidOperation, ValueError):
+        raise ValueError(f"{field}: {value!r} is not an amount")
+    if amount < 0:
+        raise ValueError(f"{field}: must not be negative")
+    return amount
+
+def to_date(row, field):
+    value = row.get(field)
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    value = text(row, field)
+    if not value:
+        return None
+    parsed = parse_date(value)
+    if parsed is None:
+        raise ValueError(f"{field}: {value!r} is not a YYYY-MM-DD date")
+    return parsed
+
+def period(row):
+    month = parse_month(text(row, 'month'))
+    if month is None:
+        raise ValueError(f"month: {text(row, 'month')!r} is not a month")
+    return to_int(row, 'year', 2000, 2100), month
+
+def build_attendance(row, employee_pk):
+    year, month = period(row)
+    return Attendance(
+        employee_id=employee_pk, year=year, month=month,
+        total_days=to_int(row, 'total_days', 0, 31),
+        leaves=to_int(row, 'leaves', 0, 31, default=0),
+        present_days=to_int(row, 'present_days', 0, 31),
+    )
+
+def build_salary(row, employee_pk):
+    year, month = period(row)
+    salary = Salary(
+        employee_id=employee_pk, year=year, month=month,
+        total_salary=to_decimal(row, 'total_salary'),
+        received_salary=to_decimal(row, 'received_salary', default=Decimal('0')),
+        payment_date=to_date(row, 'payment_date'),
+    )
+    salary.update_status()
+    # received_salary only moves through the payment ledger: rows are written
+    # with nothing received and post_received() pays in the file's amount
+    salary.imported_received, salary.received_salary = salary.received_salary, Decimal('0')
+    return salary
+
+def post_received(salaries):
+    """
+    Bring received_salary of freshly upserted rows to the imported amount by
+    posting the difference from what is stored as one ledger batch.
+    """
+    # hr.payments reads bank files with this module's helpers
+    from .payments import post_payments
+
+    stored = {
+        (employee_pk, year, month): (salary_pk, received)
+        for employee_pk, year, month, salary_pk, received in Salary.objects.filter(
+            period_filter({(salary.year, salary.month) for salary in salaries}),
+            employee_id__in={salary.employee_id for salary in salaries},
+        ).values_list('employee_id', 'year', 'month', 'pk', 'received_salary')
+    }
+    payments = []
+    for salary in salaries:
+        salary_pk, received = stored[(salary.employee_id, salary.year, salary.month)]
+        if salary.imported_received != received:
+            payments.append(SalaryPayment(
+                salary_id=salary_pk, amount=salary.imported_received - received,
+                paid_on=salary.payment_date or timezone.localdate(),
+            ))
+    post_payments(payments)
+
+# kind -> (model, row builder, columns overwritten when the period already exists, hook run after each batch)
+IMPORTERS = {
+    'attendance': (Attendance, build_attendance, ['total_days', 'leaves', 'present_days', 'updated_at'], None),
+    'salary': (Salary, build_salary, ['total_salary', 'status', 'payment_date', 'updated_at'], post_received),
+}
+
+
+# ------------------- WRITING -------------------
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+def import_rows(kind, rows, batch_size=IMPORT_BATCH_SIZE, dry_run=False):
+    """
+    Validate and upsert ``(line, row)`` pairs as ``kind`` records. Each batch
+    resolves its employee IDs with one query and is written with a single
+    INSERT ... ON CONFLICT (employee, year, month) DO UPDATE. The whole import
+    is one transaction. Invalid rows are skipped and reported in the result.
+    Imported salary amounts received reach received_salary through the
+    payment ledger (post_received).
+    """
+    model, build, update_fields, after_batch = IMPORTERS[kind]
+    result = ImportResult()
+    periods = set()
+    started = time.perf_counter()
+
+    with transaction.atomic():
+        for batch in batched(rows, batch_size):
+            result.rows += len(batch)
+            employee_ids = {text(row, 'employee_id') for _, row in batch}
+            employees = dict(Employee.objects.filter(employee_id__in=employee_ids).values_list('employee_id', 'pk'))
+
+            objects = {}
+            for line, row in batch:
+                employee_pk = employees.get(text(row, 'employee_id'))
+                if employee_pk is None:
+                    result.errors.append((line, f"employee_id: {text(row, 'employee_id')!r} does not exist"))
+                    continue
+                try:
+                    obj = build(row, employee_pk)
+                except ValueError as exc:
+                    result.errors.append((line, str(exc)))
+                    continue
+                # a later row for the same employee and period wins
+                objects[(employee_pk, obj.year, obj.month)] = obj
+
+            model.objects.bulk_create(
+                objects.values(),
+                update_conflicts=True,
+                unique_fields=['employee', 'year', 'month'],
+                update_fields=update_fields,
+            )
+            if after_batch and objects:
+                after_batch(list(objects.values()))
+            result.imported += len(objects)
+            periods.update((year, month) for _, year, month in objects)
+
+        rebuild_rollups(periods)
+        if dry_run:
+            transaction.set_rollback(True)
+        else:
+            transaction.on_commit(lambda: invalidate_periods(kind, periods))
+
+    result.elapsed = time.perf_counter() - started
+    return result
+
+def import_file(kind, fileobj, filename, **kwargs):
+    return import_rows(kind, read_rows(fileobj, filename), **kwargs)
@@ -0,0 +1,201 @@
+"""
+Database-backed job queue for exports and letter batches.
+
+Views enqueue a Job row and return at once; ``manage.py run_hr_worker``
+processes claim queued jobs, write the result under
+MEDIA_ROOT/HR_JOB_DIR and record progress on the row for the UI to poll.
+A job is claimed with a conditional UPDATE (status still 'queued'), so any
+number of workers can share the table without a broker or row locks.
+Failed jobs are retried with exponential backoff up to ``max_attempts``.
+Running jobs whose heartbeat stops (the worker died) go back on the queue.
+Finished jobs and their files are deleted after HR_JOB_RETENTION seconds,
+by the workers about once an hour or by ``manage.py purge_hr_jobs``.
+"""
+import csv
+import os
+import shutil
+import socket
+import time
+import traceback
+import zipfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+
+from .columnar import FORMATS, write_table
+from .exports import EXPORT_CHUNK_SIZE, EXPORTS
+from .letters import LETTER_TEMPLATES, bulk_letter_employees, letter_documents
+from .models import Job
+
+
+def enqueue(kind, params, user=None):
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job kind {kind!r}")
+    return Job.objects.create(
+        kind=kind, params=params, max_attempts=settings.HR_JOB_MAX_ATTEMPTS,
+        created_by=user if user is not None and user.is_authenticated else None,
+    )
+
+
+# ------------------- PROGRESS -------------------
+class Progress:
+    """Records ``done`` of ``total`` on the job row, at most once a second; doubles as the heartbeat."""
+    def __init__(self, job, total):
+        self.job = job
+        self.total = max(total, 1)
+        self.saved_at = 0
+
+    def __call__(self, done):
+        now = time.monotonic()
+        if now - self.saved_at < 1:
+            return
+        self.saved_at = now
+        claimed(self.job).update(progress=min(99, done * 100 // self.total), heartbeat_at=timezone.now())
+
+def job_path(job, filename):
+    """``(relative, absolute)`` path of a job's output file."""
+    relative = os.path.join(settings.HR_JOB_DIR, str(job.pk), get_valid_filename(filename))
+    return relative, os.path.join(settings.MEDIA_ROOT, relative)
+
+
+# ------------------- HANDLERS -------------------
+def run_export(job):
+    filename, header, qs, row = EXPORTS[job.params['export']](job.params)
+    progress = Progress(job, qs.count())
+    fmt = job.params.get('format', 'csv')
+    if fmt in FORMATS:
+        relative, path = job_path(job, os.path.splitext(filename)[0] + FORMATS[fmt])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_table(path, job.params['export'], job.params, fmt, progress=progress)
+        return relative
+
+    relative, path = job_path(job, filename)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', newline='', encoding='utf-8') as output:
+        writer = csv.writer(output)
+        writer.writerow(header)
+        for done, fields in enumerate(qs.iterator(chunk_size=EXPORT_CHUNK_SIZE), 1):
+            writer.writerow(row(*fields))
+            if done % EXPORT_CHUNK_SIZE == 0:
+                progress(done)
+    return relative
+
+def run_letters(job):
+    letter_type = job.params['letter_type']
+    if letter_type not in LETTER_TEMPLATES:
+        raise ValueError(f"Invalid letter type {letter_type!r}")
+    employees = bulk_letter_employees(job.params)
+    progress = Progress(job, employees.count())
+
+    def counted(rows):
+        for done, employee in enumerate(rows, 1):
+            progress(done)
+            yield employee
+
+    relative, path = job_path(job, f'{letter_type}s.zip')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    documents = letter_documents(counted(employees.iterator(chunk_size=500)), letter_type, job.params.get('format') == 'pdf')
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for filename, data in documents:
+            archive.writestr(filename, data)
+    return relative
+
+JOB_HANDLERS = {
+    'export': run_export,
+    'letters': run_letters,
+}
+
+
+# ------------------- WORKER -------------------
+def requeue_stale():
+    """Put back jobs whose worker stopped sending heartbeats; fail those out of attempts."""
+    cutoff = timezone.now() - timedelta(seconds=settings.HR_JOB_STALE_AFTER)
+    stale = Job.objects.filter(status='running', heartbeat_at__lt=cutoff)
+    stale.filter(attempts__gte=F('max_attempts')).update(
+        status='failed', error='Worker stopped responding.', finished_at=timezone.now(),
+    )
+    return stale.update(status='queued', worker='', progress=0)
+
+def purge_jobs(older_than=None):
+    """
+    Delete jobs that finished more than ``older_than`` seconds ago (default
+    HR_JOB_RETENTION) together with their output files. Returns the count.
+    """
+    older_than = settings.HR_JOB_RETENTION if older_than is None else older_than
+    cutoff = timezone.now() - timedelta(seconds=older_than)
+    expired = list(Job.objects.filter(status__in=('done', 'failed'), finished_at__lt=cutoff).values_list('pk', flat=True))
+    # rows first, so nothing links to a file while it is being removed
+    Job.objects.filter(pk__in=expired).delete()
+    for pk in expired:
+        shutil.rmtree(os.path.join(settings.MEDIA_ROOT, settings.HR_JOB_DIR, str(pk)), ignore_errors=True)
+    return len(expired)
+
+def claim_job(worker):
+    now = timezone.now()
+    candidates = Job.objects.filter(status='queued', run_after__lte=now).order_by('run_after', 'pk')
+    for pk in candidates.values_list('pk', flat=True)[:10]:
+        claimed = Job.objects.filter(pk=pk, status='queued').update(
+            status='running', worker=worker, heartbeat_at=now, attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+def claimed(job):
+    """
+    The job's row while this worker still holds it. requeue_stale() may
+    have failed or requeued a job whose worker stalled, and that worker
+    must not overwrite the row once it wakes up.
+    """
+    return Job.objects.filter(pk=job.pk, status='running', worker=job.worker)
+
+def run_job(job):
+    """Run a claimed job; True if it finished and this worker still held it."""
+    try:
+        relative = JOB_HANDLERS[job.kind](job)
+    except Exception:
+        error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            delay = settings.HR_JOB_RETRY_DELAY * 2 ** (job.attempts - 1)
+            claimed(job).update(
+                status='queued', worker='', progress=0, error=error,
+                run_after=timezone.now() + timedelta(seconds=delay),
+            )
+        else:
+            claimed(job).update(status='failed', error=error, finished_at=timezone.now())
+        return False
+    return bool(claimed(job).update(
+        status='done', progress=100, file=relative, error='', finished_at=timezone.now(),
+    ))
+
+def worker_name(index=0):
+    return f'{socket.gethostname()}:{os.getpid()}:{index}'
+
+def run_worker(name, poll_interval=None, burst=False, stdout=None):
+    """
+    Claim and run jobs until interrupted. With ``burst`` return once the
+    queue is empty instead of polling, e.g. for cron or tests.
+    """
+    poll_interval = settings.HR_JOB_POLL_INTERVAL if poll_interval is None else poll_interval
+    processed = 0
+    purged_at = None
+    while True:
+        close_old_connections()
+        requeue_stale()
+        if purged_at is None or time.monotonic() - purged_at >= settings.HR_JOB_PURGE_INTERVAL:
+            purge_jobs()
+            purged_at = time.monotonic()
+        job = claim_job(name)
+        if job is None:
+            if burst:
+                return processed
+            time.sleep(poll_interval)
+            continue
+        ok = run_job(job)
+        processed += 1
+        if stdout is not None:
+            stdout.write(f"{name}: job {job.pk} ({job.kind}) {'done' if ok else 'failed'}")
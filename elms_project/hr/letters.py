@@ -0,0 +1,124 @@
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from django.conf import settings
+from django.template.loader import get_template
+from django.utils.text import get_valid_filename
+
+LETTER_TEMPLATES = {
+    'offer_letter': 'hr/letters/offer_letter.html',
+    'experience_letter': 'hr/letters/experience_letter.html',
+    'resignation_letter': 'hr/letters/resignation_letter.html',
+    'termination_letter': 'hr/letters/termination_letter.html',
+    'warning_letter': 'hr/letters/warning_letter.html',
+}
+
+
+# ------------------- PDF -------------------
+def pdf_available():
+    try:
+        import weasyprint  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def html_to_pdf(html):
+    # runs in a worker process; keep it free of Django state
+    from weasyprint import HTML
+    return HTML(string=html).write_pdf()
+
+def parallel_map(function, named_items, workers, window):
+    """
+    Apply ``function`` to the values of ``(name, value)`` pairs in a process
+    pool, yielding ``(name, result)`` in input order. At most ``window`` items
+    are in flight, so a large batch is never held in memory all at once.
+    """
+    if workers <= 1:
+        for name, value in named_items:
+            yield name, function(value)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for name, value in named_items:
+            pending.append((name, pool.submit(function, value)))
+            if len(pending) >= window:
+                name, future = pending.popleft()
+                yield name, future.result()
+        while pending:
+            name, future = pending.popleft()
+            yield name, future.result()
+
+
+# ------------------- RENDERING -------------------
+def render_letters(employees, letter_type):
+    """Yield ``(filename stem, html)`` per employee from one compiled template."""
+    template = get_template(LETTER_TEMPLATES[letter_type])
+    date = datetime.today()
+    for employee in employees:
+        name = get_valid_filename(f'{letter_type}_{employee.employee_id}')
+        yield name, template.render({'employee': employee, 'date': date})
+
+def bulk_letter_employees(data):
+    """Employees named in ``employee_ids``, or matching the designation/status filter."""
+    # imported here: PDF worker processes import this module before Django is set up
+    from .models import Employee
+    employees = Employee.objects.order_by('employee_id')
+    employee_ids = data.get('employee_ids', '').replace(',', ' ').split()
+    if employee_ids:
+        return employees.filter(employee_id__in=employee_ids)
+    designation = data.get('designation', '').strip()
+    if designation:
+        employees = employees.filter(designation__iexact=designation)
+    status = data.get('status', 'active')
+    if status in ('active', 'inactive'):
+        employees = employees.filter(is_active=(status == 'active'))
+    return employees
+
+def letter_documents(employees, letter_type, as_pdf):
+    """Yield ``(filename, bytes)`` for each employee's letter, as PDF or HTML."""
+    letters = render_letters(employees, letter_type)
+    if not as_pdf:
+        for name, html in letters:
+            yield f'{name}.html', html.encode()
+        return
+    workers = settings.HR_LETTER_PDF_WORKERS
+    for name, pdf in parallel_map(html_to_pdf, letters, workers, window=workers * 2):
+        yield f'{name}.pdf', pdf
+
+
+# ------------------- ZIP STREAMING -------------------
+class ZipStream:
+    """
+    Write-only, non-seekable sink for zipfile. zipfile then writes each entry
+    with a trailing data descriptor, and every finished entry can be drained
+    and sent straight away.
+    """
+    def __init__(self):
+        self.chunks = []
+        self.offset = 0
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.offset += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.offset
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+def stream_zip(documents):
+    stream = ZipStream()
+    with zipfile.ZipFile(stream, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for filename, data in documents:
+            archive.writestr(filename, data)
+            yield stream.drain()
+    yield stream.drain()
@@ -0,0 +1,113 @@
+"""
+Employee ID lookups for form autofill (``get_employee_details``).
+
+Lookups go through two layers before the database: a small in-process LRU
+and the shared Django cache. Misses from both are resolved with a single
+``employee_id__in`` query, so the batch endpoint costs one query however
+many IDs it asks for. Unknown IDs are remembered in the LRU only, because
+partially typed IDs are the common case but employees created in bulk
+(which skips signals) must not stay "unknown" in the shared cache.
+
+Saving or deleting an Employee drops its entries from this process's LRU
+and from the shared cache (see hr.signals). Other processes' LRUs are not
+reachable, so their entries expire after HR_LOOKUP_LRU_TTL seconds. The
+second layer is skipped when the Django cache is local to each process too
+(hr.caching.shared_cache), since its entries would live an hour.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .caching import KEY_PREFIX, shared_cache
+from .models import Employee
+
+LOOKUP_FIELDS = ('name', 'designation', 'cnic')
+MISSING = 'missing'  # cached in place of details for unknown IDs
+
+
+class LRUCache:
+    """Thread-safe, size-bounded mapping whose entries also expire after ``ttl`` seconds."""
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get_many(self, keys):
+        now = time.monotonic()
+        found = {}
+        with self.lock:
+            for key in keys:
+                entry = self.entries.get(key)
+                if entry is None:
+                    continue
+                expires, value = entry
+                if expires < now:
+                    del self.entries[key]
+                    continue
+                self.entries.move_to_end(key)
+                found[key] = value
+        return found
+
+    def set_many(self, values):
+        expires = time.monotonic() + self.ttl
+        with self.lock:
+            for key, value in values.items():
+                self.entries[key] = (expires, value)
+                self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def delete_many(self, keys):
+        with self.lock:
+            for key in keys:
+                self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+local = LRUCache(settings.HR_LOOKUP_LRU_SIZE, settings.HR_LOOKUP_LRU_TTL)
+
+
+def lookup_key(employee_id):
+    return f'{KEY_PREFIX}:emp:{employee_id}'
+
+async def lookup_employees(employee_ids):
+    """``{employee_id: {name, designation, cnic} or None}`` for each requested ID."""
+    employee_ids = list(dict.fromkeys(employee_ids))
+    found = local.get_many(employee_ids)
+
+    missing = [employee_id for employee_id in employee_ids if employee_id not in found]
+    if missing and shared_cache():
+        shared = await cache.aget_many([lookup_key(employee_id) for employee_id in missing])
+        from_shared = {
+            employee_id: shared[lookup_key(employee_id)]
+            for employee_id in missing if lookup_key(employee_id) in shared
+        }
+        local.set_many(from_shared)
+        found.update(from_shared)
+
+    missing = [employee_id for employee_id in employee_ids if employee_id not in found]
+    if missing:
+        from_db = {employee_id: MISSING for employee_id in missing}
+        async for row in Employee.objects.filter(employee_id__in=missing).values('employee_id', *LOOKUP_FIELDS):
+            from_db[row.pop('employee_id')] = row
+        if shared_cache():
+            await cache.aset_many(
+                {lookup_key(employee_id): value for employee_id, value in from_db.items() if value != MISSING},
+                timeout=settings.HR_LOOKUP_CACHE_TIMEOUT,
+            )
+        local.set_many(from_db)
+        found.update(from_db)
+
+    return {employee_id: None if found[employee_id] == MISSING else found[employee_id] for employee_id in employee_ids}
+
+def forget_employees(employee_ids):
+    employee_ids = [employee_id for employee_id in employee_ids if employee_id]
+    local.delete_many(employee_ids)
+    cache.delete_many([lookup_key(employee_id) for employee_id in employee_ids])
@@ -0,0 +1,45 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hr.benchmark import SCENARIOS, compare, run_benchmark
+
+
+class Command(BaseCommand):
+    help = "Benchmark the HR views through the test client and report latency, throughput and queries as JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--warmup', type=int, default=2)
+        parser.add_argument('--scenario', action='append', choices=[scenario.name for scenario in SCENARIOS],
+                            help="Only run this scenario; repeat to pick several.")
+        parser.add_argument('--no-cache', action='store_true',
+                            help="Bypass the response cache so every request renders from the database.")
+        parser.add_argument('--output', help="Write the JSON report to this file instead of stdout.")
+        parser.add_argument('--compare', help="Earlier JSON report to compare p95, throughput and queries against.")
+
+    def handle(self, *args, **options):
+        try:
+            report = run_benchmark(
+                options['iterations'], options['warmup'], options['scenario'], use_cache=not options['no_cache'],
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as fileobj:
+                fileobj.write(output + '\n')
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}."))
+        else:
+            self.stdout.write(output)
+
+        if options['compare']:
+            try:
+                with open(options['compare'], encoding='utf-8') as fileobj:
+                    previous = json.load(fileobj)
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Could not read {options['compare']}: {exc}")
+            for name, metric, before, after, ratio in compare(previous, report):
+                change = f"{ratio:.2f}x" if ratio is not None else "n/a"
+                self.stderr.write(f"{name:24} {metric:15} {before:10.2f} -> {after:10.2f}  {change}")
@@ -0,0 +1,33 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+
+from hr.benchmark import run_load_test, session_cookie
+from hr.models import Employee
+
+
+class Command(BaseCommand):
+    help = "Load-test a running server with concurrent GETs and report throughput and latency as JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help="Base URL of the running server.")
+        parser.add_argument('--path', action='append',
+                            help="Path to request; repeat for a mix. Defaults to employee lookups, the "
+                                 "dashboard and the attendance export.")
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--username', default='hr-benchmark',
+                            help="User to log in as; created (without staff rights) if it does not exist.")
+
+    def handle(self, *args, **options):
+        paths = options['path']
+        if not paths:
+            employee_id = Employee.objects.order_by('pk').values_list('employee_id', flat=True).first() or 'E001'
+            details = reverse('hr:get_employee_details', args=[employee_id])
+            paths = [details, details, details, reverse('hr:dashboard'), reverse('hr:export_attendance_csv')]
+
+        report = run_load_test(
+            options['url'], paths, options['concurrency'], options['requests'], session_cookie(options['username']),
+        )
+        self.stdout.write(json.dumps(report, indent=2))
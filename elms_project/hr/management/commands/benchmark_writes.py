@@ -0,0 +1,21 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hr.benchmark import database_profile, run_write_benchmark
+
+
+class Command(BaseCommand):
+    help = "Measure attendance write throughput with N simultaneous writers and report it as JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, nargs='+', default=[1, 2, 4, 8],
+                            help="Concurrent writer counts to run, e.g. --writers 1 4 16.")
+        parser.add_argument('--writes', type=int, default=200, help="Writes per writer.")
+
+    def handle(self, *args, **options):
+        try:
+            runs = [run_write_benchmark(writers, options['writes']) for writers in options['writers']]
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(json.dumps({'database': database_profile(), 'runs': runs}, indent=2))
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hr.models import parse_month
+from hr.payroll import generate_payroll
+
+
+class Command(BaseCommand):
+    help = "Create (or update) a month's Salary rows for every active employee from base pay and attendance."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--month', required=True, help="Month number or name.")
+        parser.add_argument('--year', type=int, required=True)
+        parser.add_argument('--skip-existing', action='store_true',
+                            help="Leave employees who already have a salary row for the period untouched.")
+
+    def handle(self, *args, **options):
+        month = parse_month(options['month'])
+        if month is None:
+            raise CommandError(f"Unknown month: {options['month']}")
+
+        started = time.perf_counter()
+        summary = generate_payroll(options['year'], month, skip_existing=options['skip_existing'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Payroll {month}/{options['year']}: {summary['created']} created, {summary['updated']} updated, "
+            f"{summary['skipped']} skipped without base salary ({elapsed:.2f}s)."
+        ))
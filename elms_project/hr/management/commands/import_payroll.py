@@ -0,0 +1,44 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hr.importers import IMPORTERS, IMPORT_BATCH_SIZE, import_file
+from hr.payments import import_payment_file
+
+
+class Command(BaseCommand):
+    help = "Bulk import monthly attendance or salary records, or post a bank file of salary payments, from a CSV/XLSX file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV or XLSX file with an 'Employee ID' column plus the record columns.")
+        parser.add_argument('--kind', choices=sorted([*IMPORTERS, 'payments']), required=True)
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help="Validate and report without saving anything.")
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], 'rb') as fileobj:
+                if options['kind'] == 'payments':
+                    result = import_payment_file(
+                        fileobj, options['path'], batch_size=options['batch_size'], dry_run=options['dry_run'],
+                    )
+                else:
+                    result = import_file(
+                        options['kind'], fileobj, options['path'],
+                        batch_size=options['batch_size'], dry_run=options['dry_run'],
+                    )
+        except OSError as exc:
+            raise CommandError(str(exc))
+        except (ValueError, csv.Error) as exc:
+            raise CommandError(f"Could not read {options['path']}: {exc}")
+
+        for line, message in result.errors:
+            self.stderr.write(f"line {line}: {message}")
+
+        summary = (
+            f"{'Validated' if options['dry_run'] else 'Imported'} {result.imported} of {result.rows} rows "
+            f"in {result.elapsed:.2f}s ({result.rows_per_second:.0f} rows/sec), {len(result.errors)} error(s)."
+        )
+        if getattr(result, 'duplicates', 0):
+            summary += f" {result.duplicates} already posted reference(s) skipped."
+        self.stdout.write(self.style.WARNING(summary) if result.errors else self.style.SUCCESS(summary))
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from hr.jobs import purge_jobs
+
+
+class Command(BaseCommand):
+    help = "Delete finished background jobs and their output files."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=float,
+                            help="Delete jobs finished more than this many days ago (default HR_JOB_RETENTION).")
+
+    def handle(self, *args, **options):
+        days = options['days']
+        if days is not None and days < 0:
+            raise CommandError("--days must not be negative.")
+        older_than = settings.HR_JOB_RETENTION if days is None else days * 24 * 60 * 60
+        count = purge_jobs(older_than)
+        self.stdout.write(self.style.SUCCESS(f"Deleted {count} finished job(s)."))
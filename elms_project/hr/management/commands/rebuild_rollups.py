@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from hr.models import parse_month
+from hr.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild the MonthlyRollup summary table from Attendance and Salary."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--year', type=int, help="Only rebuild this year (all months unless --month is given).")
+        parser.add_argument('--month', help="Only rebuild this month (number or name); requires --year.")
+
+    def handle(self, *args, **options):
+        year, month = options['year'], options['month']
+        if month and not year:
+            raise CommandError("--month requires --year.")
+
+        periods = None
+        if year:
+            if month:
+                number = parse_month(month)
+                if number is None:
+                    raise CommandError(f"Unknown month: {month}")
+                periods = [(year, number)]
+            else:
+                periods = [(year, number) for number in range(1, 13)]
+
+        count = rebuild_rollups(periods)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} monthly rollup(s)."))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from hr.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the employee full-text search index from the Employee table."
+
+    def handle(self, *args, **options):
+        if rebuild_index():
+            self.stdout.write(self.style.SUCCESS("Employee search index rebuilt."))
+        else:
+            self.stdout.write(self.style.WARNING("This database has no search index; searches use icontains."))
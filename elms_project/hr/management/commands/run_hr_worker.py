@@ -0,0 +1,55 @@
+import multiprocessing
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+
+def worker_process(index, poll_interval, burst):
+    # under the spawn start method (Windows, macOS) the child starts without Django
+    import django
+    django.setup()
+    from hr.jobs import run_worker, worker_name
+    try:
+        run_worker(worker_name(index), poll_interval, burst)
+    except KeyboardInterrupt:
+        pass
+
+
+class Command(BaseCommand):
+    help = "Run background export and letter jobs from the database queue."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=settings.HR_JOB_WORKERS,
+                            help="Worker processes to run (default HR_JOB_WORKERS).")
+        parser.add_argument('--poll', type=float, default=settings.HR_JOB_POLL_INTERVAL,
+                            help="Seconds to wait between checks of an empty queue.")
+        parser.add_argument('--burst', action='store_true',
+                            help="Exit once the queue is empty instead of polling.")
+
+    def handle(self, *args, **options):
+        from hr.jobs import run_worker, worker_name
+
+        workers, poll, burst = options['workers'], options['poll'], options['burst']
+        self.stdout.write(f"Starting {workers} HR worker{'s' if workers != 1 else ''}.")
+        if workers <= 1:
+            try:
+                run_worker(worker_name(), poll, burst, stdout=self.stdout)
+            except KeyboardInterrupt:
+                pass
+            return
+
+        # children must open their own connections
+        connections.close_all()
+        processes = [
+            multiprocessing.Process(target=worker_process, args=(index, poll, burst))
+            for index in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.join()
@@ -0,0 +1,41 @@
+import os
+import shutil
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from hr.columnar import FORMATS, arrow_available, write_snapshot
+
+
+class Command(BaseCommand):
+    help = "Write a period-partitioned Arrow (or Parquet) snapshot of employees, attendance and salary."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help="Snapshot directory (default MEDIA_ROOT/snapshots/<timestamp>).")
+        parser.add_argument('--format', choices=list(FORMATS), default='arrow',
+                            help="arrow (default) files can be memory-mapped; parquet files are smaller.")
+        parser.add_argument('--compression', choices=['zstd', 'lz4', 'none'],
+                            help="Default: none for arrow, so files map without decompressing; zstd for parquet.")
+        parser.add_argument('--force', action='store_true', help="Replace --output if it already exists.")
+
+    def handle(self, *args, **options):
+        if not arrow_available():
+            raise CommandError("snapshot_hr requires pyarrow (pip install pyarrow).")
+        fmt = options['format']
+        compression = options['compression'] or ('zstd' if fmt == 'parquet' else 'none')
+        output = options['output'] or os.path.join(
+            settings.MEDIA_ROOT, 'snapshots', timezone.now().strftime('%Y%m%dT%H%M%S'),
+        )
+        if os.path.exists(output):
+            if not options['force']:
+                raise CommandError(f"{output} already exists; pass --force to replace it.")
+            shutil.rmtree(output)
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+
+        manifest = write_snapshot(
+            output, fmt, None if compression == 'none' else compression,
+            stdout=self.stdout if options['verbosity'] > 1 else None,
+        )
+        counts = ', '.join(f"{name} {table['rows']}" for name, table in manifest['tables'].items())
+        self.stdout.write(self.style.SUCCESS(f"Snapshot written to {output}: {counts} rows."))
@@ -0,0 +1,87 @@
+import json
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client
+from django.urls import reverse
+
+from hr.staticfiles import page_weight
+
+PAGES = ['hr:login', 'hr:dashboard', 'hr:employee_list', 'hr:attendance_list', 'hr:salary_list']
+METRICS = ['html_wire_bytes', 'inline_css_bytes', 'inline_js_bytes', 'blocking_requests',
+           'blocking_wire_bytes', 'repeat_view_bytes', 'unsized_assets']
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Report what each page makes the browser fetch before first paint: HTML and inline CSS/JS bytes, "
+        "render-blocking requests, third-party origins, and the bytes a repeat view costs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page', action='append', help="URL name to render (default: the main pages).")
+        parser.add_argument('--html', action='append', metavar='NAME=FILE',
+                            help="Analyse saved HTML instead of rendering, e.g. pages saved before a change.")
+        parser.add_argument('--output', help="Write the JSON report to this file.")
+        parser.add_argument('--compare', help="Earlier JSON report to compare against.")
+
+    def rendered_pages(self, names):
+        pages = {}
+        try:
+            with transaction.atomic():
+                user = get_user_model().objects.create_superuser(f'hr-static-{uuid.uuid4().hex[:8]}', password=None)
+                client = Client()
+                for name in names:
+                    if name != 'hr:login':
+                        client.force_login(user)
+                    response = client.get(reverse(name))
+                    if response.status_code != 200:
+                        raise CommandError(f"{name} returned {response.status_code}")
+                    pages[name] = response.content
+                    client.logout()
+                raise Rollback
+        except Rollback:
+            pass
+        return pages
+
+    def handle(self, *args, **options):
+        if options['html']:
+            pages = {}
+            for item in options['html']:
+                name, _, path = item.partition('=')
+                try:
+                    with open(path, 'rb') as fileobj:
+                        pages[name] = fileobj.read()
+                except OSError as exc:
+                    raise CommandError(f"Could not read {path}: {exc}")
+        else:
+            pages = self.rendered_pages(options['page'] or PAGES)
+        report = {name: page_weight(html) for name, html in pages.items()}
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as fileobj:
+                json.dump(report, fileobj, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}."))
+
+        previous = {}
+        if options['compare']:
+            try:
+                with open(options['compare'], encoding='utf-8') as fileobj:
+                    previous = json.load(fileobj)
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Could not read {options['compare']}: {exc}")
+
+        for name, weight in report.items():
+            origins = ', '.join(weight['third_party_origins']) or 'none'
+            self.stdout.write(f"{name}  (third-party origins: {origins})")
+            for metric in METRICS:
+                line = f"  {metric:22} {weight[metric]:>10}"
+                if name in previous:
+                    line = f"  {metric:22} {previous[name][metric]:>10} -> {weight[metric]:>10}"
+                self.stdout.write(line)
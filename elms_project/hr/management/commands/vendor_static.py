@@ -0,0 +1,42 @@
+import os
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from hr.staticfiles import VENDOR_ASSETS, VENDOR_FILES
+
+
+class Command(BaseCommand):
+    help = "Download the pinned third-party CSS/JS/fonts (hr.staticfiles.VENDOR_ASSETS) into hr/static/hr/vendor/."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Download files that are already there again.")
+        parser.add_argument('--timeout', type=int, default=30)
+
+    def handle(self, *args, **options):
+        root = Path(apps.get_app_config('hr').path) / 'static'
+        downloads = list(VENDOR_ASSETS.values()) + VENDOR_FILES
+        fetched = 0
+        for path, url in downloads:
+            target = root / path
+            if target.exists() and not options['force']:
+                continue
+            try:
+                with urllib.request.urlopen(url, timeout=options['timeout']) as response:
+                    data = response.read()
+            except (urllib.error.URLError, OSError) as exc:
+                raise CommandError(f"Could not download {url}: {exc}")
+            target.parent.mkdir(parents=True, exist_ok=True)
+            partial = target.with_name(target.name + '.partial')
+            partial.write_bytes(data)
+            os.replace(partial, target)
+            fetched += 1
+            if options['verbosity'] > 1:
+                self.stdout.write(f"{path}: {len(data)} bytes")
+        self.stdout.write(self.style.SUCCESS(
+            f"Vendored {fetched} file(s), {len(downloads) - fetched} already present. "
+            "Run collectstatic next."
+        ))
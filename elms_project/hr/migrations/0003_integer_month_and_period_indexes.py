@@ -0,0 +1,122 @@
+# Converts the free-text month columns on Attendance and Salary to 1-12
+# integers and adds the composite period indexes used by lists, exports and
+# the dashboard.
+
+import calendar
+
+import django.core.validators
+from django.db import migrations, models
+
+MONTH_CHOICES = [(number, calendar.month_name[number]) for number in range(1, 13)]
+
+
+def month_to_number(value):
+    value = (value or '').strip()
+    if value.isdigit() and 1 <= int(value) <= 12:
+        return int(value)
+    for number in range(1, 13):
+        if value.lower() in (calendar.month_name[number].lower(), calendar.month_abbr[number].lower()):
+            return number
+    raise ValueError(f"Cannot convert month {value!r} to a month number; fix the row and re-run migrate.")
+
+
+def forwards(apps, schema_editor):
+    for model_name in ('Attendance', 'Salary'):
+        model = apps.get_model('hr', model_name)
+        for month in model.objects.values_list('month', flat=True).distinct():
+            model.objects.filter(month=month).update(month_number=month_to_number(month))
+
+
+def backwards(apps, schema_editor):
+    for model_name in ('Attendance', 'Salary'):
+        model = apps.get_model('hr', model_name)
+        for number, name in MONTH_CHOICES:
+            model.objects.filter(month_number=number).update(month=name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0002_alter_attendance_options_alter_salary_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendance',
+            name='month_number',
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='salary',
+            name='month_number',
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+        # Nullable first so unapplying can re-add the old column before backfilling it.
+        migrations.AlterField(
+            model_name='attendance',
+            name='month',
+            field=models.CharField(max_length=20, null=True),
+        ),
+        migrations.AlterField(
+            model_name='salary',
+            name='month',
+            field=models.CharField(max_length=20, null=True),
+        ),
+        migrations.RunPython(forwards, backwards),
+        migrations.AlterUniqueTogether(
+            name='attendance',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='salary',
+            unique_together=set(),
+        ),
+        migrations.RemoveField(
+            model_name='attendance',
+            name='month',
+        ),
+        migrations.RemoveField(
+            model_name='salary',
+            name='month',
+        ),
+        migrations.RenameField(
+            model_name='attendance',
+            old_name='month_number',
+            new_name='month',
+        ),
+        migrations.RenameField(
+            model_name='salary',
+            old_name='month_number',
+            new_name='month',
+        ),
+        migrations.AlterField(
+            model_name='attendance',
+            name='month',
+            field=models.PositiveSmallIntegerField(choices=MONTH_CHOICES, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(12)]),
+        ),
+        migrations.AlterField(
+            model_name='salary',
+            name='month',
+            field=models.PositiveSmallIntegerField(choices=MONTH_CHOICES, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(12)]),
+        ),
+        migrations.AlterUniqueTogether(
+            name='attendance',
+            unique_together={('employee', 'year', 'month')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='salary',
+            unique_together={('employee', 'year', 'month')},
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['year', 'month'], name='hr_attendance_period_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='salary',
+            index=models.Index(fields=['year', 'month'], name='hr_salary_period_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='salary',
+            index=models.Index(fields=['status', 'year', 'month'], name='hr_salary_status_period_idx'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Adds the MonthlyRollup summary table and fills it from existing
+# Attendance/Salary rows; afterwards it is kept current by hr.signals.
+
+import calendar
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+MONTH_CHOICES = [(number, calendar.month_name[number]) for number in range(1, 13)]
+
+
+def build_rollups(apps, schema_editor):
+    Attendance = apps.get_model('hr', 'Attendance')
+    Salary = apps.get_model('hr', 'Salary')
+    MonthlyRollup = apps.get_model('hr', 'MonthlyRollup')
+
+    totals = {}
+    for row in Attendance.objects.values('year', 'month').order_by().annotate(
+        attendance_count=Count('id'), present_days=Sum('present_days'), leaves=Sum('leaves'),
+    ):
+        totals.setdefault((row.pop('year'), row.pop('month')), {}).update(row)
+    for row in Salary.objects.values('year', 'month').order_by().annotate(
+        total_payable=Sum('total_salary'), total_paid=Sum('received_salary'),
+        paid_count=Count('id', filter=Q(status='Paid')), unpaid_count=Count('id', filter=Q(status='Unpaid')),
+    ):
+        totals.setdefault((row.pop('year'), row.pop('month')), {}).update(row)
+
+    MonthlyRollup.objects.bulk_create([
+        MonthlyRollup(year=year, month=month, **values) for (year, month), values in totals.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0003_integer_month_and_period_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('month', models.PositiveSmallIntegerField(choices=MONTH_CHOICES)),
+                ('attendance_count', models.IntegerField(default=0)),
+                ('present_days', models.IntegerField(default=0)),
+                ('leaves', models.IntegerField(default=0)),
+                ('total_payable', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('total_paid', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('paid_count', models.IntegerField(default=0)),
+                ('unpaid_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-year', '-month'],
+                'unique_together': {('year', 'month')},
+            },
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Creates the employee search index used by hr.search: an FTS5 table on
+# SQLite, a tsvector/trigram table on PostgreSQL, nothing elsewhere.
+
+from django.db import migrations
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE hr_employee_fts USING fts5(employee_id, name, cnic, designation, tokenize = 'unicode61')",
+    "INSERT INTO hr_employee_fts (rowid, employee_id, name, cnic, designation) "
+    "SELECT id, employee_id, name, COALESCE(cnic, ''), COALESCE(designation, '') FROM hr_employee",
+]
+SQLITE_BACKWARD = ["DROP TABLE IF EXISTS hr_employee_fts"]
+
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE TABLE hr_employee_search ("
+    " employee_id bigint PRIMARY KEY REFERENCES hr_employee (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED,"
+    " document tsvector NOT NULL,"
+    " haystack text NOT NULL)",
+    "CREATE INDEX hr_employee_search_document_idx ON hr_employee_search USING GIN (document)",
+    "CREATE INDEX hr_employee_search_haystack_idx ON hr_employee_search USING GIN (haystack gin_trgm_ops)",
+    "INSERT INTO hr_employee_search (employee_id, document, haystack) "
+    "SELECT id, to_tsvector('simple', concat_ws(' ', employee_id, name, cnic, designation)), "
+    "lower(concat_ws(' ', employee_id, name, cnic, designation)) FROM hr_employee",
+]
+POSTGRES_BACKWARD = ["DROP TABLE IF EXISTS hr_employee_search"]
+
+STATEMENTS = {
+    'sqlite': (SQLITE_FORWARD, SQLITE_BACKWARD),
+    'postgresql': (POSTGRES_FORWARD, POSTGRES_BACKWARD),
+}
+
+
+def run(direction):
+    def operation(apps, schema_editor):
+        statements = STATEMENTS.get(schema_editor.connection.vendor)
+        if statements:
+            for sql in statements[direction]:
+                schema_editor.execute(sql)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0004_monthlyrollup'),
+    ]
+
+    operations = [
+        migrations.RunPython(run(0), run(1)),
+    ]
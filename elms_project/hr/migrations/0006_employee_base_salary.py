@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0005_employee_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='base_salary',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def stamp_existing(apps, schema_editor):
+    Employee = apps.get_model('hr', 'Employee')
+    Employee.objects.filter(updated_at__isnull=True).update(updated_at=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0006_employee_base_salary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, blank=True, null=True),
+        ),
+        migrations.RunPython(stamp_existing, migrations.RunPython.noop),
+    ]
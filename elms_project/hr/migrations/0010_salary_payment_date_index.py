@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0009_change_feed'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='salary',
+            index=models.Index(fields=['payment_date'], name='hr_salary_payment_date_idx'),
+        ),
+    ]
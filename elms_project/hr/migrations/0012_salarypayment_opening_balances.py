@@ -0,0 +1,50 @@
+# Seeds the payment ledger with one opening-balance payment per salary for
+# whatever received_salary holds beyond its ledger payments, so the ledger
+# adds up to received_salary for rows paid before it existed.
+
+from datetime import date
+from decimal import Decimal
+from itertools import islice
+
+from django.db import migrations
+from django.db.models import DecimalField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+OPENING_BATCH = 'opening'
+BATCH_SIZE = 1000
+
+
+def seed_opening_balances(apps, schema_editor):
+    Salary = apps.get_model('hr', 'Salary')
+    SalaryPayment = apps.get_model('hr', 'SalaryPayment')
+    posted = (SalaryPayment.objects.filter(salary=OuterRef('pk')).order_by().values('salary')
+              .annotate(total=Sum('amount')).values('total'))
+    money = DecimalField(max_digits=10, decimal_places=2)
+    rows = Salary.objects.annotate(
+        posted=Coalesce(Subquery(posted, output_field=money), Value(Decimal('0')), output_field=money),
+    ).values_list('pk', 'received_salary', 'posted', 'payment_date', 'created_at').iterator(chunk_size=BATCH_SIZE)
+
+    while batch := list(islice(rows, BATCH_SIZE)):
+        SalaryPayment.objects.bulk_create([
+            SalaryPayment(
+                salary_id=salary_pk, amount=received - posted, batch=OPENING_BATCH,
+                paid_on=payment_date or (created_at.date() if created_at else date.today()),
+            )
+            for salary_pk, received, posted, payment_date, created_at in batch
+            if received != posted
+        ])
+
+
+def remove_opening_balances(apps, schema_editor):
+    apps.get_model('hr', 'SalaryPayment').objects.filter(batch=OPENING_BATCH).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0011_salarypayment'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_opening_balances, remove_opening_balances),
+    ]
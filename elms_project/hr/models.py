@@ -1,7 +1,26 @@
+import calendar
+import os
+
+from django.conf import settings
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 
+MONTH_CHOICES = [(number, calendar.month_name[number]) for number in range(1, 13)]
+MONTH_NAMES = dict(MONTH_CHOICES)
+
+def parse_month(value):
+    """Accept 1-12, a full month name or its three-letter abbreviation."""
+    value = str(value).strip()
+    if value.isdigit():
+        number = int(value)
+        return number if 1 <= number <= 12 else None
+    value = value.lower()
+    for number in range(1, 13):
+        if value in (calendar.month_name[number].lower(), calendar.month_abbr[number].lower()):
+            return number
+    return None
+
 class Employee(models.Model):
     employee_id = models.CharField(max_length=20, unique=True)
     name = models.CharField(max_length=200)
@@ -12,14 +31,19 @@ class Employee(models.Model):
     contact_number = models.CharField(max_length=30, blank=True, null=True)
     address = models.TextField(blank=True, null=True)
     date_joined = models.DateField(default=timezone.now, blank=True, null=True)  # Make nullable first
+    base_salary = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True, blank=True, null=True)
 
     def __str__(self):
         return f"{self.employee_id} - {self.name}"
 
 class Attendance(models.Model):
     employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='attendances')
-    month = models.CharField(max_length=20)
+    month = models.PositiveSmallIntegerField(
+        choices=MONTH_CHOICES,
+        validators=[MinValueValidator(1), MaxValueValidator(12)]
+    )
     year = models.PositiveSmallIntegerField(
         default=timezone.now().year,
         validators=[MinValueValidator(2000), MaxValueValidator(2100)]
@@ -31,16 +55,23 @@ class Attendance(models.Model):
     updated_at = models.DateTimeField(auto_now=True, blank=True, null=True)  # Make nullable first
 
     class Meta:
-        unique_together = (('employee', 'month', 'year'),)
+        unique_together = (('employee', 'year', 'month'),)
         ordering = ['-year', '-month']
+        indexes = [
+            models.Index(fields=['year', 'month'], name='hr_attendance_period_idx'),
+            models.Index(fields=['updated_at', 'id'], name='hr_attendance_updated_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.employee.employee_id} - {self.month}/{self.year}"
+        return f"{self.employee.employee_id} - {self.get_month_display()}/{self.year}"
 
 class Salary(models.Model):
     STATUS_CHOICES = (('Paid','Paid'),('Unpaid','Unpaid'))
     employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='salaries')
-    month = models.CharField(max_length=20)
+    month = models.PositiveSmallIntegerField(
+        choices=MONTH_CHOICES,
+        validators=[MinValueValidator(1), MaxValueValidator(12)]
+    )
     year = models.PositiveSmallIntegerField(
         default=timezone.now().year,
         validators=[MinValueValidator(2000), MaxValueValidator(2100)]
@@ -53,17 +84,134 @@ class Salary(models.Model):
     updated_at = models.DateTimeField(auto_now=True, blank=True, null=True)  # Make nullable first
 
     class Meta:
-        unique_together = (('employee', 'month', 'year'),)
+        unique_together = (('employee', 'year', 'month'),)
         ordering = ['-year', '-month']
+        indexes = [
+            models.Index(fields=['year', 'month'], name='hr_salary_period_idx'),
+            models.Index(fields=['status', 'year', 'month'], name='hr_salary_status_period_idx'),
+            models.Index(fields=['payment_date'], name='hr_salary_payment_date_idx'),
+            models.Index(fields=['updated_at', 'id'], name='hr_salary_updated_idx'),
+        ]
 
-    def save(self, *args, **kwargs):
+    def update_status(self):
         if self.received_salary >= self.total_salary:
             self.status = 'Paid'
             if not self.payment_date:
                 self.payment_date = timezone.now().date()
         else:
             self.status = 'Unpaid'
+
+    def save(self, *args, **kwargs):
+        self.update_status()
         super().save(*args, **kwargs)
 
     def __str__(self):
-        return f"{self.employee.employee_id} - Salary {self.month}/{self.year}"
\ No newline at end of file
+        return f"{self.employee.employee_id} - Salary {self.get_month_display()}/{self.year}"
+
+REFERENCE_POSTED = "A payment with this reference has already been posted."
+
+class SalaryPayment(models.Model):
+    """
+    One payment against a salary. Rows are only ever inserted (a negative
+    amount reverses an earlier payment); hr.payments adds them to
+    Salary.received_salary in the same transaction.
+    """
+    salary = models.ForeignKey(Salary, on_delete=models.CASCADE, related_name='payments')
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    paid_on = models.DateField(default=timezone.localdate)
+    reference = models.CharField(max_length=64, blank=True, help_text="Bank reference; each one can be posted once.")
+    batch = models.CharField(max_length=32, editable=False)
+    recorded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at', '-pk']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['reference'], condition=~models.Q(reference=''), name='hr_salarypayment_reference_uniq',
+                violation_error_message=REFERENCE_POSTED,
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['batch', 'salary'], name='hr_salarypayment_batch_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.amount} on {self.paid_on} ({self.reference or 'no reference'})"
+
+class MonthlyRollup(models.Model):
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField(choices=MONTH_CHOICES)
+    attendance_count = models.IntegerField(default=0)
+    present_days = models.IntegerField(default=0)
+    leaves = models.IntegerField(default=0)
+    total_payable = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    total_paid = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    paid_count = models.IntegerField(default=0)
+    unpaid_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = (('year', 'month'),)
+        ordering = ['-year', '-month']
+
+    @property
+    def salary_count(self):
+        return self.paid_count + self.unpaid_count
+
+    def __str__(self):
+        return f"Rollup {self.get_month_display()}/{self.year}"
+
+class Tombstone(models.Model):
+    """Record of a deleted Attendance or Salary row, for the change feed (hr.exports.change_export)."""
+    KIND_CHOICES = (('attendance', 'Attendance'), ('salary', 'Salary'))
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    employee_code = models.CharField(max_length=20)  # Employee.employee_id, which may be gone too
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField(choices=MONTH_CHOICES)
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-deleted_at']
+        indexes = [
+            models.Index(fields=['kind', 'deleted_at'], name='hr_tombstone_feed_idx'),
+        ]
+
+    def __str__(self):
+        return f"Deleted {self.kind} {self.object_id} ({self.employee_code} {self.month}/{self.year})"
+
+class Job(models.Model):
+    """A background export or letter batch, run by ``manage.py run_hr_worker`` (see hr.jobs)."""
+    STATUS_CHOICES = (('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed'))
+    kind = models.CharField(max_length=30)
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    progress = models.PositiveSmallIntegerField(default=0)  # percent
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    worker = models.CharField(max_length=100, blank=True)
+    heartbeat_at = models.DateTimeField(blank=True, null=True)
+    error = models.TextField(blank=True)
+    file = models.CharField(max_length=255, blank=True)  # relative to MEDIA_ROOT
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='hr_job_queue_idx'),
+        ]
+
+    @property
+    def active(self):
+        return self.status in ('queued', 'running')
+
+    @property
+    def filename(self):
+        return os.path.basename(self.file)
+
+    def __str__(self):
+        return f"Job {self.pk} - {self.kind} ({self.status})"
@@ -0,0 +1,119 @@
+import base64
+import json
+import math
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+PAGE_SIZE = 50
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def storable(value):
+    """False for numbers no database column holds (infinities, NaN, ints past 64 bits)."""
+    if isinstance(value, int):
+        return -2**63 <= value < 2**63
+    if isinstance(value, (float, Decimal)):
+        return math.isfinite(value)
+    return True
+
+def decode_cursor(cursor, types):
+    """
+    The cursor's values, each converted by the matching callable in
+    ``types``, or None for a malformed or tampered cursor (which then
+    reads as the first page).
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(types) or None in values:
+            return None
+        values = [convert(value) for convert, value in zip(types, values)]
+    except (ValueError, TypeError, OverflowError, ValidationError):
+        return None
+    return values if all(map(storable, values)) else None
+
+def field_types(model, ordering):
+    """to_python() of each ``ordering`` field, for decode_cursor()."""
+    fields = [field.lstrip('-') for field in ordering]
+    return [(model._meta.pk if name == 'pk' else model._meta.get_field(name)).to_python for name in fields]
+
+
+def keyset_filter(ordering, values):
+    """
+    Build the "row comes after ``values``" condition for ``ordering``, e.g.
+    ``('-year', '-month', '-pk')`` becomes
+    ``year < y OR (year = y AND month < m) OR (year = y AND month = m AND pk < p)``.
+    """
+    condition = Q()
+    for i, field in enumerate(ordering):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        step = Q(**{f'{name}__{lookup}': values[i]})
+        for prev_field, prev_value in zip(ordering[:i], values[:i]):
+            step &= Q(**{prev_field.lstrip('-'): prev_value})
+        condition |= step
+    return condition
+
+
+def keyset_queryset(queryset, ordering, cursor=None):
+    ordering = tuple(ordering)
+    queryset = queryset.order_by(*ordering)
+    values = decode_cursor(cursor, field_types(queryset.model, ordering)) if cursor else None
+    if values is not None:
+        queryset = queryset.filter(keyset_filter(ordering, values))
+    return queryset
+
+
+def keyset_page(rows, ordering, page_size):
+    """Trim the page_size + 1 fetched ``rows`` to a page and its next cursor."""
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, field.lstrip('-')) for field in ordering])
+    return KeysetPage(rows, next_cursor)
+
+
+def keyset_paginate(queryset, ordering, cursor=None, page_size=PAGE_SIZE):
+    """
+    Return one page of ``queryset`` ordered by ``ordering`` (whose last field
+    must be unique) starting after ``cursor``. Each page is a WHERE on the
+    ordering columns plus LIMIT, so page N costs the same as page 1.
+    """
+    queryset = keyset_queryset(queryset, ordering, cursor)
+    return keyset_page(list(queryset[:page_size + 1]), ordering, page_size)
+
+
+async def akeyset_paginate(queryset, ordering, cursor=None, page_size=PAGE_SIZE):
+    """Async version of keyset_paginate()."""
+    queryset = keyset_queryset(queryset, ordering, cursor)
+    return keyset_page([row async for row in queryset[:page_size + 1]], ordering, page_size)
+
+
+def next_page_query(request, page):
+    """Current query string (filters included) pointed at the next cursor."""
+    if not page.has_next:
+        return ''
+    params = request.GET.copy()
+    params['cursor'] = page.next_cursor
+    return params.urlencode()
@@ -0,0 +1,203 @@
+"""
+Salary payments as an append-only ledger.
+
+Payments are inserted into SalaryPayment and never changed. Every posting,
+one clerk's payment or a whole bank file, is a batch with its own id, and
+in the same transaction the batch is applied to its Salary rows with one
+UPDATE per period, ``received_salary = received_salary + (SUM of the
+batch's payments for that row)``, followed by conditional UPDATEs that
+flip the status of rows whose balance crossed zero. Nothing is read and
+written back, so payments posted at the same time against the same salary
+add up instead of overwriting each other, without locking rows up front.
+The rollups move by F() deltas as well.
+
+Every write of received_salary goes through here: clerks' payments, bank
+files, the admin's "mark paid in full" (hr.payroll.mark_paid) and salary
+imports (hr.importers.post_received), and amounts received before the
+ledger existed are opening-balance payments (migration 0012). So the
+payments of a salary always add up to its received_salary.
+
+Bank files are CSV/XLSX with employee_id, year, month and amount columns
+and optional paid_on and reference columns. References already in the
+ledger are skipped, so a file can safely be posted twice.
+"""
+import time
+import uuid
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.db.models import DecimalField, F, Max, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, Round
+from django.utils import timezone
+
+from .caching import invalidate_periods
+from .importers import IMPORT_BATCH_SIZE, ImportResult, batched, period, read_rows, text, to_date
+from .models import MONTH_NAMES, Salary, SalaryPayment
+from .rollups import apply_delta, period_filter
+
+
+class PaymentResult(ImportResult):
+    def __init__(self):
+        super().__init__()
+        self.batch = ''
+        self.duplicates = 0
+        self.amount = Decimal('0')
+
+
+def new_batch():
+    return uuid.uuid4().hex
+
+def recorder(user):
+    return user if user is not None and user.is_authenticated else None
+
+
+# ------------------- POSTING -------------------
+def apply_batch(batch):
+    """
+    Add the payments of ``batch`` to their salaries and rollups and settle
+    the status of every salary they touch. Must run in the transaction
+    that inserted them. Returns the ``(year, month)`` periods changed.
+    """
+    payments = SalaryPayment.objects.filter(batch=batch)
+    per_salary = payments.filter(salary=OuterRef('pk')).order_by().values('salary')
+    received = Subquery(
+        per_salary.annotate(total=Sum('amount')).values('total'),
+        output_field=DecimalField(max_digits=10, decimal_places=2),
+    )
+    last_paid_on = Subquery(per_salary.annotate(last=Max('paid_on')).values('last'))
+    now = timezone.now()
+
+    periods = []
+    totals = payments.order_by().values('salary__year', 'salary__month').annotate(amount=Sum('amount'))
+    for row in totals:
+        year, month = row['salary__year'], row['salary__month']
+        salaries = Salary.objects.filter(year=year, month=month, pk__in=payments.values('salary_id'))
+        # rounded so binary floating point on SQLite never leaves a balance of 1e-12
+        salaries.update(received_salary=Round(F('received_salary') + received, 2), updated_at=now)
+        paid = salaries.filter(status='Unpaid', received_salary__gte=F('total_salary')).update(
+            status='Paid', payment_date=Coalesce('payment_date', last_paid_on),
+        )
+        unpaid = salaries.filter(status='Paid', received_salary__lt=F('total_salary')).update(status='Unpaid')
+        apply_delta(year, month, {
+            'total_paid': row['amount'],
+            'paid_count': paid - unpaid,
+            'unpaid_count': unpaid - paid,
+        })
+        periods.append((year, month))
+
+    transaction.on_commit(lambda: invalidate_periods('salary', periods))
+    return periods
+
+def post_payments(payments, user=None):
+    """
+    Insert unsaved SalaryPayment objects (salary, amount and optionally
+    paid_on/reference set) as one batch and apply it. Returns the batch id.
+    """
+    payments, batch = list(payments), new_batch()
+    with transaction.atomic():
+        for payment in payments:
+            payment.batch = batch
+            payment.recorded_by = recorder(user)
+        SalaryPayment.objects.bulk_create(payments, batch_size=IMPORT_BATCH_SIZE)
+        apply_batch(batch)
+    return batch
+
+def post_payment(salary, amount, paid_on=None, reference='', user=None):
+    payment = SalaryPayment(salary=salary, amount=amount, paid_on=paid_on or timezone.localdate(), reference=reference)
+    post_payments([payment], user=user)
+    return payment
+
+
+# ------------------- BANK FILES -------------------
+def to_amount(row, field='amount'):
+    value = text(row, field).replace(',', '')
+    try:
+        amount = Decimal(value)
+        if not amount.is_finite():
+            raise ValueError(value)
+        amount = amount.quantize(Decimal('0.01'))
+    except (InvalidOperation, ValueError):
+        raise ValueError(f"{field}: {value!r} is not an amount")
+    if not amount:
+        raise ValueError(f"{field}: must not be zero")
+    return amount
+
+def parse_payment(row):
+    year, month = period(row)
+    return {
+        'employee_id': text(row, 'employee_id'),
+        'year': year,
+        'month': month,
+        'amount': to_amount(row),
+        'paid_on': to_date(row, 'paid_on') or timezone.localdate(),
+        'reference': text(row, 'reference'),
+    }
+
+def import_payments(rows, user=None, batch_size=IMPORT_BATCH_SIZE, dry_run=False):
+    """
+    Post ``(line, row)`` pairs from a bank file as a single batch in one
+    transaction. Each chunk of ``batch_size`` rows resolves its salaries and
+    already-posted references with one query each and is inserted with one
+    bulk INSERT; the batch is then applied with a few UPDATEs per period.
+    Invalid rows are skipped and reported, duplicate references counted.
+    """
+    result = PaymentResult()
+    result.batch = new_batch()
+    seen = set()
+    started = time.perf_counter()
+
+    with transaction.atomic():
+        for chunk in batched(rows, batch_size):
+            result.rows += len(chunk)
+            parsed = []
+            for line, row in chunk:
+                try:
+                    parsed.append((line, parse_payment(row)))
+                except ValueError as exc:
+                    result.errors.append((line, str(exc)))
+            if not parsed:
+                continue
+
+            salaries = {
+                (employee_id, year, month): pk
+                for employee_id, year, month, pk in Salary.objects.filter(
+                    period_filter({(row['year'], row['month']) for _, row in parsed}),
+                    employee__employee_id__in={row['employee_id'] for _, row in parsed},
+                ).values_list('employee__employee_id', 'year', 'month', 'pk')
+            }
+            references = {row['reference'] for _, row in parsed if row['reference']}
+            posted = set(SalaryPayment.objects.filter(reference__in=references).values_list('reference', flat=True))
+
+            payments = []
+            for line, row in parsed:
+                salary_pk = salaries.get((row['employee_id'], row['year'], row['month']))
+                if salary_pk is None:
+                    result.errors.append((line, (
+                        f"employee_id: {row['employee_id']!r} has no salary for "
+                        f"{MONTH_NAMES[row['month']]} {row['year']}"
+                    )))
+                    continue
+                if row['reference'] in posted or row['reference'] in seen:
+                    result.duplicates += 1
+                    continue
+                if row['reference']:
+                    seen.add(row['reference'])
+                payments.append(SalaryPayment(
+                    salary_id=salary_pk, amount=row['amount'], paid_on=row['paid_on'], reference=row['reference'],
+                    batch=result.batch, recorded_by=recorder(user),
+                ))
+                result.amount += row['amount']
+
+            SalaryPayment.objects.bulk_create(payments)
+            result.imported += len(payments)
+
+        apply_batch(result.batch)
+        if dry_run:
+            transaction.set_rollback(True)
+
+    result.errors.sort()
+    result.elapsed = time.perf_counter() - started
+    return result
+
+def import_payment_file(fileobj, filename, **kwargs):
+    return import_payments(read_rows(fileobj, filename), **kwargs)
@@ -0,0 +1,107 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .caching import invalidate_periods
+from .models import Attendance, Employee, Salary, SalaryPayment
+from .payments import post_payments
+from .rollups import rebuild_rollups
+
+PAYROLL_BATCH_SIZE = 1000
+CENT = Decimal('0.01')
+
+
+def payable_amount(base_salary, attendance):
+    """Base pay prorated by present_days / total_days when attendance is recorded."""
+    if attendance:
+        present_days, total_days = attendance
+        if total_days:
+            return (base_salary * present_days / total_days).quantize(CENT)
+    return base_salary
+
+def generate_payroll(year, month, skip_existing=False):
+    """
+    Create the (year, month) Salary row of every active employee with a base
+    salary in one transaction. The period's attendance and any existing
+    salary rows are read with one query each. Rows are written with batched
+    INSERT ... ON CONFLICT DO UPDATE, or DO NOTHING with ``skip_existing``.
+    Existing rows keep their received_salary; their total and status are
+    recalculated.
+    """
+    with transaction.atomic():
+        attendance = {
+            employee_pk: (present_days, total_days)
+            for employee_pk, present_days, total_days in Attendance.objects.filter(year=year, month=month)
+            .values_list('employee_id', 'present_days', 'total_days').iterator()
+        }
+        existing = {
+            employee_pk: (received_salary, payment_date)
+            for employee_pk, received_salary, payment_date in Salary.objects.filter(year=year, month=month)
+            .values_list('employee_id', 'received_salary', 'payment_date').iterator()
+        }
+
+        salaries, skipped = [], 0
+        employees = Employee.objects.filter(is_active=True).values_list('pk', 'base_salary')
+        for employee_pk, base_salary in employees.iterator(chunk_size=PAYROLL_BATCH_SIZE):
+            if not base_salary:
+                skipped += 1
+                continue
+            if skip_existing and employee_pk in existing:
+                continue
+            received_salary, payment_date = existing.get(employee_pk, (Decimal('0'), None))
+            salary = Salary(
+                employee_id=employee_pk, year=year, month=month,
+                total_salary=payable_amount(base_salary, attendance.get(employee_pk)),
+                received_salary=received_salary, payment_date=payment_date,
+            )
+            salary.update_status()
+            salaries.append(salary)
+
+        if skip_existing:
+            Salary.objects.bulk_create(salaries, batch_size=PAYROLL_BATCH_SIZE, ignore_conflicts=True)
+        else:
+            Salary.objects.bulk_create(
+                salaries,
+                batch_size=PAYROLL_BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=['employee', 'year', 'month'],
+                update_fields=['total_salary', 'status', 'payment_date', 'updated_at'],
+            )
+        rebuild_rollups([(year, month)])
+        transaction.on_commit(lambda: invalidate_periods('salary', [(year, month)]))
+
+    updated = sum(1 for salary in salaries if salary.employee_id in existing)
+    return {'created': len(salaries) - updated, 'updated': updated, 'skipped': skipped}
+
+def mark_paid(salaries, payment_date=None, user=None):
+    """
+    Pay every row of ``salaries`` (a Salary queryset) that is not fully paid
+    in full. The outstanding balances are posted to the payment ledger as one
+    batch (hr.payments), which raises received_salary to total_salary and
+    gives rows without a payment date ``payment_date`` (default today). Rows
+    already fully received but still marked Unpaid are only settled. Returns
+    the number of rows changed.
+    """
+    payment_date = payment_date or timezone.localdate()
+    unpaid = salaries.filter(Q(status='Unpaid') | Q(received_salary__lt=F('total_salary'))).order_by()
+    with transaction.atomic():
+        balances = unpaid.filter(received_salary__lt=F('total_salary')).annotate(
+            balance=F('total_salary') - F('received_salary'),
+        ).values_list('pk', 'balance')
+        payments = [
+            SalaryPayment(salary_id=salary_pk, amount=balance.quantize(CENT), paid_on=payment_date)
+            for salary_pk, balance in balances
+        ]
+        post_payments(payments, user=user)
+
+        settled = unpaid.filter(status='Unpaid', received_salary__gte=F('total_salary'))
+        periods = list(settled.values_list('year', 'month').distinct())
+        updated = settled.update(
+            status='Paid', payment_date=Coalesce('payment_date', Value(payment_date)), updated_at=timezone.now(),
+        )
+        rebuild_rollups(periods)
+        transaction.on_commit(lambda: invalidate_periods('salary', periods))
+    return len(payments) + updated
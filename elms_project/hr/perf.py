@@ -0,0 +1,194 @@
+"""
+Per-view request instrumentation.
+
+``PerfMiddleware`` times every request and counts the SQL it runs, with the
+query time, how many statements repeat (the usual N+1 signature) and time
+spent rendering templates. Records go into a bounded in-process ring buffer
+that backs the /admin/perf/ report. They are optionally appended to a
+JSON-lines file as well. With HR_PERF_STRICT on, a view that goes over its
+query budget raises ``QueryBudgetExceeded`` so tests fail loudly.
+
+Latency is measured until the view returns its response, so streamed
+bodies (exports, letter ZIPs) are not included.
+"""
+import contextvars
+import json
+import math
+import threading
+import time
+from collections import Counter, deque
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+UNRESOLVED = '<unresolved>'
+
+_buffer = deque(maxlen=getattr(settings, 'HR_PERF_BUFFER_SIZE', 5000))
+_sink_lock = threading.Lock()
+_current = contextvars.ContextVar('hr_perf_record', default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+# ------------------- COLLECTION -------------------
+def record_query(execute, sql, params, many, context):
+    """
+    Execute wrapper installed on every database connection. It charges the
+    query to the request in ``_current``. The context variable follows the
+    request into sync_to_async threads, so async views are counted too.
+    """
+    record = _current.get()
+    if record is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        record['sql_ms'] += (time.perf_counter() - started) * 1000
+        record['queries'] += 1
+        record['statements'][sql] += 1
+
+def install_query_recorder(sender=None, connection=None, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+def install_template_timer():
+    """Wrap the Django template backend so top-level renders are timed per request."""
+    from django.template.backends.django import Template
+
+    if getattr(Template.render, 'hr_perf', False):
+        return
+    original = Template.render
+
+    def render(self, context=None, request=None):
+        record = _current.get()
+        if record is None or record['template_depth']:
+            return original(self, context, request)
+        record['template_depth'] += 1
+        started = time.perf_counter()
+        try:
+            return original(self, context, request)
+        finally:
+            record['template_ms'] += (time.perf_counter() - started) * 1000
+            record['template_depth'] -= 1
+
+    render.hr_perf = True
+    Template.render = render
+
+def query_budget(view_name):
+    budgets = settings.HR_PERF_QUERY_BUDGETS
+    return budgets.get(view_name, budgets.get('*'))
+
+def write_sink(record):
+    path = settings.HR_PERF_LOG_FILE
+    if not path:
+        return
+    line = json.dumps(record) + '\n'
+    with _sink_lock, open(path, 'a', encoding='utf-8') as sink:
+        sink.write(line)
+
+
+class PerfMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.HR_PERF_ENABLED:
+            raise MiddlewareNotUsed
+        install_template_timer()
+        connection_created.connect(install_query_recorder, dispatch_uid='hr.perf')
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection=connection)
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        record, token = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, record, response)
+
+    async def __acall__(self, request):
+        record, token = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, record, response)
+
+    def start(self, request):
+        record = {
+            'view': UNRESOLVED, 'method': request.method, 'path': request.path, 'status': None,
+            'ms': 0.0, 'queries': 0, 'duplicates': 0, 'sql_ms': 0.0, 'template_ms': 0.0,
+            'template_depth': 0, 'statements': Counter(), 'at': time.time(),
+            'started': time.perf_counter(),
+        }
+        return record, _current.set(record)
+
+    def finish(self, request, record, response):
+        record['ms'] = (time.perf_counter() - record.pop('started')) * 1000
+        record['status'] = response.status_code
+        record['duplicates'] = sum(seen - 1 for seen in record.pop('statements').values())
+        if request.resolver_match is not None:
+            record['view'] = request.resolver_match.view_name
+        del record['template_depth']
+        _buffer.append(record)
+        write_sink(record)
+
+        budget = query_budget(record['view'])
+        if settings.HR_PERF_STRICT and budget is not None and record['queries'] > budget:
+            raise QueryBudgetExceeded(
+                f"{record['view']} ran {record['queries']} queries ({record['duplicates']} repeated), "
+                f"budget is {budget}"
+            )
+        return response
+
+
+# ------------------- REPORT -------------------
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+def records():
+    return list(_buffer)
+
+def clear():
+    _buffer.clear()
+
+def report():
+    """Per-view summary of the buffered requests, slowest p95 first."""
+    by_view = {}
+    for record in records():
+        by_view.setdefault(record['view'], []).append(record)
+
+    rows = []
+    for view, entries in by_view.items():
+        latencies = sorted(entry['ms'] for entry in entries)
+        count = len(entries)
+        rows.append({
+            'view': view,
+            'requests': count,
+            'p50_ms': percentile(latencies, 0.50),
+            'p95_ms': percentile(latencies, 0.95),
+            'p99_ms': percentile(latencies, 0.99),
+            'avg_queries': sum(entry['queries'] for entry in entries) / count,
+            'max_queries': max(entry['queries'] for entry in entries),
+            'avg_duplicates': sum(entry['duplicates'] for entry in entries) / count,
+            'avg_sql_ms': sum(entry['sql_ms'] for entry in entries) / count,
+            'avg_template_ms': sum(entry['template_ms'] for entry in entries) / count,
+            'budget': query_budget(view),
+        })
+    rows.sort(key=lambda row: row['p95_ms'], reverse=True)
+    return rows
@@ -0,0 +1,159 @@
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from .models import Attendance, Salary, MonthlyRollup
+
+
+def attendance_contribution(values):
+    return {
+        'attendance_count': 1,
+        'present_days': values['present_days'],
+        'leaves': values['leaves'],
+    }
+
+def salary_contribution(values):
+    paid = values['status'] == 'Paid'
+    return {
+        'total_payable': values['total_salary'],
+        'total_paid': values['received_salary'],
+        'paid_count': 1 if paid else 0,
+        'unpaid_count': 0 if paid else 1,
+    }
+
+# model -> (fields a row contributes from, function turning them into rollup amounts)
+TRACKED = {
+    Attendance: (('year', 'month', 'present_days', 'leaves'), attendance_contribution),
+    Salary: (('year', 'month', 'total_salary', 'received_salary', 'status'), salary_contribution),
+}
+
+
+def snapshot(model, instance):
+    fields, _ = TRACKED[model]
+    return {field: getattr(instance, field) for field in fields}
+
+def stored_snapshot(model, instance):
+    """The row as it is in the database right now, or None for a new row."""
+    if instance._state.adding or instance.pk is None:
+        return None
+    fields, _ = TRACKED[model]
+    return model.objects.filter(pk=instance.pk).values(*fields).first()
+
+
+def apply_delta(year, month, delta):
+    changes = {field: F(field) + value for field, value in delta.items() if value}
+    if not changes:
+        return
+    MonthlyRollup.objects.get_or_create(year=year, month=month)
+    MonthlyRollup.objects.filter(year=year, month=month).update(updated_at=timezone.now(), **changes)
+
+def record_change(model, old, new):
+    """
+    Move a row's contribution from its ``old`` values to its ``new`` ones
+    (either may be None for inserts and deletes) with F() updates, so
+    concurrent writers never overwrite each other's totals.
+    """
+    _, contribution = TRACKED[model]
+    removed = contribution(old) if old else {}
+    added = contribution(new) if new else {}
+    if old and new and (old['year'], old['month']) == (new['year'], new['month']):
+        apply_delta(new['year'], new['month'], {
+            field: added[field] - removed[field] for field in added
+        })
+        return
+    if old:
+        apply_delta(old['year'], old['month'], {field: -value for field, value in removed.items()})
+    if new:
+        apply_delta(new['year'], new['month'], added)
+
+def remove_employee(employee_pk):
+    """
+    Take all of an employee's attendance and salary rows out of the rollups
+    with one delta per period, before they are deleted along with it.
+    """
+    deltas = {}
+    for model, (fields, contribution) in TRACKED.items():
+        for values in model.objects.filter(employee_id=employee_pk).values(*fields):
+            delta = deltas.setdefault((values['year'], values['month']), {})
+            for field, amount in contribution(values).items():
+                delta[field] = delta.get(field, 0) - amount
+    for (year, month), delta in deltas.items():
+        apply_delta(year, month, delta)
+
+
+def period_filter(periods):
+    condition = Q()
+    for year, month in periods:
+        condition |= Q(year=year, month=month)
+    return condition
+
+def rebuild_rollups(periods=None):
+    """
+    Recompute rollups from the raw Attendance/Salary tables with one
+    GROUP BY per table, for the given ``(year, month)`` periods or for all of
+    history. Needed after bulk writes that bypass model signals.
+    """
+    attendance = Attendance.objects.all()
+    salaries = Salary.objects.all()
+    rollups = MonthlyRollup.objects.all()
+    if periods is not None:
+        condition = period_filter(periods)
+        if not condition:
+            return 0
+        attendance = attendance.filter(condition)
+        salaries = salaries.filter(condition)
+        rollups = rollups.filter(condition)
+
+    with transaction.atomic():
+        totals = {}
+        for row in attendance.values('year', 'month').order_by().annotate(
+            attendance_count=Count('id'),
+            present_days=Sum('present_days'),
+            leaves=Sum('leaves'),
+        ):
+            totals.setdefault((row.pop('year'), row.pop('month')), {}).update(row)
+        for row in salaries.values('year', 'month').order_by().annotate(
+            total_payable=Sum('total_salary'),
+            total_paid=Sum('received_salary'),
+            paid_count=Count('id', filter=Q(status='Paid')),
+            unpaid_count=Count('id', filter=Q(status='Unpaid')),
+        ):
+            totals.setdefault((row.pop('year'), row.pop('month')), {}).update(row)
+
+        rollups.delete()
+        MonthlyRollup.objects.bulk_create([
+            MonthlyRollup(year=year, month=month, **values)
+            for (year, month), values in totals.items()
+        ])
+    return len(totals)
+
+
+def rollup_row_count(model, year=None, month=None, status=None):
+    """
+    Number of Attendance or Salary rows in the matching periods (and, for
+    salaries, with ``status``), summed from the rollups instead of counting
+    the table. Exact as long as the rollups are current.
+    """
+    rollups = MonthlyRollup.objects.all()
+    if year is not None:
+        rollups = rollups.filter(year=year)
+    if month is not None:
+        rollups = rollups.filter(month=month)
+    if model is Attendance:
+        column = F('attendance_count')
+    elif status == 'Paid':
+        column = F('paid_count')
+    elif status == 'Unpaid':
+        column = F('unpaid_count')
+    else:
+        column = F('paid_count') + F('unpaid_count')
+    return rollups.aggregate(rows=Sum(column))['rows'] or 0
+
+
+def get_rollup(year, month):
+    """The stored rollup for a period, or an unsaved all-zero one."""
+    return MonthlyRollup.objects.filter(year=year, month=month).first() or MonthlyRollup(year=year, month=month)
+
+async def aget_rollup(year, month):
+    """Async version of get_rollup()."""
+    return await MonthlyRollup.objects.filter(year=year, month=month).afirst() or MonthlyRollup(year=year, month=month)
@@ -0,0 +1,170 @@
+"""
+Employee search index.
+
+SQLite databases use an FTS5 table (``hr_employee_fts``) and PostgreSQL uses
+``hr_employee_search`` with a GIN-indexed tsvector plus a trigram index for
+substring matches. Both are created by migration 0005 and kept in sync by the
+Employee signals in ``hr.signals``. Other backends fall back to icontains.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import Employee
+from .pagination import KeysetPage, PAGE_SIZE, decode_cursor, encode_cursor
+
+INDEXED_FIELDS = ('employee_id', 'name', 'cnic', 'designation')
+
+
+def search_terms(query):
+    return re.findall(r'\w+', query)
+
+
+# ------------------- SQLITE (FTS5) -------------------
+class SQLiteSearch:
+    def match_expression(self, terms):
+        # every term must match, each as a prefix: "ali"* "kha"*
+        return ' '.join(f'"{term}"*' for term in terms)
+
+    def ranked_ids(self, cursor, terms, after, limit):
+        sql = "SELECT rowid, rank FROM hr_employee_fts WHERE hr_employee_fts MATCH %s"
+        params = [self.match_expression(terms)]
+        if after:
+            sql += " AND (rank > %s OR (rank = %s AND rowid > %s))"
+            params += [after[0], after[0], after[1]]
+        sql += " ORDER BY rank, rowid LIMIT %s"
+        cursor.execute(sql, params + [limit])
+        return cursor.fetchall()
+
+    def index(self, cursor, employee):
+        cursor.execute("DELETE FROM hr_employee_fts WHERE rowid = %s", [employee.pk])
+        cursor.execute(
+            "INSERT INTO hr_employee_fts (rowid, employee_id, name, cnic, designation) VALUES (%s, %s, %s, %s, %s)",
+            [employee.pk] + [getattr(employee, field) or '' for field in INDEXED_FIELDS],
+        )
+
+    def remove(self, cursor, pk):
+        cursor.execute("DELETE FROM hr_employee_fts WHERE rowid = %s", [pk])
+
+    def rebuild(self, cursor):
+        cursor.execute("DELETE FROM hr_employee_fts")
+        cursor.execute(
+            "INSERT INTO hr_employee_fts (rowid, employee_id, name, cnic, designation) "
+            "SELECT id, employee_id, name, COALESCE(cnic, ''), COALESCE(designation, '') FROM hr_employee"
+        )
+
+
+# ------------------- POSTGRESQL (tsvector + trigram) -------------------
+class PostgresSearch:
+    DOCUMENT = (
+        "to_tsvector('simple', concat_ws(' ', {t}.employee_id, {t}.name, {t}.cnic, {t}.designation))"
+    )
+    HAYSTACK = "lower(concat_ws(' ', {t}.employee_id, {t}.name, {t}.cnic, {t}.designation))"
+
+    def ranked_ids(self, cursor, terms, after, limit):
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        substring = '%' + ' '.join(terms).lower() + '%'
+        # lower rank sorts first, matching the FTS5 convention
+        sql = (
+            "SELECT * FROM ("
+            " SELECT employee_id AS pk, -(ts_rank(document, q) + similarity(haystack, %s)) AS rank"
+            " FROM hr_employee_search, to_tsquery('simple', %s) AS q"
+            " WHERE document @@ q OR haystack LIKE %s"
+            ") AS matches"
+        )
+        params = [' '.join(terms).lower(), tsquery, substring]
+        if after:
+            sql += " WHERE (rank, pk) > (%s, %s)"
+            params += list(after)
+        sql += " ORDER BY rank, pk LIMIT %s"
+        cursor.execute(sql, params + [limit])
+        return cursor.fetchall()
+
+    def index(self, cursor, employee):
+        cursor.execute(
+            "INSERT INTO hr_employee_search (employee_id, document, haystack) "
+            f"SELECT e.id, {self.DOCUMENT.format(t='e')}, {self.HAYSTACK.format(t='e')} FROM hr_employee e WHERE e.id = %s "
+            "ON CONFLICT (employee_id) DO UPDATE SET document = EXCLUDED.document, haystack = EXCLUDED.haystack",
+            [employee.pk],
+        )
+
+    def remove(self, cursor, pk):
+        cursor.execute("DELETE FROM hr_employee_search WHERE employee_id = %s", [pk])
+
+    def rebuild(self, cursor):
+        cursor.execute("DELETE FROM hr_employee_search")
+        cursor.execute(
+            "INSERT INTO hr_employee_search (employee_id, document, haystack) "
+            f"SELECT e.id, {self.DOCUMENT.format(t='e')}, {self.HAYSTACK.format(t='e')} FROM hr_employee e"
+        )
+
+
+BACKENDS = {
+    'sqlite': SQLiteSearch(),
+    'postgresql': PostgresSearch(),
+}
+
+def get_backend():
+    return BACKENDS.get(connection.vendor)
+
+
+# ------------------- PUBLIC API -------------------
+def index_employee(employee):
+    backend = get_backend()
+    if backend:
+        with connection.cursor() as cursor:
+            backend.index(cursor, employee)
+
+def remove_employee(pk):
+    backend = get_backend()
+    if backend:
+        with connection.cursor() as cursor:
+            backend.remove(cursor, pk)
+
+def rebuild_index():
+    backend = get_backend()
+    if backend is None:
+        return False
+    with connection.cursor() as cursor:
+        backend.rebuild(cursor)
+    return True
+
+def fallback_filter(terms):
+    condition = Q()
+    for term in terms:
+        condition &= (
+            Q(employee_id__icontains=term) | Q(name__icontains=term) |
+            Q(cnic__icontains=term) | Q(designation__icontains=term)
+        )
+    return condition
+
+def search_employees(query, cursor=None, page_size=PAGE_SIZE):
+    """
+    Best matches for ``query`` first, one keyset page at a time. The cursor
+    is the (rank, pk) of the last row shown, so later pages cost the same as
+    the first.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return KeysetPage([], None)
+    after = decode_cursor(cursor, (float, int)) if cursor else None
+    backend = get_backend()
+
+    if backend is None:
+        employees = Employee.objects.filter(fallback_filter(terms)).order_by('pk')
+        if after:
+            employees = employees.filter(pk__gt=after[1])
+        matches = [(pk, 0) for pk in employees.values_list('pk', flat=True)[:page_size + 1]]
+    else:
+        with connection.cursor() as db_cursor:
+            matches = backend.ranked_ids(db_cursor, terms, after, page_size + 1)
+
+    next_cursor = None
+    if len(matches) > page_size:
+        matches = matches[:page_size]
+        last_pk, last_rank = matches[-1]
+        next_cursor = encode_cursor([last_rank, last_pk])
+
+    employees = Employee.objects.in_bulk([pk for pk, _ in matches])
+    return KeysetPage([employees[pk] for pk, _ in matches if pk in employees], next_cursor)
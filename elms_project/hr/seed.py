@@ -0,0 +1,136 @@
+import calendar
+import random
+import zlib
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from .caching import invalidate_kind, invalidate_periods
+from .importers import batched
+from .models import Attendance, Employee, Salary, SalaryPayment
+from .payments import new_batch
+from .rollups import rebuild_rollups
+from .search import rebuild_index
+
+SEED_BATCH_SIZE = 2000
+CENT = Decimal('0.01')
+
+FIRST_NAMES = [
+    'Ahmed', 'Ali', 'Ayesha', 'Bilal', 'Fatima', 'Hamza', 'Hassan', 'Hira', 'Imran', 'Kashif',
+    'Maryam', 'Nadia', 'Omar', 'Rabia', 'Saad', 'Sana', 'Sara', 'Tariq', 'Usman', 'Zainab',
+]
+LAST_NAMES = [
+    'Abbasi', 'Akhtar', 'Baig', 'Butt', 'Chaudhry', 'Farooq', 'Hussain', 'Iqbal', 'Javed', 'Khan',
+    'Malik', 'Mirza', 'Qureshi', 'Raza', 'Shah', 'Siddiqui', 'Sheikh', 'Tariq', 'Yousaf', 'Zaidi',
+]
+CITIES = ['Karachi', 'Lahore', 'Islamabad', 'Rawalpindi', 'Faisalabad', 'Multan', 'Peshawar']
+# designation -> (weight, base salary range)
+DESIGNATIONS = {
+    'Customer Service Agent': (50, (40000, 60000)),
+    'Team Lead': (10, (70000, 95000)),
+    'Quality Analyst': (8, (55000, 75000)),
+    'Data Entry Operator': (15, (35000, 45000)),
+    'IT Support': (6, (60000, 90000)),
+    'HR Executive': (4, (65000, 85000)),
+    'Accountant': (4, (70000, 100000)),
+    'Operations Manager': (3, (150000, 250000)),
+}
+
+
+def recent_periods(months, today=None):
+    """The last ``months`` (year, month) pairs, oldest first, ending with the current month."""
+    today = today or timezone.now().date()
+    year, month = today.year, today.month
+    periods = []
+    for _ in range(months):
+        periods.append((year, month))
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return periods[::-1]
+
+def working_days(year, month):
+    return sum(1 for week in calendar.monthcalendar(year, month) for day in week[:5] if day)
+
+
+def build_employee(rng, index, prefix):
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    designation = rng.choices(list(DESIGNATIONS), weights=[weight for weight, _ in DESIGNATIONS.values()])[0]
+    low, high = DESIGNATIONS[designation][1]
+    return Employee(
+        employee_id=f'{prefix}{index:06d}',
+        name=f'{first} {last}',
+        father_name=f'{rng.choice(FIRST_NAMES)} {last}',
+        # unique per prefix and index, so separate seed runs never collide
+        cnic=f'{zlib.crc32(prefix.encode()) % 100_000:05d}-{index % 10_000_000:07d}-{index // 10_000_000 % 10}',
+        designation=designation,
+        contact_number=f'03{rng.randint(0, 49):02d}-{rng.randint(0, 9_999_999):07d}',
+        address=f'House {rng.randint(1, 500)}, Block {rng.choice("ABCDEFGH")}, {rng.choice(CITIES)}',
+        date_joined=date(2015, 1, 1) + timedelta(days=rng.randint(0, 3650)),
+        base_salary=Decimal(rng.randrange(low, high, 500)),
+        is_active=rng.random() > 0.05,
+    )
+
+def build_month(rng, employee_pk, base_salary, year, month, latest):
+    total_days = working_days(year, month)
+    leaves = min(total_days, rng.choices(range(6), weights=[40, 25, 15, 10, 6, 4])[0])
+    present_days = total_days - leaves
+    attendance = Attendance(
+        employee_id=employee_pk, year=year, month=month,
+        total_days=total_days, leaves=leaves, present_days=present_days,
+    )
+    total_salary = (base_salary * present_days / total_days).quantize(CENT)
+    # older months are settled; the latest one is still being paid out
+    paid = not latest or rng.random() < 0.7
+    salary = Salary(
+        employee_id=employee_pk, year=year, month=month,
+        total_salary=total_salary,
+        received_salary=total_salary if paid else Decimal('0'),
+        payment_date=date(year, month, calendar.monthrange(year, month)[1]) + timedelta(days=rng.randint(1, 5))
+        if paid else None,
+    )
+    salary.update_status()
+    return attendance, salary
+
+def seed_hr(employees, months, prefix='EMP', seed=0, batch_size=SEED_BATCH_SIZE):
+    """
+    Bulk-create ``employees`` synthetic employees with ``months`` of attendance
+    and salary each, ending with the current month. The same ``seed`` always
+    produces the same data. IDs continue after existing ``prefix`` employees,
+    so repeated runs add to the dataset. Rollups, the search index and the
+    response cache are refreshed once at the end rather than per row.
+    """
+    rng = random.Random(seed)
+    batch_id = new_batch()  # the received amounts go into the payment ledger as one batch
+    periods = recent_periods(months)
+    start = Employee.objects.filter(employee_id__startswith=prefix).count()
+
+    with transaction.atomic():
+        for indexes in batched(range(start, start + employees), batch_size):
+            batch = [build_employee(rng, index, prefix) for index in indexes]
+            Employee.objects.bulk_create(batch, batch_size=batch_size)
+            created = Employee.objects.filter(employee_id__in=[e.employee_id for e in batch]).order_by('pk').values_list('pk', 'base_salary')
+
+            attendances, salaries = [], []
+            for employee_pk, base_salary in created:
+                for year, month in periods:
+                    attendance, salary = build_month(rng, employee_pk, base_salary, year, month, (year, month) == periods[-1])
+                    attendances.append(attendance)
+                    salaries.append(salary)
+            Attendance.objects.bulk_create(attendances, batch_size=batch_size)
+            Salary.objects.bulk_create(salaries, batch_size=batch_size)
+            SalaryPayment.objects.bulk_create([
+                SalaryPayment(salary_id=salary.pk, amount=salary.received_salary, paid_on=salary.payment_date, batch=batch_id)
+                for salary in salaries if salary.received_salary
+            ], batch_size=batch_size)
+
+        rebuild_rollups(periods)
+        rebuild_index()
+
+        def invalidate():
+            invalidate_kind('employee')
+            invalidate_periods('attendance', periods)
+            invalidate_periods('salary', periods)
+        transaction.on_commit(invalidate)
+
+    return {'employees': employees, 'months': months, 'records': employees * months * 2}
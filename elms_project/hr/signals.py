@@ -0,0 +1,120 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .models import Attendance, Employee, Salary, Tombstone
+from . import auth, caching, lookups, rollups, search
+
+
+def cascaded_from_employee(origin):
+    """True when a row is being deleted because its employee is."""
+    return isinstance(origin, Employee) or (isinstance(origin, QuerySet) and origin.model is Employee)
+
+
+# ------------------- MONTHLY ROLLUPS -------------------
+@receiver(pre_save, sender=Attendance)
+@receiver(pre_save, sender=Salary)
+def remember_rollup_contribution(sender, instance, raw=False, **kwargs):
+    if not raw:
+        instance._rollup_previous = rollups.stored_snapshot(sender, instance)
+
+@receiver(post_save, sender=Attendance)
+@receiver(post_save, sender=Salary)
+def update_rollup_on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        rollups.record_change(sender, getattr(instance, '_rollup_previous', None), rollups.snapshot(sender, instance))
+
+@receiver(post_delete, sender=Attendance)
+@receiver(post_delete, sender=Salary)
+def update_rollup_on_delete(sender, instance, origin=None, **kwargs):
+    if not cascaded_from_employee(origin):  # see remove_employee_from_rollups
+        rollups.record_change(sender, rollups.snapshot(sender, instance), None)
+
+@receiver(pre_delete, sender=Employee)
+def remove_employee_from_rollups(sender, instance, **kwargs):
+    rollups.remove_employee(instance.pk)
+
+
+# ------------------- CHANGE FEED TOMBSTONES -------------------
+@receiver(post_delete, sender=Attendance)
+@receiver(post_delete, sender=Salary)
+def record_tombstone(sender, instance, origin=None, **kwargs):
+    if cascaded_from_employee(origin):
+        return  # written by record_employee_tombstones
+    Tombstone.objects.create(
+        kind=sender._meta.model_name, object_id=instance.pk, employee_code=instance.employee.employee_id,
+        year=instance.year, month=instance.month,
+    )
+
+@receiver(pre_delete, sender=Employee)
+def record_employee_tombstones(sender, instance, **kwargs):
+    Tombstone.objects.bulk_create([
+        Tombstone(
+            kind=model._meta.model_name, object_id=pk, employee_code=instance.employee_id, year=year, month=month,
+        )
+        for model in (Attendance, Salary)
+        for pk, year, month in model.objects.filter(employee=instance).values_list('pk', 'year', 'month')
+    ])
+
+
+# ------------------- EMPLOYEE SEARCH INDEX -------------------
+@receiver(post_save, sender=Employee)
+def index_employee_on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_employee(instance)
+
+@receiver(post_delete, sender=Employee)
+def remove_employee_from_index(sender, instance, **kwargs):
+    search.remove_employee(instance.pk)
+
+
+# ------------------- RESPONSE CACHE -------------------
+def cache_kind(sender):
+    return 'attendance' if sender is Attendance else 'salary'
+
+@receiver(post_save, sender=Attendance)
+@receiver(post_save, sender=Salary)
+def invalidate_cache_on_save(sender, instance, raw=False, **kwargs):
+    periods = [(instance.year, instance.month)]
+    previous = getattr(instance, '_rollup_previous', None)
+    if previous:
+        periods.append((previous['year'], previous['month']))
+    transaction.on_commit(lambda: caching.invalidate_periods(cache_kind(sender), periods))
+
+@receiver(post_delete, sender=Attendance)
+@receiver(post_delete, sender=Salary)
+def invalidate_cache_on_delete(sender, instance, **kwargs):
+    period = [(instance.year, instance.month)]
+    transaction.on_commit(lambda: caching.invalidate_periods(cache_kind(sender), period))
+
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+def invalidate_cache_on_employee_change(sender, instance, **kwargs):
+    transaction.on_commit(lambda: caching.invalidate_kind('employee'))
+
+
+# ------------------- EMPLOYEE LOOKUPS -------------------
+@receiver(pre_save, sender=Employee)
+def remember_employee_id(sender, instance, raw=False, **kwargs):
+    if not raw and instance.pk is not None:
+        instance._lookup_previous_id = (
+            Employee.objects.filter(pk=instance.pk).values_list('employee_id', flat=True).first()
+        )
+
+@receiver(post_save, sender=Employee)
+def forget_lookup_on_save(sender, instance, **kwargs):
+    employee_ids = [instance.employee_id, getattr(instance, '_lookup_previous_id', None)]
+    transaction.on_commit(lambda: lookups.forget_employees(employee_ids))
+
+@receiver(post_delete, sender=Employee)
+def forget_lookup_on_delete(sender, instance, **kwargs):
+    transaction.on_commit(lambda: lookups.forget_employees([instance.employee_id]))
+
+
+# ------------------- CACHED USERS -------------------
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def forget_cached_user(sender, instance, **kwargs):
+    transaction.on_commit(lambda: auth.forget_user(instance.pk))
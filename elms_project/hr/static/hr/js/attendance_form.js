@@ -0,0 +1,117 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.getElementById('attendanceForm');
+    const employeeSelect = document.getElementById('employee');
+    const dateInput = document.getElementById('date');
+    const statusSelect = document.getElementById('status');
+    const hoursInput = document.getElementById('hoursWorked');
+    const hoursGroup = document.getElementById('hoursGroup');
+    const summaryDiv = document.getElementById('attendanceSummary');
+    const summaryContent = document.getElementById('summaryContent');
+    const successCheckmark = document.getElementById('successCheckmark');
+
+    // Set today's date as default
+    const today = new Date().toISOString().split('T')[0];
+    dateInput.value = today;
+
+    // Toggle hours worked field based on status
+    statusSelect.addEventListener('change', function() {
+        if (this.value === 'absent' || this.value === 'leave') {
+            hoursGroup.style.opacity = '0.5';
+            hoursInput.disabled = true;
+            hoursInput.value = '0';
+        } else {
+            hoursGroup.style.opacity = '1';
+            hoursInput.disabled = false;
+            hoursInput.value = this.value === 'halfday' ? '4' : '8';
+        }
+        updateSummary();
+    });
+
+    // Update summary when any field changes
+    [employeeSelect, dateInput, statusSelect, hoursInput].forEach(element => {
+        element.addEventListener('change', updateSummary);
+    });
+
+    // Form validation
+    form.addEventListener('submit', function(e) {
+        let isValid = true;
+
+        if (!employeeSelect.value) {
+            document.getElementById('employeeError').style.display = 'block';
+            employeeSelect.classList.add('error');
+            isValid = false;
+        } else {
+            document.getElementById('employeeError').style.display = 'none';
+            employeeSelect.classList.remove('error');
+        }
+
+        if (!dateInput.value) {
+            document.getElementById('dateError').style.display = 'block';
+            dateInput.classList.add('error');
+            isValid = false;
+        } else {
+            document.getElementById('dateError').style.display = 'none';
+            dateInput.classList.remove('error');
+        }
+
+        if (hoursInput.value < 0 || hoursInput.value > 24) {
+            document.getElementById('hoursError').style.display = 'block';
+            hoursInput.classList.add('error');
+            isValid = false;
+        } else {
+            document.getElementById('hoursError').style.display = 'none';
+            hoursInput.classList.remove('error');
+        }
+
+        if (!isValid) {
+            e.preventDefault();
+            form.classList.add('animated');
+            setTimeout(() => form.classList.remove('animated'), 500);
+        } else {
+            // Show loading state
+            document.getElementById('submitBtn').style.display = 'none';
+            document.getElementById('spinner').style.display = 'block';
+
+            // Simulate form submission success (remove this in production)
+            setTimeout(() => {
+                successCheckmark.style.display = 'block';
+                form.style.opacity = '0.5';
+                document.getElementById('spinner').style.display = 'none';
+
+                // Reset form after success
+                setTimeout(() => {
+                    form.reset();
+                    successCheckmark.style.display = 'none';
+                    form.style.opacity = '1';
+                    document.getElementById('submitBtn').style.display = 'flex';
+                    summaryDiv.style.display = 'none';
+                    dateInput.value = today;
+                }, 2000);
+            }, 1500);
+
+            // Prevent actual form submission for this demo
+            e.preventDefault();
+        }
+    });
+
+    // Update the attendance summary
+    function updateSummary() {
+        if (employeeSelect.value && dateInput.value) {
+            const employeeText = employeeSelect.options[employeeSelect.selectedIndex].text;
+            const statusText = statusSelect.options[statusSelect.selectedIndex].text;
+
+            summaryContent.innerHTML = `
+                <p><strong>Employee:</strong> ${employeeText}</p>
+                <p><strong>Date:</strong> ${new Date(dateInput.value).toLocaleDateString()}</p>
+                <p><strong>Status:</strong> ${statusText}</p>
+                <p><strong>Hours:</strong> ${hoursInput.value}</p>
+            `;
+            summaryDiv.style.display = 'block';
+        } else {
+            summaryDiv.style.display = 'none';
+        }
+    }
+
+    // Initial summary update
+    updateSummary();
+});
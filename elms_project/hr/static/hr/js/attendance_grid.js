@@ -0,0 +1,11 @@
+// Post only the cells that differ from what was rendered.
+document.body.addEventListener('htmx:configRequest', function (event) {
+    if (event.detail.elt.id !== 'attendance-grid-form') return;
+    event.detail.elt.querySelectorAll('.grid-cell').forEach(function (cell) {
+        if (cell.value === cell.dataset.original) delete event.detail.parameters[cell.name];
+    });
+});
+document.getElementById('attendance-grid').addEventListener('input', function (event) {
+    var cell = event.target;
+    if (cell.classList.contains('grid-cell')) cell.classList.toggle('is-dirty', cell.value !== cell.dataset.original);
+});
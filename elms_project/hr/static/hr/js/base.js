@@ -0,0 +1,125 @@
+// Initialize particles.js; a page script may set window.HR_PARTICLES
+// before DOMContentLoaded to use its own settings.
+document.addEventListener('DOMContentLoaded', function() {
+  particlesJS('particles-js', window.HR_PARTICLES || {
+    particles: {
+      number: {
+        value: 60,
+        density: {
+          enable: true,
+          value_area: 800
+        }
+      },
+      color: {
+        value: "#3498db"
+      },
+      shape: {
+        type: "circle",
+        stroke: {
+          width: 0,
+          color: "#000000"
+        }
+      },
+      opacity: {
+        value: 0.3,
+        random: true,
+        anim: {
+          enable: true,
+          speed: 1,
+          opacity_min: 0.1,
+          sync: false
+        }
+      },
+      size: {
+        value: 3,
+        random: true,
+        anim: {
+          enable: true,
+          speed: 2,
+          size_min: 0.1,
+          sync: false
+        }
+      },
+      line_linked: {
+        enable: true,
+        distance: 150,
+        color: "#3498db",
+        opacity: 0.2,
+        width: 1
+      },
+      move: {
+        enable: true,
+        speed: 1,
+        direction: "none",
+        random: true,
+        straight: false,
+        out_mode: "out",
+        bounce: false,
+        attract: {
+          enable: false,
+          rotateX: 600,
+          rotateY: 1200
+        }
+      }
+    },
+    interactivity: {
+      detect_on: "canvas",
+      events: {
+        onhover: {
+          enable: true,
+          mode: "grab"
+        },
+        onclick: {
+          enable: true,
+          mode: "push"
+        },
+        resize: true
+      },
+      modes: {
+        grab: {
+          distance: 140,
+          line_linked: {
+            opacity: 0.3
+          }
+        },
+        push: {
+          particles_nb: 4
+        }
+      }
+    },
+    retina_detect: true
+  });
+
+  // Send the CSRF token with every HTMX request. List pages are shared
+  // through the response cache, so it comes from the cookie, not the page.
+  document.body.addEventListener('htmx:configRequest', (evt) => {
+    const token = document.cookie.match(/(?:^|;\s*)csrftoken=([^;]+)/);
+    if (token) evt.detail.headers['X-CSRFToken'] = token[1];
+  });
+
+  // Auto-open modal when HTMX loads content into modal-body
+  document.body.addEventListener('htmx:afterSwap', (evt) => {
+    if (evt.detail.target.id === 'modal-body') {
+      var modal = new bootstrap.Modal(document.getElementById('modal'));
+      modal.show();
+    }
+  });
+
+  // Toggle sidebar on mobile
+  document.querySelector('.toggle-sidebar').addEventListener('click', function() {
+    document.querySelector('.sidebar').classList.toggle('show');
+  });
+
+  // Close sidebar when clicking outside on mobile
+  document.addEventListener('click', function(event) {
+    const sidebar = document.querySelector('.sidebar');
+    const toggleBtn = document.querySelector('.toggle-sidebar');
+
+    if (window.innerWidth < 992 && 
+        !sidebar.contains(event.target) && 
+        !toggleBtn.contains(event.target) &&
+        sidebar.classList.contains('show')) {
+      sidebar.classList.remove('show');
+    }
+  });
+});
@@ -0,0 +1,212 @@
+// Sand-coloured particles, used by base.js in place of its default
+window.HR_PARTICLES = {
+    particles: {
+        number: {
+            value: 150,
+            density: {
+                enable: true,
+                value_area: 800
+            }
+        },
+        color: {
+            value: ["#C2B280", "#D6C6A5", "#E5D8B4", "#F4EBBE", 
+                    "#D9CC9A", "#B8A87D", "#A89870", "#E2D3A3"]
+        },
+        shape: {
+            type: "circle",
+            stroke: {
+                width: 0,
+                color: "#000000"
+            }
+        },
+        opacity: {
+            value: 0.8,
+            random: true,
+            anim: {
+                enable: true,
+                speed: 1,
+                opacity_min: 0.4,
+                sync: false
+            }
+        },
+        size: {
+            value: 3,
+            random: true,
+            anim: {
+                enable: true,
+                speed: 3,
+                size_min: 1,
+                sync: false
+            }
+        },
+        line_linked: {
+            enable: true,
+            distance: 100,
+            color: "#8D6E63",
+            opacity: 0.2,
+            width: 1
+        },
+        move: {
+            enable: true,
+            speed: 2,
+            direction: "bottom",
+            random: true,
+            straight: false,
+            out_mode: "out",
+            bounce: false,
+            attract: {
+                enable: false,
+                rotateX: 600,
+                rotateY: 1200
+            }
+        }
+    },
+    interactivity: {
+        detect_on: "canvas",
+        events: {
+            onhover: {
+                enable: true,
+                mode: "bubble"
+            },
+            onclick: {
+                enable: true,
+                mode: "repulse"
+            },
+            resize: true
+        },
+        modes: {
+            grab: {
+                distance: 160,
+                line_linked: {
+                    opacity: 0.8
+                }
+            },
+            bubble: {
+                distance: 200,
+                size: 6,
+                duration: 2,
+                opacity: 0.8,
+                speed: 3
+            },
+            repulse: {
+                distance: 100,
+                duration: 0.4
+            }
+        }
+    },
+    retina_detect: true
+};
+
+document.addEventListener('DOMContentLoaded', function() {
+    // Initialize charts
+    const departmentCtx = document.getElementById('departmentChart').getContext('2d');
+    const departmentChart = new Chart(departmentCtx, {
+        type: 'doughnut',
+        data: {
+            labels: ['Sales', 'IT', 'HR', 'Operations', 'Marketing'],
+            datasets: [{
+                data: [30, 25, 15, 20, 10],
+                backgroundColor: [
+                    '#8D6E63',
+                    '#689F38',
+                    '#17A2B8',
+                    '#FFA000',
+                    '#D32F2F'
+                ],
+                hoverOffset: 4,
+                borderWidth: 0
+            }]
+        },
+        options: {
+            maintainAspectRatio: false,
+            plugins: {
+                legend: {
+                    position: 'bottom',
+                    labels: {
+                        font: {
+                            size: 12
+                        }
+                    }
+                }
+            },
+            cutout: '60%'
+        }
+    });
+
+    const attendanceCanvas = document.getElementById('attendanceChart');
+    const attendanceChart = new Chart(attendanceCanvas.getContext('2d'), {
+        type: 'line',
+        data: {
+            labels: [],
+            datasets: [{
+                label: 'Attendance Rate (%)',
+                data: [],
+                fill: true,
+                backgroundColor: 'rgba(141, 110, 99, 0.2)',
+                borderColor: '#8D6E63',
+                tension: 0.3,
+                pointBackgroundColor: '#8D6E63',
+                pointRadius: 4,
+                pointHoverRadius: 6
+            }]
+        },
+        options: {
+            maintainAspectRatio: false,
+            scales: {
+                y: {
+                    beginAtZero: false,
+                    suggestedMin: 80,
+                    suggestedMax: 100,
+                    grid: {
+                        color: 'rgba(93, 64, 55, 0.1)'
+                    }
+                },
+                x: {
+                    grid: {
+                        color: 'rgba(93, 64, 55, 0.1)'
+                    }
+                }
+            }
+        }
+    });
+
+    // This year's attendance rate from the chart API. Polls revalidate with
+    // the ETag, so they cost an empty 304 until attendance changes.
+    function refreshAttendance() {
+        fetch(attendanceCanvas.dataset.seriesUrl, {cache: 'no-cache', credentials: 'same-origin'})
+            .then(response => response.ok ? response.json() : null)
+            .then(series => {
+                if (!series) return;
+                const leaves = series.attendance.leaves;
+                attendanceChart.data.labels = series.labels;
+                attendanceChart.data.datasets[0].data = series.attendance.present_days.map((present, i) => {
+                    const days = present + leaves[i];
+                    return days ? Math.round(present * 1000 / days) / 10 : null;
+                });
+                attendanceChart.update();
+            });
+    }
+    refreshAttendance();
+    setInterval(refreshAttendance, 60000);
+
+    // Button functionality
+    const viewButtons = document.querySelectorAll('.view-employees-btn, .view-attendance-btn, .view-salary-btn, .view-requests-btn');
+
+    viewButtons.forEach(button => {
+        button.addEventListener('click', function() {
+            const action = this.classList[2].split('-')[0];
+            alert(`Viewing ${action} details...`);
+        });
+    });
+
+    // Quick action buttons functionality
+    const quickActionButtons = document.querySelectorAll('.add-employee-btn, .mark-attendance-btn, .process-salary-btn, .generate-letter-btn');
+
+    quickActionButtons.forEach(button => {
+        button.addEventListener('click', function(e) {
+            e.preventDefault();
+            const action = this.classList[2].split('-')[0];
+            alert(`${action.charAt(0).toUpperCase() + action.slice(1)} functionality would open here.`);
+        });
+    });
+});
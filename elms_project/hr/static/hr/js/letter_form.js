@@ -0,0 +1,50 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const letterTypeSelect = document.getElementById('letterType');
+    const modalHeader = document.querySelector('.modal-header');
+    const indicator = document.querySelector('.letter-type-indicator');
+    const submitBtn = document.querySelector('.btn-primary');
+
+    // Color mapping for different letter types
+    const colorMap = {
+        'offer_letter': ['#ff6b6b', '#ff8e8e'],
+        'experience_letter': ['#4ecdc4', '#6de0d7'],
+        'resignation_letter': ['#45b7d1', '#64c9e1'],
+        'warning_letter': ['#f9c74f', '#fad570'],
+        'termination_letter': ['#f9844a', '#fa9c6c']
+    };
+
+    // Update colors based on selected letter type
+    function updateColors(type) {
+        const colors = colorMap[type] || ['#4361ee', '#3a0ca3'];
+
+        // Update CSS variables
+        document.documentElement.style.setProperty('--primary-color', colors[0]);
+        document.documentElement.style.setProperty('--secondary-color', colors[1]);
+
+        // Update header and indicator
+        modalHeader.style.background = `linear-gradient(120deg, ${colors[0]}, ${colors[1]})`;
+        indicator.style.background = `linear-gradient(120deg, ${colors[0]}, ${colors[1]})`;
+
+        // Update input group text
+        document.querySelectorAll('.input-group-text').forEach(el => {
+            el.style.background = `linear-gradient(120deg, ${colors[0]}, ${colors[1]})`;
+        });
+
+        // Update button
+        submitBtn.style.background = `linear-gradient(120deg, ${colors[0]}, ${colors[1]})`;
+    }
+
+    // Initial color setup
+    updateColors(letterTypeSelect.value);
+
+    // Update colors when selection changes
+    letterTypeSelect.addEventListener('change', function() {
+        updateColors(this.value);
+    });
+
+    // Add animation to form elements
+    const formGroups = document.querySelectorAll('.mb-3, .mb-4');
+    formGroups.forEach((group, index) => {
+        group.style.transitionDelay = `${index * 0.05}s`;
+    });
+});
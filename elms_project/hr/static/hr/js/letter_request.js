@@ -0,0 +1,24 @@
+// Add dynamic color change based on selected letter type
+document.getElementById('letter_type').addEventListener('change', function() {
+    const colors = {
+        'offer_letter': ['#ff6b6b', '#ff8e8e'],
+        'experience_letter': ['#4ecdc4', '#6de0d7'],
+        'resignation_letter': ['#45b7d1', '#64c9e1'],
+        'termination_letter': ['#f9c74f', '#fad570'],
+        'warning_letter': ['#f9844a', '#fa9c6c'],
+        '': ['#6a11cb', '#2575fc'] // default
+    };
+
+    const selectedValue = this.value;
+    const [primary, secondary] = colors[selectedValue] || colors[''];
+
+    document.documentElement.style.setProperty('--primary', primary);
+    document.documentElement.style.setProperty('--secondary', secondary);
+
+    // Update button gradient
+    document.querySelector('button').style.background = `linear-gradient(to right, ${primary}, ${secondary})`;
+
+    // Update form top border
+    document.querySelector('.form-container::before').style.background = 
+        `linear-gradient(to right, ${primary}, ${secondary})`;
+});
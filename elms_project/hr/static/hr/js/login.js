@@ -0,0 +1,220 @@
+// Initialize particles.js with blue and gold colors
+document.addEventListener('DOMContentLoaded', function() {
+    particlesJS('particles-js', {
+        particles: {
+            number: {
+                value: 150,
+                density: {
+                    enable: true,
+                    value_area: 800
+                }
+            },
+            color: {
+                value: ["#1a2a6c", "#2a4b8c", "#3a6bcc", "#ffcc00", 
+                        "#ffdd44", "#ffffff", "#aabbff", "#ccddff"]
+            },
+            shape: {
+                type: "circle",
+                stroke: {
+                    width: 0,
+                    color: "#000000"
+                }
+            },
+            opacity: {
+                value: 0.8,
+                random: true,
+                anim: {
+                    enable: true,
+                    speed: 1,
+                    opacity_min: 0.4,
+                    sync: false
+                }
+            },
+            size: {
+                value: 3,
+                random: true,
+                anim: {
+                    enable: true,
+                    speed: 3,
+                    size_min: 1,
+                    sync: false
+                }
+            },
+            line_linked: {
+                enable: true,
+                distance: 100,
+                color: "#ffcc00",
+                opacity: 0.2,
+                width: 1
+            },
+            move: {
+                enable: true,
+                speed: 2,
+                direction: "bottom",
+                random: true,
+                straight: false,
+                out_mode: "out",
+                bounce: false,
+                attract: {
+                    enable: false,
+                    rotateX: 600,
+                    rotateY: 1200
+                }
+            }
+        },
+        interactivity: {
+            detect_on: "canvas",
+            events: {
+                onhover: {
+                    enable: true,
+                    mode: "bubble"
+                },
+                onclick: {
+                    enable: true,
+                    mode: "repulse"
+                },
+                resize: true
+            },
+            modes: {
+                grab: {
+                    distance: 160,
+                    line_linked: {
+                        opacity: 0.8
+                    }
+                },
+                bubble: {
+                    distance: 200,
+                    size: 6,
+                    duration: 2,
+                    opacity: 0.8,
+                    speed: 3
+                },
+                repulse: {
+                    distance: 100,
+                    duration: 0.4
+                }
+            }
+        },
+        retina_detect: true
+    });
+});
+
+// Modal functionality
+const forgotPasswordLink = document.getElementById('forgot-password-link');
+const createAccountLink = document.getElementById('create-account-link');
+const forgotPasswordModal = document.getElementById('forgot-password-modal');
+const createAccountModal = document.getElementById('create-account-modal');
+const closeModalButtons = document.querySelectorAll('.close-modal');
+
+forgotPasswordLink.addEventListener('click', function(e) {
+    e.preventDefault();
+    forgotPasswordModal.classList.add('active');
+    document.getElementById('forgot-message').innerHTML = '';
+    document.getElementById('reset-email').value = '';
+});
+
+createAccountLink.addEventListener('click', function(e) {
+    e.preventDefault();
+    createAccountModal.classList.add('active');
+    document.getElementById('create-message').innerHTML = '';
+    document.getElementById('fullname').value = '';
+    document.getElementById('email').value = '';
+    document.getElementById('new-password').value = '';
+    document.getElementById('confirm-password').value = '';
+});
+
+closeModalButtons.forEach(button => {
+    button.addEventListener('click', function() {
+        forgotPasswordModal.classList.remove('active');
+        createAccountModal.classList.remove('active');
+    });
+});
+
+// Close modal when clicking outside
+window.addEventListener('click', function(e) {
+    if (e.target === forgotPasswordModal) {
+        forgotPasswordModal.classList.remove('active');
+    }
+    if (e.target === createAccountModal) {
+        createAccountModal.classList.remove('active');
+    }
+});
+
+// Reset password functionality
+const resetPasswordBtn = document.getElementById('reset-password-btn');
+resetPasswordBtn.addEventListener('click', function() {
+    const email = document.getElementById('reset-email').value;
+    const messageDiv = document.getElementById('forgot-message');
+
+    if (email) {
+        // Simulate sending reset link
+        messageDiv.innerHTML = '<div class="success-message"><i class="fas fa-check-circle"></i> Password reset link has been sent to ' + email + '</div>';
+
+        // Clear after 3 seconds and close modal
+        setTimeout(() => {
+            forgotPasswordModal.classList.remove('active');
+            messageDiv.innerHTML = '';
+        }, 3000);
+    } else {
+        messageDiv.innerHTML = '<div class="error-message"><i class="fas fa-exclamation-circle"></i> Please enter your email address</div>';
+    }
+});
+
+// Create account functionality
+const createAccountBtn = document.getElementById('create-account-btn');
+createAccountBtn.addEventListener('click', function() {
+    const fullname = document.getElementById('fullname').value;
+    const email = document.getElementById('email').value;
+    const password = document.getElementById('new-password').value;
+    const confirmPassword = document.getElementById('confirm-password').value;
+    const messageDiv = document.getElementById('create-message');
+
+    if (!fullname || !email || !password || !confirmPassword) {
+        messageDiv.innerHTML = '<div class="error-message"><i class="fas fa-exclamation-circle"></i> Please fill all fields</div>';
+        return;
+    }
+
+    if (password !== confirmPassword) {
+        messageDiv.innerHTML = '<div class="error-message"><i class="fas fa-exclamation-circle"></i> Passwords do not match</div>';
+        return;
+    }
+
+    if (password.length < 6) {
+        messageDiv.innerHTML = '<div class="error-message"><i class="fas fa-exclamation-circle"></i> Password must be at least 6 characters</div>';
+        return;
+    }
+
+    // Simulate account creation
+    messageDiv.innerHTML = '<div class="success-message"><i class="fas fa-check-circle"></i> Account created successfully! You can now login.</div>';
+
+    // Clear after 3 seconds and close modal
+    setTimeout(() => {
+        createAccountModal.classList.remove('active');
+        messageDiv.innerHTML = '';
+    }, 3000);
+});
+
+// Add animation to input fields on focus
+const inputs = document.querySelectorAll('input');
+inputs.forEach(input => {
+    input.addEventListener('focus', () => {
+        input.parentElement.style.transform = 'scale(1.03)';
+    });
+
+    input.addEventListener('blur', () => {
+        input.parentElement.style.transform = 'scale(1)';
+    });
+});
+
+// Simple form validation animation
+const loginForm = document.getElementById('login-form');
+loginForm.addEventListener('submit', (e) => {
+    const btn = loginForm.querySelector('.btn');
+    btn.textContent = 'Logging in...';
+    btn.style.background = 'linear-gradient(135deg, #51cf66 0%, #94d82d 100%)';
+
+    setTimeout(() => {
+        btn.textContent = 'Login';
+        btn.style.background = 'linear-gradient(135deg, #ffcc00 0%, #ffdd44 100%)';
+    }, 2000);
+});
@@ -0,0 +1,151 @@
+// Particle settings, used by base.js in place of its default
+window.HR_PARTICLES = {
+    particles: {
+        number: {
+            value: 60,
+            density: {
+                enable: true,
+                value_area: 800
+            }
+        },
+        color: {
+            value: "#3498db"
+        },
+        shape: {
+            type: "circle",
+            stroke: {
+                width: 0,
+                color: "#000000"
+            }
+        },
+        opacity: {
+            value: 0.3,
+            random: true,
+            anim: {
+                enable: true,
+                speed: 1,
+                opacity_min: 0.1,
+                sync: false
+            }
+        },
+        size: {
+            value: 3,
+            random: true,
+            anim: {
+                enable: true,
+                speed: 2,
+                size_min: 0.1,
+                sync: false
+            }
+        },
+        line_linked: {
+            enable: true,
+            distance: 150,
+            color: "#3498db",
+            opacity: 0.2,
+            width: 1
+        },
+        move: {
+            enable: true,
+            speed: 1,
+            direction: "none",
+            random: true,
+            straight: false,
+            out_mode: "out",
+            bounce: false,
+            attract: {
+                enable: false,
+                rotateX: 600,
+                rotateY: 1200
+            }
+        }
+    },
+    interactivity: {
+        detect_on: "canvas",
+        events: {
+            onhover: {
+                enable: true,
+                mode: "grab"
+            },
+            onclick: {
+                enable: true,
+                mode: "push"
+            },
+            resize: true
+        },
+        modes: {
+            grab: {
+                distance: 140,
+                line_linked: {
+                    opacity: 0.3
+                }
+            },
+            push: {
+                particles_nb: 4
+            }
+        }
+    },
+    retina_detect: true
+};
+
+document.addEventListener('DOMContentLoaded', function() {
+    // Toggle filter section
+    const filterToggle = document.getElementById('filter-toggle');
+    const filterSection = document.getElementById('filter-section');
+
+    if (filterToggle && filterSection) {
+        filterToggle.addEventListener('click', function() {
+            if (filterSection.style.display === 'none') {
+                filterSection.style.display = 'block';
+                filterToggle.innerHTML = '<i class="fas fa-times me-1"></i> Close Filters';
+            } else {
+                filterSection.style.display = 'none';
+                filterToggle.innerHTML = '<i class="fas fa-filter me-1"></i> Filters';
+            }
+        });
+    }
+
+    // Apply filters functionality
+    const applyFilters = document.getElementById('apply-filters');
+    if (applyFilters) {
+        applyFilters.addEventListener('click', function() {
+            const employeeId = document.getElementById('filter-employee-id').value;
+            const name = document.getElementById('filter-name').value;
+            const status = document.getElementById('filter-status').value;
+
+            let message = 'Applying filters: ';
+            if (employeeId) message += `Employee ID: ${employeeId}, `;
+            if (name) message += `Name: ${name}, `;
+            if (status) message += `Status: ${status}`;
+
+            if (!employeeId && !name && !status) {
+                message = 'Showing all records (no filters applied)';
+            }
+
+            // Create a temporary notification
+            const notification = document.createElement('div');
+            notification.className = 'alert alert-info alert-dismissible fade show';
+            notification.innerHTML = `
+                ${message}
+                <button type="button" class="btn-close" data-bs-dismiss="alert"></button>
+            `;
+
+            document.querySelector('.dashboard-container').prepend(notification);
+
+            // Auto-close after 3 seconds
+            setTimeout(() => {
+                const bsAlert = new bootstrap.Alert(notification);
+                bsAlert.close();
+            }, 3000);
+        });
+    }
+
+    // View salary button functionality
+    const viewButtons = document.querySelectorAll('.view-salary-btn');
+    viewButtons.forEach(button => {
+        button.addEventListener('click', function() {
+            const salaryId = this.getAttribute('data-id');
+            alert(`Viewing details for salary record #${salaryId}. This would open a detailed view.`);
+        });
+    });
+});
@@ -0,0 +1,294 @@
+"""
+Production static pipeline: vendored third-party assets, hashed and
+precompressed files, and serving with far-future cache headers.
+
+- ``VENDOR_ASSETS`` pins the third-party CSS/JS the templates use.
+  ``manage.py vendor_static`` downloads them under hr/static/hr/vendor/
+  when a release is built, before collectstatic; they are not kept in git.
+  ``{% vendor_asset %}`` (hr_assets tag library) links the local copy when
+  it is there and the CDN otherwise, which only development should see:
+  ``check --deploy`` fails (hr.E001) under the production profile while
+  any of them is missing.
+- With DJANGO_STATIC_PROFILE=production, collectstatic stores every file
+  under a content-hashed name (ManifestStaticFilesStorage) and writes .gz
+  and, when the brotli package is installed, .br copies next to it.
+- ``StaticFilesMiddleware`` serves STATIC_ROOT, picking the precompressed
+  copy the browser accepts. Hashed names change whenever the content does,
+  so they are sent as cacheable for a year and ``immutable``.
+- ``page_weight`` breaks a rendered page down into what the browser has to
+  fetch before it can paint (manage.py static_report).
+"""
+import functools
+import gzip
+import mimetypes
+import os
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.http import Http404, HttpResponse, HttpResponseNotModified
+from django.templatetags.static import static
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+mimetypes.add_type('font/woff2', '.woff2')
+mimetypes.add_type('font/ttf', '.ttf')
+
+# name -> (path under the static root, CDN URL it is downloaded from)
+VENDOR_ASSETS = {
+    'bootstrap.css': ('hr/vendor/bootstrap-5.3.0/bootstrap.min.css',
+                      'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css'),
+    'bootstrap.js': ('hr/vendor/bootstrap-5.3.0/bootstrap.bundle.min.js',
+                     'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js'),
+    'fontawesome.css': ('hr/vendor/fontawesome-6.4.0/css/all.min.css',
+                        'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css'),
+    'htmx.js': ('hr/vendor/htmx-1.9.2/htmx.min.js', 'https://unpkg.com/htmx.org@1.9.2/dist/htmx.min.js'),
+    'particles.js': ('hr/vendor/particles-2.0.0/particles.min.js',
+                     'https://cdn.jsdelivr.net/particles.js/2.0.0/particles.min.js'),
+    'chart.js': ('hr/vendor/chartjs-4.4.0/chart.umd.js', 'https://cdn.jsdelivr.net/npm/chart.js@4.4.0/dist/chart.umd.js'),
+}
+# files the vendored stylesheets refer to with url(); collectstatic fails without them
+VENDOR_FILES = [
+    (f'hr/vendor/fontawesome-6.4.0/webfonts/{font}.{ext}',
+     f'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/webfonts/{font}.{ext}')
+    for font in ('fa-brands-400', 'fa-regular-400', 'fa-solid-900', 'fa-v4compatibility')
+    for ext in ('woff2', 'ttf')
+]
+
+# already-compressed formats (images, woff2) gain nothing from another pass
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.mjs', '.map', '.json', '.svg', '.txt', '.html', '.xml', '.ttf', '.eot', '.ico'}
+
+
+def brotli_available():
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+@functools.cache
+def vendor_url(name):
+    """URL of vendored asset ``name``: the local copy once downloaded, else the CDN."""
+    path, cdn_url = VENDOR_ASSETS[name]
+    if finders.find(path) is None:
+        return cdn_url
+    return static(path)
+
+
+# ------------------- COLLECTSTATIC -------------------
+def compressed_variants(data):
+    """``[(suffix, bytes)]`` of the gzip and brotli encodings of ``data`` that are worth keeping."""
+    variants = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli_available():
+        import brotli
+        variants.append(('.br', brotli.compress(data, quality=11)))
+    # not worth a Content-Encoding when it saves under 5%
+    return [(suffix, encoded) for suffix, encoded in variants if len(encoded) < len(data) * 0.95]
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Manifest storage that also writes ``name.gz`` and ``name.br`` for every
+    compressible hashed file, so nothing is compressed per request.
+    """
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in sorted(set(self.hashed_files.values())):
+            for compressed in self.compress(name):
+                yield name, compressed, True
+
+    def compress(self, name):
+        if os.path.splitext(name)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+            return []
+        path = self.path(name)
+        with open(path, 'rb') as source:
+            data = source.read()
+        if len(data) < settings.HR_STATIC_COMPRESS_MIN_SIZE:
+            return []
+        written = []
+        for suffix, encoded in compressed_variants(data):
+            with open(path + suffix, 'wb') as target:
+                target.write(encoded)
+            written.append(name + suffix)
+        return written
+
+
+# ------------------- SERVING -------------------
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+def accepted_encodings(request):
+    header = request.headers.get('Accept-Encoding', '')
+    accepted = set()
+    for part in header.split(','):
+        coding, _, params = part.partition(';')
+        quality = params.strip().removeprefix('q=')
+        try:
+            if params and float(quality) == 0:
+                continue  # "br;q=0" refuses br
+        except ValueError:
+            pass
+        accepted.add(coding.strip().lower())
+    return accepted
+
+def serve_static(request, name, immutable=False):
+    """Response for ``name`` under STATIC_ROOT, precompressed if the client accepts it."""
+    try:
+        path = safe_join(settings.STATIC_ROOT, name)
+    except SuspiciousFileOperation:
+        raise Http404(name)
+    if not os.path.isfile(path):
+        raise Http404(name)
+    modified = os.stat(path).st_mtime
+    if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), modified):
+        return HttpResponseNotModified()
+
+    content_type, _ = mimetypes.guess_type(path)
+    served, encoding = path, None
+    accepted = accepted_encodings(request)
+    for coding, suffix in ENCODINGS:
+        if coding in accepted and os.path.isfile(path + suffix):
+            served, encoding = path + suffix, coding
+            break
+    with open(served, 'rb') as fileobj:
+        data = fileobj.read()
+
+    response = HttpResponse(data if request.method == 'GET' else b'', content_type=content_type or 'application/octet-stream')
+    response['Content-Length'] = len(data)
+    response['Last-Modified'] = http_date(modified)
+    response['Vary'] = 'Accept-Encoding'
+    if encoding:
+        response['Content-Encoding'] = encoding
+    if immutable:
+        response['Cache-Control'] = f'public, max-age={settings.HR_STATIC_MAX_AGE}, immutable'
+    else:
+        response['Cache-Control'] = f'public, max-age={settings.HR_STATIC_UNHASHED_MAX_AGE}'
+    return response
+
+class StaticFilesMiddleware:
+    """
+    Serves STATIC_URL from STATIC_ROOT when HR_STATIC_SERVE is on, ahead of
+    sessions, auth and the perf recorder. Names listed in the collectstatic
+    manifest are content-hashed and get the immutable Cache-Control; any
+    other file (e.g. one a stylesheet loads by its plain name) is cached
+    for HR_STATIC_UNHASHED_MAX_AGE.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.HR_STATIC_SERVE or not settings.STATIC_URL.startswith('/'):
+            raise MiddlewareNotUsed
+        self.prefix = settings.STATIC_URL
+        self.hashed = set(getattr(staticfiles_storage, 'hashed_files', {}).values())
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def serve(self, request):
+        if request.method not in ('GET', 'HEAD') or not request.path.startswith(self.prefix):
+            return None
+        name = request.path[len(self.prefix):]
+        return serve_static(request, name, immutable=name in self.hashed)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.serve(request) or self.get_response(request)
+
+    async def __acall__(self, request):
+        return self.serve(request) or await self.get_response(request)
+
+
+# ------------------- PAGE WEIGHT -------------------
+class AssetParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.in_head = False
+        self.inline = None
+        self.assets = []
+        self.inline_bytes = {'css': 0, 'js': 0}
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'head':
+            self.in_head = True
+        elif tag == 'body':
+            self.in_head = False
+        elif tag == 'link' and 'stylesheet' in (attrs.get('rel') or '').split() and attrs.get('href'):
+            self.assets.append({'url': attrs['href'], 'kind': 'css', 'blocking': self.in_head})
+        elif tag == 'script' and attrs.get('src'):
+            deferred = 'defer' in attrs or 'async' in attrs or attrs.get('type') == 'module'
+            self.assets.append({'url': attrs['src'], 'kind': 'js', 'blocking': self.in_head and not deferred})
+        elif tag in ('style', 'script'):
+            self.inline = 'css' if tag == 'style' else 'js'
+
+    def handle_endtag(self, tag):
+        if tag == 'head':
+            self.in_head = False
+        elif tag in ('style', 'script'):
+            self.inline = None
+
+    def handle_data(self, data):
+        if self.inline:
+            self.inline_bytes[self.inline] += len(data.encode())
+
+def local_asset(url):
+    """Path of the file a same-site static URL points at, or None."""
+    parts = urlsplit(url)
+    if parts.netloc or not parts.path.startswith(settings.STATIC_URL):
+        return None
+    name = parts.path[len(settings.STATIC_URL):]
+    collected = os.path.join(settings.STATIC_ROOT, name)
+    return collected if os.path.isfile(collected) else finders.find(name)
+
+def page_weight(html):
+    """
+    What a browser fetches for ``html`` (bytes) before the first paint.
+    Sizes are known for local assets only; third-party ones are listed with
+    their origin, each of which costs a DNS lookup and TLS handshake before
+    the first byte. ``repeat_view_bytes`` is what every further view costs
+    once hashed assets sit in the browser cache.
+    """
+    parser = AssetParser()
+    parser.feed(html.decode())
+    hashed = set(getattr(staticfiles_storage, 'hashed_files', {}).values())
+    encoding = 'br' if brotli_available() else 'gzip'
+
+    def wire_size(data):
+        return min([len(data)] + [len(encoded) for _, encoded in compressed_variants(data)])
+
+    html_wire = wire_size(html)
+    report = {
+        'html_bytes': len(html), 'html_wire_bytes': html_wire, 'encoding': encoding,
+        'inline_css_bytes': parser.inline_bytes['css'], 'inline_js_bytes': parser.inline_bytes['js'],
+        'assets': [], 'third_party_origins': sorted({
+            urlsplit(asset['url']).netloc for asset in parser.assets if urlsplit(asset['url']).netloc
+        }),
+    }
+    blocking_wire = html_wire
+    repeat_wire = html_wire
+    for asset in parser.assets:
+        path = local_asset(asset['url'])
+        if path is not None:
+            with open(path, 'rb') as fileobj:
+                data = fileobj.read()
+            name = urlsplit(asset['url']).path[len(settings.STATIC_URL):]
+            asset.update(bytes=len(data), wire_bytes=wire_size(data), immutable=name in hashed)
+            if asset['blocking']:
+                blocking_wire += asset['wire_bytes']
+            if not asset['immutable']:
+                repeat_wire += asset['wire_bytes']
+        report['assets'].append(asset)
+    report.update(
+        blocking_requests=sum(asset['blocking'] for asset in parser.assets),
+        blocking_wire_bytes=blocking_wire,
+        repeat_view_bytes=repeat_wire,
+        unsized_assets=sum('bytes' not in asset for asset in parser.assets),
+    )
+    return report
@@ -0,0 +1,11 @@
+from django import template
+
+from ..staticfiles import vendor_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def vendor_asset(name):
+    """``<script src="{% vendor_asset 'htmx.js' %}"></script>``"""
+    return vendor_url(name)
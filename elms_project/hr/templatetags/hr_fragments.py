@@ -0,0 +1,11 @@
+from django import template
+
+from ..fragments import render_rows
+
+register = template.Library()
+
+
+@register.simple_tag
+def cached_rows(objects, template_name, name):
+    """``{% cached_rows employees 'hr/partials/_employee_row.html' 'e' %}``"""
+    return render_rows(template_name, objects, name)
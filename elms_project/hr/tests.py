@@ -1,3 +1,1323 @@
-from django.test import TestCase
+import base64
+import csv
+import html
+import io
+import json
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from unittest import mock, skipUnless
+from urllib.parse import urlencode
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.db.migrations.executor import MigrationExecutor
+from django.db.models import Sum
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import lookups
+from .admin import EstimatedCountPaginator
+from .checks import check_vendored_assets
+from .columnar import arrow_available
+from .fragments import render_rows
+from .grid import save_grid
+from .importers import import_file, import_rows
+from .pagination import PAGE_SIZE, decode_cursor, encode_cursor, keyset_paginate
+from .jobs import claim_job, enqueue, purge_jobs, requeue_stale, run_job, run_worker
+from .models import REFERENCE_POSTED, Attendance, Employee, Job, MonthlyRollup, Salary, SalaryPayment, Tombstone
+from .payments import import_payments, post_payment
+from .perf import QueryBudgetExceeded
+from .payroll import generate_payroll, mark_paid
+from .rollups import rebuild_rollups
+from .search import rebuild_index, search_employees
+from .timeline import timeline_page
+
+ROLLUP_FIELDS = (
+    'attendance_count', 'present_days', 'leaves', 'total_payable', 'total_paid', 'paid_count', 'unpaid_count',
+)
+
+
+def make_employee(code, base_salary=1000, **fields):
+    return Employee.objects.create(employee_id=code, name=f"Employee {code}", base_salary=base_salary, **fields)
+
+def make_attendance(employee, year=2025, month=1, total_days=30, leaves=2, present_days=28):
+    return Attendance.objects.create(
+        employee=employee, year=year, month=month, total_days=total_days, leaves=leaves, present_days=present_days,
+    )
+
+def make_salary(employee, year=2025, month=1, total=1000, received=0):
+    return Salary.objects.create(
+        employee=employee, year=year, month=month, total_salary=total, received_salary=received,
+    )
+
+def csv_file(*lines):
+    return io.BytesIO(('\n'.join(lines) + '\n').encode())
+
+def streamed(response):
+    """The body of a streaming response, as text."""
+    return b''.join(response.streaming_content).decode()
+
+def csv_rows(response):
+    return list(csv.DictReader(io.StringIO(streamed(response))))
+
+def numbered(rows):
+    """``(line, row)`` pairs as read_rows() yields them, for import_rows()/import_payments()."""
+    return list(enumerate(rows, 2))
+
+
+class HRTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('clerk', password='secret')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def assertLedgerBalanced(self):
+        """Every salary's payments add up to its received_salary."""
+        posted = dict(SalaryPayment.objects.values('salary').annotate(total=Sum('amount')).values_list('salary', 'total'))
+        for pk, received in Salary.objects.values_list('pk', 'received_salary'):
+            self.assertEqual(posted.get(pk, Decimal('0')), received, f"salary {pk}")
+
+    def assertRollupsCurrent(self):
+        """The incrementally maintained rollups equal a rebuild from the raw tables."""
+        def stored():
+            return {
+                (row.pop('year'), row.pop('month')): row
+                for row in MonthlyRollup.objects.values('year', 'month', *ROLLUP_FIELDS)
+                if any(row[field] for field in ROLLUP_FIELDS)  # a period emptied by deletes
+            }
+        maintained = stored()
+        rebuild_rollups()
+        self.assertEqual(maintained, stored())
+
+
+# ------------------- PAYMENTS -------------------
+class PaymentLedgerTests(HRTestCase):
+    def setUp(self):
+        super().setUp()
+        self.salary = make_salary(make_employee('E001'))
+
+    def test_partial_payments_add_up_and_settle_the_salary(self):
+        post_payment(self.salary, Decimal('400'), paid_on=date(2025, 2, 1))
+        self.salary.refresh_from_db()
+        self.assertEqual(self.salary.received_salary, Decimal('400'))
+        self.assertEqual(self.salary.status, 'Unpaid')
+        self.assertIsNone(self.salary.payment_date)
+
+        post_payment(self.salary, Decimal('600'), paid_on=date(2025, 2, 5))
+        self.salary.refresh_from_db()
+        self.assertEqual(self.salary.received_salary, Decimal('1000'))
+        self.assertEqual(self.salary.status, 'Paid')
+        self.assertEqual(self.salary.payment_date, date(2025, 2, 5))
+        self.assertLedgerBalanced()
+
+    def test_reversal_reopens_a_paid_salary(self):
+        post_payment(self.salary, Decimal('1000'))
+        post_payment(self.salary, Decimal('-250'))
+        self.salary.refresh_from_db()
+        self.assertEqual(self.salary.received_salary, Decimal('750'))
+        self.assertEqual(self.salary.status, 'Unpaid')
+        self.assertEqual(self.salary.payments.count(), 2)
+        self.assertLedgerBalanced()
+
+    def test_reference_can_only_be_posted_once(self):
+        post_payment(self.salary, Decimal('100'), reference='TX-1')
+        with self.assertRaises(IntegrityError):
+            post_payment(self.salary, Decimal('100'), reference='TX-1')
+        self.salary.refresh_from_db()
+        self.assertEqual(self.salary.received_salary, Decimal('100'))
+        self.assertLedgerBalanced()
+
+    def test_bank_file_skips_posted_and_repeated_references(self):
+        post_payment(self.salary, Decimal('100'), reference='TX-1')
+        rows = [
+            {'employee_id': 'E001', 'year': '2025', 'month': 'January', 'amount': '100', 'reference': 'TX-1'},
+            {'employee_id': 'E001', 'year': '2025', 'month': '1', 'amount': '200', 'reference': 'TX-2'},
+            {'employee_id': 'E001', 'year': '2025', 'month': '1', 'amount': '200', 'reference': 'TX-2'},
+            {'employee_id': 'E999', 'year': '2025', 'month': '1', 'amount': '50'},
+            {'employee_id': 'E001', 'year': '2025', 'month': '1', 'amount': 'abc'},
+        ]
+        result = import_payments(numbered(rows))
+        self.assertEqual((result.imported, result.duplicates, len(result.errors)), (1, 2, 2))
+        self.assertEqual([line for line, _ in result.errors], [5, 6])
+        self.salary.refresh_from_db()
+        self.assertEqual(self.salary.received_salary, Decimal('300'))
+        self.assertLedgerBalanced()
+
+    def test_bank_file_rejects_non_finite_amounts(self):
+        rows = [
+            {'employee_id': 'E001', 'year': '2025', 'month': '1', 'amount': amount}
+            for amount in ('NaN', 'Infinity', '-Infinity', '100')
+        ]
+        result = import_payments(numbered(rows))
+        self.assertEqual(result.imported, 1)
+        self.assertEqual([message for _, message in result.errors], [
+            "amount: 'NaN' is not an amount", "amount: 'Infinity' is not an amount",
+            "amount: '-Infinity' is not an amount",
+        ])
+        self.assertLedgerBalanced()
+
+    def test_bank_file_dry_run_posts_nothing(self):
+        rows = [{'employee_id': 'E001', 'year': '2025', 'month': '1', 'amount': '1000'}]
+        result = import_payments(numbered(rows), dry_run=True)
+        self.assertEqual(result.imported, 1)
+        self.assertFalse(SalaryPayment.objects.exists())
+        self.salary.refresh_from_db()
+        self.assertEqual((self.salary.received_salary, self.salary.status), (Decimal('0'), 'Unpaid'))
+
+    def test_mark_paid_posts_the_outstanding_balance(self):
+        post_payment(self.salary, Decimal('300'))
+        other = make_salary(make_employee('E002'), total=500)
+        changed = mark_paid(Salary.objects.all(), payment_date=date(2025, 3, 1), user=self.user)
+        self.assertEqual(changed, 2)
+        for salary in (self.salary, other):
+            salary.refresh_from_db()
+            self.assertEqual(salary.received_salary, salary.total_salary)
+            self.assertEqual((salary.status, salary.payment_date), ('Paid', date(2025, 3, 1)))
+        self.assertEqual(self.salary.payments.order_by('pk').last().amount, Decimal('700'))
+        self.assertLedgerBalanced()
+
+    def test_salary_import_pays_received_amounts_through_the_ledger(self):
+        post_payment(self.salary, Decimal('300'))
+        rows = [
+            {'employee_id': 'E001', 'year': '2025', 'month': '1', 'total_salary': '1000', 'received_salary': '1000'},
+            {'employee_id': 'E001', 'year': '2025', 'month': '2', 'total_salary': '1000', 'received_salary': '250'},
+        ]
+        result = import_rows('salary', numbered(rows))
+        self.assertEqual((result.imported, result.errors), (2, []))
+        self.salary.refresh_from_db()
+        self.assertEqual((self.salary.received_salary, self.salary.status), (Decimal('1000'), 'Paid'))
+        february = Salary.objects.get(employee__employee_id='E001', year=2025, month=2)
+        self.assertEqual((february.received_salary, february.status), (Decimal('250'), 'Unpaid'))
+        self.assertLedgerBalanced()
+
+    def test_payment_view_records_a_payment(self):
+        url = reverse('hr:salary_payment', args=[self.salary.pk])
+        response = self.client.post(url, {'amount': '1000', 'paid_on': '2025-02-01', 'reference': 'TX-9'}, HTTP_HX_REQUEST='true')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, f'id="salary-{self.salary.pk}"')
+        payment = self.salary.payments.get()
+        self.assertEqual((payment.reference, payment.recorded_by), ('TX-9', self.user))
+        self.salary.refresh_from_db()
+        self.assertEqual(self.salary.status, 'Paid')
+
+    def test_payment_view_reports_a_duplicate_reference(self):
+        post_payment(self.salary, Decimal('100'), reference='TX-1')
+        url = reverse('hr:salary_payment', args=[self.salary.pk])
+        data = {'amount': '100', 'paid_on': '2025-02-01', 'reference': 'TX-1'}
+        response = self.client.post(url, data, HTTP_HX_REQUEST='true')
+        self.assertContains(response, REFERENCE_POSTED)
+        self.assertEqual(response['HX-Retarget'], '#modal-body')
+
+        # posted by someone else between validation and the insert
+        with mock.patch.object(SalaryPayment, 'validate_constraints'):
+            response = self.client.post(url, data, HTTP_HX_REQUEST='true')
+        self.assertContains(response, REFERENCE_POSTED)
+        self.assertEqual(self.salary.payments.count(), 1)
+        self.assertLedgerBalanced()
+
+
+# ------------------- ROLLUPS -------------------
+class RollupTests(HRTestCase):
+    def setUp(self):
+        super().setUp()
+        self.employee = make_employee('E001')
+        self.other = make_employee('E002', base_salary=2000)
+
+    def test_model_saves_and_deletes(self):
+        attendance = make_attendance(self.employee)
+        salary = make_salary(self.employee)
+        make_salary(self.other, received=2000, total=2000)
+        self.assertRollupsCurrent()
+
+        attendance.present_days, attendance.leaves = 20, 10
+        attendance.save()
+        salary.received_salary = 1000
+        salary.save()
+        self.assertRollupsCurrent()
+
+        # moving a row to another period takes it out of the old one
+        salary.month = 2
+        salary.save()
+        self.assertRollupsCurrent()
+
+        attendance.delete()
+        salary.delete()
+        self.assertRollupsCurrent()
+
+    def test_employee_delete_removes_its_rows(self):
+        for month in (1, 2, 3):
+            make_attendance(self.employee, month=month)
+            make_salary(self.employee, month=month, received=500)
+            make_salary(self.other, month=month)
+        self.employee.delete()
+        self.assertRollupsCurrent()
+        self.assertEqual(MonthlyRollup.objects.get(year=2025, month=1).unpaid_count, 1)
+
+    def test_generate_payroll(self):
+        make_attendance(self.employee, present_days=15)
+        make_salary(self.other, total=100, received=100)
+        generate_payroll(2025, 1)
+        self.assertRollupsCurrent()
+        generate_payroll(2025, 2, skip_existing=True)
+        self.assertRollupsCurrent()
+
+    def test_imports(self):
+        make_attendance(self.employee)
+        import_rows('attendance', numbered([
+            {'employee_id': 'E001', 'year': '2025', 'month': '1', 'total_days': '30', 'present_days': '10', 'leaves': '20'},
+            {'employee_id': 'E002', 'year': '2025', 'month': '2', 'total_days': '28', 'present_days': '28'},
+        ]))
+        import_rows('salary', numbered([
+            {'employee_id': 'E001', 'year': '2025', 'month': '1', 'total_salary': '1000', 'received_salary': '1000'},
+            {'employee_id': 'E002', 'year': '2025', 'month': '2', 'total_salary': '2000', 'received_salary': '500'},
+        ]))
+        self.assertRollupsCurrent()
+
+    def test_payments_and_mark_paid(self):
+        salary = make_salary(self.employee)
+        make_salary(self.other, month=2, total=2000)
+        post_payment(salary, Decimal('1000'))
+        self.assertRollupsCurrent()
+        post_payment(salary, Decimal('-1'))
+        self.assertRollupsCurrent()
+        import_payments(numbered([{'employee_id': 'E002', 'year': '2025', 'month': '2', 'amount': '700'}]))
+        self.assertRollupsCurrent()
+        mark_paid(Salary.objects.all())
+        self.assertRollupsCurrent()
+
+    def test_attendance_grid(self):
+        make_attendance(self.employee)
+        rows = save_grid(2025, 1, {
+            self.employee.pk: {'present_days': '25', 'leaves': '5'},
+            self.other.pk: {'total_days': '31', 'present_days': '31'},
+        })
+        self.assertTrue(all(row.saved for row in rows))
+        self.assertRollupsCurrent()
+
+    def test_an_invalid_grid_row_saves_nothing(self):
+        attendance = make_attendance(self.employee)
+        third = make_employee('E003')
+        rows = save_grid(2025, 1, {
+            self.employee.pk: {'present_days': '25', 'leaves': '5'},
+            self.other.pk: {'total_days': '30', 'present_days': '40'},
+            third.pk: {'leaves': 'two'},
+        })
+        rows = {row.employee.employee_id: row for row in rows}
+        self.assertEqual(
+            {code: row.error for code, row in rows.items()},
+            {'E001': None, 'E002': 'present_days: 40 is outside 0-31', 'E003': "leaves: 'two' is not a whole number"},
+        )
+        self.assertFalse(any(row.saved for row in rows.values()))
+        # the valid row keeps what was typed, so it can be posted again
+        self.assertEqual(rows['E001'].submitted, {'present_days': '25', 'leaves': '5'})
+
+        attendance.refresh_from_db()
+        self.assertEqual((attendance.present_days, attendance.leaves), (28, 2))
+        self.assertEqual(Attendance.objects.count(), 1)
+        self.assertRollupsCurrent()
+
+
+# ------------------- MIGRATIONS -------------------
+class MonthMigrationTests(TransactionTestCase):
+    """0003 turns month names into 1-12 integers, and back when unapplied."""
+    before = [('hr', '0002_alter_attendance_options_alter_salary_options_and_more')]
+    after = [('hr', '0003_integer_month_and_period_indexes')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes('hr'))
+
+    def test_round_trip(self):
+        apps = self.migrate(self.before)
+        employee = apps.get_model('hr', 'Employee').objects.create(employee_id='E001', name='Employee E001')
+        Attendance = apps.get_model('hr', 'Attendance')
+        Salary = apps.get_model('hr', 'Salary')
+        for month in ('January', 'feb', ' 3 '):
+            Attendance.objects.create(employee=employee, year=2025, month=month, total_days=30, present_days=30)
+            Salary.objects.create(employee=employee, year=2025, month=month, total_salary=1000)
+
+        apps = self.migrate(self.after)
+        for model_name in ('Attendance', 'Salary'):
+            months = apps.get_model('hr', model_name).objects.order_by('month').values_list('month', flat=True)
+            self.assertEqual(list(months), [1, 2, 3])
+
+        apps = self.migrate(self.before)
+        for model_name in ('Attendance', 'Salary'):
+            months = apps.get_model('hr', model_name).objects.values_list('month', flat=True)
+            self.assertEqual(sorted(months), ['February', 'January', 'March'])
+
+    def test_unknown_month_stops_the_migration(self):
+        apps = self.migrate(self.before)
+        employee = apps.get_model('hr', 'Employee').objects.create(employee_id='E001', name='Employee E001')
+        salary = apps.get_model('hr', 'Salary').objects.create(employee=employee, year=2025, month='Smarch', total_salary=1000)
+        with self.assertRaisesMessage(ValueError, "Cannot convert month 'Smarch'"):
+            self.migrate(self.after)
+
+        # nothing was applied, so fixing the row and migrating again works
+        salary.month = 'March'
+        salary.save()
+        apps = self.migrate(self.after)
+        self.assertEqual(apps.get_model('hr', 'Salary').objects.get().month, 3)
+
+
+# ------------------- IMPORTS -------------------
+ATTENDANCE_CSV = (
+    'Employee ID,Employee Name,Month,Year,Total Days,Leaves,Present Days',
+    'E001,Employee E001,January,2025,30,2,28',
+    'E002,Employee E002,1,2025,30,,30',
+    'E999,Nobody,1,2025,30,0,30',
+    'E001,Employee E001,Smarch,2025,30,0,30',
+    'E002,Employee E002,2,2025,thirty,0,30',
+    ',,,,,,',
+    'E001,Employee E001,Feb,2025,28,0,28',
+    'E001,Employee E001,Feb,2025,28,8,20',
+)
+
+class ImportTests(HRTestCase):
+    def setUp(self):
+        super().setUp()
+        self.employee = make_employee('E001')
+        make_employee('E002')
+
+    def test_import_reports_bad_rows_and_upserts_the_rest(self):
+        make_attendance(self.employee, month=1, leaves=10, present_days=20)
+        result = import_file('attendance', csv_file(*ATTENDANCE_CSV), 'attendance.csv')
+
+        self.assertEqual((result.rows, result.imported), (7, 3))
+        self.assertEqual([line for line, _ in result.errors], [4, 5, 6])
+        self.assertIn("'E999' does not exist", result.errors[0][1])
+        january = Attendance.objects.get(employee=self.employee, year=2025, month=1)
+        self.assertEqual((january.leaves, january.present_days), (2, 28))
+        self.assertEqual(Attendance.objects.get(employee__employee_id='E002', month=1).leaves, 0)
+        # the later of two rows for the same period wins
+        self.assertEqual(Attendance.objects.get(employee=self.employee, month=2).present_days, 20)
+        self.assertRollupsCurrent()
+
+    def test_dry_run_validates_without_writing(self):
+        attendance = make_attendance(self.employee, month=1, leaves=10, present_days=20)
+        result = import_file('attendance', csv_file(*ATTENDANCE_CSV), 'attendance.csv', dry_run=True)
+
+        self.assertEqual((result.rows, result.imported, len(result.errors)), (7, 3, 3))
+        self.assertEqual(list(Attendance.objects.values_list('pk', flat=True)), [attendance.pk])
+        attendance.refresh_from_db()
+        self.assertEqual((attendance.leaves, attendance.present_days), (10, 20))
+        self.assertRollupsCurrent()
+
+    def test_salary_dry_run_posts_no_payments(self):
+        result = import_file('salary', csv_file(
+            'Employee ID,Month,Year,Total Salary,Received Salary,Payment Date',
+            'E001,1,2025,1000,1000,2025-02-01',
+            'E002,1,2025,1000,,not-a-date',
+        ), 'salary.csv', dry_run=True)
+        self.assertEqual((result.imported, [line for line, _ in result.errors]), (1, [3]))
+        self.assertFalse(Salary.objects.exists())
+        self.assertFalse(SalaryPayment.objects.exists())
+
+    def test_non_finite_numbers_are_row_errors(self):
+        result = import_file('attendance', csv_file(
+            'Employee ID,Month,Year,Total Days,Leaves,Present Days',
+            'E001,1,2025,Infinity,0,30',
+            'E001,2,2025,30,-Infinity,30',
+            'E001,3,2025,30,0,NaN',
+            'E001,4,2025,30,0,30',
+        ), 'attendance.csv')
+        self.assertEqual(result.imported, 1)
+        self.assertEqual(result.errors, [
+            (2, "total_days: 'Infinity' is not a whole number"),
+            (3, "leaves: '-Infinity' is not a whole number"),
+            (4, "present_days: 'NaN' is not a whole number"),
+        ])
+
+        result = import_file('salary', csv_file(
+            'Employee ID,Month,Year,Total Salary,Received Salary',
+            'E001,1,2025,NaN,0',
+            'E001,2,2025,1000,Infinity',
+            'E001,3,2025,1000,sNaN',
+            'E001,4,2025,1000,500',
+        ), 'salary.csv')
+        self.assertEqual(result.imported, 1)
+        self.assertEqual(result.errors, [
+            (2, "total_salary: 'NaN' is not an amount"),
+            (3, "received_salary: 'Infinity' is not an amount"),
+            (4, "received_salary: 'sNaN' is not an amount"),
+        ])
+
+        response = self.client.post(reverse('hr:import_payroll'), {'kind': 'salary', 'file': SimpleUploadedFile(
+            'salary.csv', csv_file('Employee ID,Month,Year,Total Salary', 'E002,1,2025,NaN').getvalue(),
+        )})
+        self.assertContains(response, "Line 2: total_salary: &#x27;NaN&#x27; is not an amount")
+
+    def test_import_view(self):
+        url = reverse('hr:import_payroll')
+        upload = SimpleUploadedFile('attendance.csv', csv_file(*ATTENDANCE_CSV).getvalue())
+        response = self.client.post(url, {'kind': 'attendance', 'file': upload, 'dry_run': 'on'})
+        self.assertRegex(response.content.decode(), r'Validated\s+3 of 7 rows')
+        self.assertContains(response, "Line 4: employee_id: &#x27;E999&#x27; does not exist")
+        self.assertFalse(Attendance.objects.exists())
+
+        upload = SimpleUploadedFile('attendance.csv', csv_file(*ATTENDANCE_CSV).getvalue())
+        response = self.client.post(url, {'kind': 'attendance', 'file': upload})
+        self.assertRegex(response.content.decode(), r'Imported\s+3 of 7 rows')
+        self.assertEqual(Attendance.objects.count(), 3)
+
+
+# ------------------- PAGINATION -------------------
+TAMPERED_CURSORS = [
+    'not base64!',
+    base64.urlsafe_b64encode(b'not json').decode(),
+    base64.urlsafe_b64encode(b'{"year": 2025}').decode(),
+    base64.urlsafe_b64encode(b'[Infinity, 1, 1]').decode(),
+    encode_cursor([2025]),
+    encode_cursor(['a', 'b', 'c']),
+    encode_cursor([2025, None, 1]),
+    encode_cursor([[2025], {}, 1]),
+    encode_cursor([2025, 1, 2 ** 64]),
+    encode_cursor([2 ** 64, 1]),
+    encode_cursor([1e400, 1, 1]),
+]
+
+class CursorPaginationTests(HRTestCase):
+    ordering = ('-year', '-month', '-pk')
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        employees = Employee.objects.bulk_create(
+            Employee(employee_id=f'E{index:03}', name=f'Employee {index}') for index in range(PAGE_SIZE // 5 + 1)
+        )
+        Salary.objects.bulk_create(
+            Salary(employee=employee, year=year, month=month, total_salary=1000)
+            for employee in employees for year, month in ((2024, 12), (2025, 1), (2025, 2), (2025, 3), (2025, 4))
+        )
+
+    def walk(self, page_size):
+        rows, cursor = [], None
+        while True:
+            page = keyset_paginate(Salary.objects.all(), self.ordering, cursor, page_size=page_size)
+            rows.extend(salary.pk for salary in page)
+            if not page.has_next:
+                return rows
+            cursor = page.next_cursor
+
+    def test_pages_cover_every_row_once_in_order(self):
+        expected = list(Salary.objects.order_by(*self.ordering).values_list('pk', flat=True))
+        self.assertGreater(len(expected), PAGE_SIZE)
+        for page_size in (1, 7, len(expected) - 1, len(expected), PAGE_SIZE):
+            self.assertEqual(self.walk(page_size), expected, f"page_size={page_size}")
+
+    def test_cursor_values_are_converted_to_the_column_types(self):
+        self.assertEqual(decode_cursor(encode_cursor(['2025', 3, '17']), (int, int, int)), [2025, 3, 17])
+        first = keyset_paginate(Salary.objects.all(), self.ordering, page_size=3)
+        last = first.object_list[-1]
+        self.assertEqual(decode_cursor(first.next_cursor, (int, int, int)), [last.year, last.month, last.pk])
+
+    def test_tampered_cursors_read_as_the_first_page(self):
+        first = [salary.pk for salary in keyset_paginate(Salary.objects.all(), self.ordering, page_size=5)]
+        for cursor in TAMPERED_CURSORS:
+            self.assertIsNone(decode_cursor(cursor, (int, int, int)), cursor)
+            page = keyset_paginate(Salary.objects.all(), self.ordering, cursor, page_size=5)
+            self.assertEqual([salary.pk for salary in page], first, cursor)
+
+    def test_list_view_follows_its_next_page_link(self):
+        url = reverse('hr:salary_list')
+        response = self.client.get(url, HTTP_HX_REQUEST='true')
+        shown = re.findall(r'id="salary-(\d+)"', response.content.decode())
+        self.assertEqual(len(shown), PAGE_SIZE)
+
+        next_url = html.unescape(re.search(r'hx-get="([^"]*cursor=[^"]*)"', response.content.decode()).group(1))
+        response = self.client.get(next_url, HTTP_HX_REQUEST='true')
+        shown += re.findall(r'id="salary-(\d+)"', response.content.decode())
+        self.assertNotIn('cursor=', response.content.decode())
+        expected = Salary.objects.order_by(*self.ordering).values_list('pk', flat=True)
+        self.assertEqual([int(pk) for pk in shown], list(expected))
+
+    def test_views_ignore_tampered_cursors(self):
+        employee = Employee.objects.first()
+        for url in (
+            reverse('hr:salary_list'), reverse('hr:attendance_list'), reverse('hr:employee_list'),
+            reverse('hr:employee_list') + '?q=Employee', reverse('hr:employee_timeline', args=[employee.pk]),
+        ):
+            for cursor in TAMPERED_CURSORS:
+                response = self.client.get(url, {'cursor': cursor}, HTTP_HX_REQUEST='true')
+                self.assertEqual(response.status_code, 200, f"{url} {cursor}")
+        for cursor in TAMPERED_CURSORS:
+            self.assertEqual(len(search_employees('Employee', cursor)), len(search_employees('Employee')))
+            self.assertEqual(timeline_page(employee, cursor)[0].object_list, timeline_page(employee)[0].object_list)
+
+
+# ------------------- JOBS -------------------
+def failing_handler(job):
+    raise RuntimeError("export failed")
+
+@override_settings(HR_JOB_MAX_ATTEMPTS=2, HR_JOB_RETRY_DELAY=30, HR_JOB_STALE_AFTER=60, HR_JOB_RETENTION=24 * 60 * 60)
+class JobQueueTests(HRTestCase):
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        make_employee('E001')
+
+    def job_dir(self, job):
+        return os.path.join(settings.MEDIA_ROOT, settings.HR_JOB_DIR, str(job.pk))
+
+    def test_a_job_is_claimed_once(self):
+        job = enqueue('export', {'export': 'employees'}, self.user)
+        claimed = claim_job('worker-1')
+        self.assertEqual(claimed.pk, job.pk)
+        self.assertEqual((claimed.status, claimed.worker, claimed.attempts), ('running', 'worker-1', 1))
+        self.assertIsNone(claim_job('worker-2'))
+
+    def test_worker_runs_jobs_to_completion(self):
+        job = enqueue('export', {'export': 'employees'}, self.user)
+        self.assertEqual(run_worker('worker-1', burst=True), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.progress, job.error), ('done', 100, ''))
+        with open(os.path.join(settings.MEDIA_ROOT, job.file)) as output:
+            self.assertIn('E001', output.read())
+
+    @mock.patch.dict('hr.jobs.JOB_HANDLERS', {'export': failing_handler})
+    def test_failures_are_retried_with_backoff_then_failed(self):
+        job = enqueue('export', {'export': 'employees'})
+        self.assertFalse(run_job(claim_job('worker-1')))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.worker), ('queued', ''))
+        self.assertIn('RuntimeError: export failed', job.error)
+        self.assertAlmostEqual((job.run_after - timezone.now()).total_seconds(), 30, delta=5)
+        self.assertIsNone(claim_job('worker-1'))  # not before run_after
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        self.assertFalse(run_job(claim_job('worker-1')))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('failed', 2))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_a_stalled_worker_cannot_overwrite_its_lost_job(self):
+        job = enqueue('export', {'export': 'employees'})
+        stalled = claim_job('worker-1')
+        # the heartbeat stopped, so the job was requeued and another worker took it
+        Job.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - timedelta(seconds=120))
+        requeue_stale()
+        self.assertEqual(claim_job('worker-2').pk, job.pk)
+
+        self.assertFalse(run_job(stalled))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.worker, job.file), ('running', 'worker-2', ''))
+
+        Job.objects.filter(pk=job.pk).update(status='failed')
+        with mock.patch.dict('hr.jobs.JOB_HANDLERS', {'export': failing_handler}):
+            self.assertFalse(run_job(stalled))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error), ('failed', ''))
+
+    @mock.patch.dict('hr.jobs.JOB_HANDLERS', {'export': failing_handler})
+    def test_a_retried_job_starts_from_no_progress(self):
+        job = enqueue('export', {'export': 'employees'})
+        claimed = claim_job('worker-1')
+        Job.objects.filter(pk=job.pk).update(progress=60)
+        run_job(claimed)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.progress), ('queued', 0))
+
+    def test_stale_running_jobs_are_requeued_or_failed(self):
+        stale = timezone.now() - timedelta(seconds=120)
+        retry = Job.objects.create(kind='export', status='running', attempts=1, max_attempts=2, heartbeat_at=stale)
+        spent = Job.objects.create(kind='export', status='running', attempts=2, max_attempts=2, heartbeat_at=stale)
+        alive = Job.objects.create(kind='export', status='running', attempts=1, heartbeat_at=timezone.now())
+
+        self.assertEqual(requeue_stale(), 1)
+        statuses = dict(Job.objects.values_list('pk', 'status'))
+        self.assertEqual(
+            [statuses[retry.pk], statuses[spent.pk], statuses[alive.pk]], ['queued', 'failed', 'running'],
+        )
+
+    def test_finished_jobs_and_their_files_are_purged(self):
+        old, recent = enqueue('export', {'export': 'employees'}), enqueue('export', {'export': 'employees'})
+        run_worker('worker-1', burst=True)
+        queued = enqueue('export', {'export': 'employees'})
+        Job.objects.filter(pk__in=[old.pk, queued.pk]).update(finished_at=timezone.now() - timedelta(days=2))
+        self.assertTrue(os.path.isdir(self.job_dir(old)))
+
+        self.assertEqual(purge_jobs(), 1)
+        self.assertEqual(set(Job.objects.values_list('pk', flat=True)), {recent.pk, queued.pk})
+        self.assertFalse(os.path.exists(self.job_dir(old)))
+        self.assertTrue(os.path.isdir(self.job_dir(recent)))
+
+        call_command('purge_hr_jobs', days=0, stdout=io.StringIO())
+        self.assertEqual(list(Job.objects.values_list('pk', flat=True)), [queued.pk])
+        self.assertFalse(os.path.exists(self.job_dir(recent)))
+
+
+# ------------------- QUERY BUDGETS -------------------
+# session and user lookups included; none of these may grow with the page size
+LIST_VIEW_BUDGETS = {
+    'hr:dashboard': 4,
+    'hr:employee_list': 4,  # search: ranked ids, then the rows
+    'hr:employee_timeline': 4,
+    'hr:attendance_list': 3,
+    'hr:attendance_grid': 4,
+    'hr:salary_list': 3,
+}
+
+@override_settings(HR_PERF_ENABLED=True, HR_PERF_STRICT=True, HR_PERF_QUERY_BUDGETS=LIST_VIEW_BUDGETS)
+class QueryBudgetTests(HRTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        employees = Employee.objects.bulk_create(
+            Employee(employee_id=f'E{index:03}', name=f'Employee {index}', base_salary=1000)
+            for index in range(PAGE_SIZE + 10)
+        )
+        Attendance.objects.bulk_create(
+            Attendance(employee=employee, year=2025, month=1, total_days=30, present_days=28, leaves=2)
+            for employee in employees
+        )
+        Salary.objects.bulk_create(
+            Salary(employee=employee, year=2025, month=1, total_salary=1000) for employee in employees
+        )
+        rebuild_rollups()
+        rebuild_index()
+        cls.employee = employees[0]
+
+    def test_list_views_stay_within_their_budgets(self):
+        pages = [
+            (reverse('hr:dashboard'), {}),
+            (reverse('hr:employee_list'), {}),
+            (reverse('hr:employee_list'), {'q': 'Employee'}),
+            (reverse('hr:employee_timeline', args=[self.employee.pk]), {}),
+            (reverse('hr:attendance_list'), {'month': '1', 'year': '2025'}),
+            (reverse('hr:attendance_grid'), {'month': '1', 'year': '2025'}),
+            (reverse('hr:salary_list'), {'status': 'Unpaid'}),
+        ]
+        for url, params in pages:
+            for headers in ({}, {'HTTP_HX_REQUEST': 'true'}):
+                with self.subTest(url=url, params=params, htmx=bool(headers)):
+                    response = self.client.get(url, params, **headers)
+                    self.assertEqual(response.status_code, 200)
+                    cursor = re.search(r'cursor=([\w%=-]+)', response.content.decode())
+                    if cursor:
+                        response = self.client.get(url, {**params, 'cursor': html.unescape(cursor.group(1))}, **headers)
+                        self.assertEqual(response.status_code, 200)
+
+    def test_going_over_budget_fails(self):
+        with override_settings(HR_PERF_QUERY_BUDGETS={'hr:salary_list': 1}):
+            with self.assertRaisesMessage(QueryBudgetExceeded, "hr:salary_list ran 3 queries"):
+                self.client.get(reverse('hr:salary_list'))
+
+
+# ------------------- CHANGE FEED -------------------
+@override_settings(HR_CHANGE_FEED_LAG=0)
+class ChangeFeedTests(HRTestCase):
+    def setUp(self):
+        super().setUp()
+        self.employee = make_employee('E001')
+
+    def feed(self, kind, since=None, **params):
+        if since is not None:
+            params['since'] = since
+        response = self.client.get(reverse('hr:export_changes', args=[kind]), params)
+        self.assertEqual(response.status_code, 200)
+        return response, response['X-Watermark']
+
+    def test_each_watermark_returns_only_later_changes(self):
+        attendance = make_attendance(self.employee)
+        response, watermark = self.feed('attendance')
+        self.assertEqual(
+            [(row['op'], row['id'], row['employee_id'], row['present_days']) for row in csv_rows(response)],
+            [('upsert', str(attendance.pk), 'E001', '28')],
+        )
+
+        attendance.present_days = 20
+        attendance.save()
+        make_attendance(self.employee, month=2)
+        response, watermark = self.feed('attendance', watermark)
+        rows = csv_rows(response)
+        self.assertEqual([(row['month'], row['present_days']) for row in rows], [('1', '20'), ('2', '28')])
+        self.assertLessEqual(rows[0]['changed_at'], rows[1]['changed_at'])
+
+        response, _ = self.feed('attendance', watermark)
+        self.assertEqual(csv_rows(response), [])
+
+    def test_recent_changes_wait_for_the_lag(self):
+        attendance = make_attendance(self.employee)
+        with self.settings(HR_CHANGE_FEED_LAG=60):
+            response, watermark = self.feed('attendance')
+            self.assertEqual(csv_rows(response), [])
+            self.assertLess(datetime.fromisoformat(watermark), attendance.updated_at)
+
+            # older than the lag, so inside this window
+            Attendance.objects.filter(pk=attendance.pk).update(updated_at=timezone.now() - timedelta(seconds=120))
+            response, _ = self.feed('attendance')
+            self.assertEqual([row['id'] for row in csv_rows(response)], [str(attendance.pk)])
+
+        # the next window, from the lagged watermark, picks up what was held back
+        make_attendance(self.employee, month=2)
+        response, _ = self.feed('attendance', watermark)
+        self.assertEqual([row['month'] for row in csv_rows(response)], ['2'])
+
+    def test_a_deleted_row_leaves_a_tombstone(self):
+        salary = make_salary(self.employee, month=3)
+        _, watermark = self.feed('salary')
+        pk = salary.pk
+        salary.delete()
+
+        response, _ = self.feed('salary', watermark)
+        rows = csv_rows(response)
+        self.assertGreater(rows[0].pop('changed_at'), watermark)
+        self.assertEqual(rows, [{
+            'op': 'delete', 'id': str(pk), 'employee_id': 'E001', 'year': '2025', 'month': '3',
+            'total_salary': '', 'received_salary': '', 'status': '', 'payment_date': '',
+        }])
+
+    def test_deleting_an_employee_tombstones_all_its_rows(self):
+        other = make_employee('E002')
+        attendance = [make_attendance(self.employee, month=month).pk for month in (1, 2, 3)]
+        salaries = [make_salary(self.employee, month=month).pk for month in (1, 2)]
+        make_salary(other)
+        _, watermark = self.feed('salary')
+
+        with mock.patch.object(Tombstone.objects, 'bulk_create', wraps=Tombstone.objects.bulk_create) as bulk_create:
+            self.employee.delete()
+        bulk_create.assert_called_once()
+
+        response, _ = self.feed('attendance', watermark)
+        self.assertEqual(
+            sorted((row['op'], int(row['id']), row['employee_id']) for row in csv_rows(response)),
+            [('delete', pk, 'E001') for pk in attendance],
+        )
+        response, _ = self.feed('salary', watermark)
+        self.assertEqual(
+            sorted((row['op'], int(row['id']), row['employee_id']) for row in csv_rows(response)),
+            [('delete', pk, 'E001') for pk in salaries],
+        )
+
+    def test_jsonl_format(self):
+        salary = make_salary(self.employee, received=250)
+        response, _ = self.feed('salary', format='jsonl')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = streamed(response).splitlines()
+        self.assertEqual(len(lines), 1)
+        row = json.loads(lines[0])
+        self.assertEqual(
+            {key: row[key] for key in ('op', 'id', 'employee_id', 'year', 'month', 'received_salary', 'status')},
+            {'op': 'upsert', 'id': salary.pk, 'employee_id': 'E001', 'year': 2025, 'month': 1,
+             'received_salary': '250.00', 'status': 'Unpaid'},
+        )
+
+    def test_bad_requests(self):
+        response = self.client.get(reverse('hr:export_changes', args=['salary']), {'since': 'yesterday'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(reverse('hr:export_changes', args=['employees']))
+        self.assertEqual(response.status_code, 404)
+
+
+# ------------------- STATIC FILES -------------------
+class VendoredAssetCheckTests(TestCase):
+    def test_production_needs_every_vendored_file(self):
+        with mock.patch('hr.checks.finders.find', return_value=None):
+            self.assertEqual(check_vendored_assets(None), [])
+            with self.settings(HR_STATIC_PROFILE='production'):
+                self.assertEqual([error.id for error in check_vendored_assets(None)], ['hr.E001'])
+        with mock.patch('hr.checks.finders.find', side_effect=lambda path: f'/static/{path}'):
+            with self.settings(HR_STATIC_PROFILE='production'):
+                self.assertEqual(check_vendored_assets(None), [])
+
+
+# ------------------- CHARTS -------------------
+def use_shared_cache(test):
+    """Run ``test`` against a file-based cache, which hr.caching treats as shared between processes."""
+    location = tempfile.mkdtemp()
+    test.addCleanup(shutil.rmtree, location)
+    shared = override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location,
+    }})
+    shared.enable()
+    test.addCleanup(shared.disable)
+
+class ChartTests(HRTestCase):
+    def setUp(self):
+        super().setUp()
+        self.employee = make_employee('E001')
+        make_salary(self.employee, total=1000)
+
+    def poll(self, etag=None, year=2025):
+        headers = {'If-None-Match': etag} if etag else {}
+        return self.client.get(reverse('hr:chart_series'), {'from': year, 'to': year}, headers=headers)
+
+    def test_a_matching_etag_gets_not_modified(self):
+        response = self.poll()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['payroll']['payable'][0], '1000.00')
+
+        again = self.poll(response['ETag'])
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.content, b'')
+        self.assertEqual(again['ETag'], response['ETag'])
+        self.assertEqual(self.poll('"stale"').status_code, 200)
+
+    def test_a_write_in_the_range_changes_the_etag(self):
+        etag = self.poll()['ETag']
+        writes = [
+            lambda: make_salary(self.employee, month=2, total=500),
+            lambda: make_attendance(self.employee, month=3),
+            lambda: Attendance.objects.get(month=3).delete(),
+        ]
+        for write in writes:
+            with self.captureOnCommitCallbacks(execute=True):
+                write()
+            response = self.poll(etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response['ETag'], etag)
+            etag = response['ETag']
+        self.assertEqual(response.json()['payroll']['payable'][:2], ['1000.00', '500.00'])
+        self.assertEqual(response.json()['attendance']['records'][2], 0)
+
+    def test_a_write_outside_the_range_keeps_the_etag(self):
+        etag = self.poll()['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            make_salary(self.employee, year=2024)
+            make_attendance(self.employee, year=2026)
+        self.assertEqual(self.poll(etag).status_code, 304)
+
+class SharedCacheChartTests(ChartTests):
+    """The same polls, with the ETag taken from the response cache's versions."""
+    def setUp(self):
+        use_shared_cache(self)
+        super().setUp()
+
+
+# ------------------- EMPLOYEE LOOKUPS -------------------
+class LookupTests(HRTestCase):
+    def setUp(self):
+        super().setUp()
+        lookups.local.clear()
+        self.addCleanup(lookups.local.clear)
+        self.employee = make_employee('E001', designation='Clerk')
+
+    def details(self, employee_id='E001', etag=None):
+        headers = {'If-None-Match': etag} if etag else {}
+        return self.client.get(reverse('hr:get_employee_details', args=[employee_id]), headers=headers)
+
+    def assertLooksUp(self, employee_id, name):
+        """Both this process and one whose in-process entries have expired see ``name`` (None: not found)."""
+        for _ in range(2):
+            response = self.details(employee_id)
+            if name is None:
+                self.assertEqual(response.status_code, 404)
+            else:
+                self.assertEqual(response.json()['name'], name)
+            lookups.local.clear()
+
+    def test_a_matching_etag_gets_not_modified(self):
+        response = self.details()
+        self.assertEqual(response.json(), {'name': 'Employee E001', 'designation': 'Clerk', 'cnic': None})
+        again = self.details(etag=response['ETag'])
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again['ETag'], response['ETag'])
+
+        batch = reverse('hr:get_employee_details_batch')
+        response = self.client.get(batch, {'ids': 'E001,E404'})
+        self.assertEqual(response.json(), {
+            'employees': {'E001': {'name': 'Employee E001', 'designation': 'Clerk', 'cnic': None}},
+            'missing': ['E404'],
+        })
+        again = self.client.get(batch, {'ids': 'E001,E404'}, headers={'If-None-Match': response['ETag']})
+        self.assertEqual(again.status_code, 304)
+
+    def test_an_updated_employee_is_looked_up_again(self):
+        etag = self.details()['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.employee.name = 'Renamed'
+            self.employee.save()
+        response = self.details(etag=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertLooksUp('E001', 'Renamed')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.employee.employee_id = 'E002'
+            self.employee.save()
+        self.assertLooksUp('E001', None)
+        self.assertLooksUp('E002', 'Renamed')
+
+    def test_a_deleted_employee_is_forgotten(self):
+        self.details()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.employee.delete()
+        self.assertLooksUp('E001', None)
+
+class SharedCacheLookupTests(LookupTests):
+    """The same lookups, with the shared cache as a second layer."""
+    def setUp(self):
+        use_shared_cache(self)
+        super().setUp()
+
+
+# ------------------- FAST AUTH -------------------
+FAST_AUTH_MIDDLEWARE = [
+    'hr.auth.AuthenticationMiddleware' if name == 'django.contrib.auth.middleware.AuthenticationMiddleware' else name
+    for name in settings.MIDDLEWARE
+]
+
+@override_settings(
+    SESSION_ENGINE='django.contrib.sessions.backends.cached_db',
+    AUTHENTICATION_BACKENDS=['hr.auth.CachedUserBackend', 'django.contrib.auth.backends.ModelBackend'],
+    MIDDLEWARE=FAST_AUTH_MIDDLEWARE,
+)
+class FastAuthTests(HRTestCase):
+    def setUp(self):
+        use_shared_cache(self)
+        super().setUp()
+
+    def test_a_cached_user_needs_no_query(self):
+        url = reverse('hr:cache_statistics')
+        self.assertEqual(self.client.get(url).status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+    def assertLoggedOut(self):
+        for url in (reverse('hr:cache_statistics'), reverse('hr:dashboard')):  # sync and async views
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 302, url)
+            self.assertTrue(response['Location'].startswith(settings.LOGIN_URL), url)
+
+    def test_deactivating_a_user_drops_the_cached_user(self):
+        self.assertEqual(self.client.get(reverse('hr:dashboard')).status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        self.assertLoggedOut()
+
+    def test_changing_the_password_drops_the_cached_user(self):
+        self.assertEqual(self.client.get(reverse('hr:dashboard')).status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.set_password('changed')
+            self.user.save()
+        self.assertLoggedOut()
+
+
+# ------------------- RESPONSE CACHE -------------------
+class ResponseCacheTests(HRTestCase):
+    def setUp(self):
+        use_shared_cache(self)
+        super().setUp()
+        self.employee = make_employee('E001')
+        self.salary = make_salary(self.employee, total=1000)
+
+    def get(self, name, **params):
+        response = self.client.get(reverse(name), params)
+        self.assertEqual(response.status_code, 200)
+        content = streamed(response) if response.streaming else response.content.decode()
+        return response['X-Cache'], content
+
+    def test_a_write_to_a_period_invalidates_its_responses(self):
+        january, february = {'year': 2025, 'month': 1}, {'year': 2025, 'month': 2}
+        self.assertEqual(self.get('hr:salary_list', **january)[0], 'MISS')
+        self.assertEqual(self.get('hr:salary_list', **february)[0], 'MISS')
+        self.assertEqual(self.get('hr:salary_list', **january)[0], 'HIT')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.salary.total_salary = 1234
+            self.salary.save()
+        status, content = self.get('hr:salary_list', **january)
+        self.assertEqual(status, 'MISS')
+        self.assertIn('1234', content)
+        self.assertEqual(self.get('hr:salary_list', **february)[0], 'HIT')
+        # attendance in the same period is not a dependency of the salary list
+        with self.captureOnCommitCallbacks(execute=True):
+            make_attendance(self.employee)
+        self.assertEqual(self.get('hr:salary_list', **january)[0], 'HIT')
+
+    def test_a_streamed_export_is_cached_and_invalidated(self):
+        miss, content = self.get('hr:export_salary_csv', year=2025)
+        hit, cached = self.get('hr:export_salary_csv', year=2025)
+        self.assertEqual((miss, hit), ('MISS', 'HIT'))
+        self.assertEqual(cached, content)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            make_salary(self.employee, month=2, total=500)
+        status, content = self.get('hr:export_salary_csv', year=2025)
+        self.assertEqual(status, 'MISS')
+        self.assertEqual(len(list(csv.reader(io.StringIO(content)))), 3)
+
+    def test_renaming_an_employee_invalidates_every_period(self):
+        self.get('hr:salary_list', year=2025, month=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.employee.name = 'Renamed'
+            self.employee.save()
+        status, content = self.get('hr:salary_list', year=2025, month=1)
+        self.assertEqual(status, 'MISS')
+        self.assertIn('Renamed', content)
+
+    def test_a_per_process_cache_is_not_used(self):
+        with self.settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            for _ in range(2):
+                self.assertNotIn('X-Cache', self.client.get(reverse('hr:salary_list')))
+
+
+# ------------------- EXPORTS -------------------
+class ExportTests(HRTestCase):
+    def setUp(self):
+        super().setUp()
+        self.first = make_employee('E001', cnic='12345')
+        self.second = make_employee('E002')
+        make_attendance(self.first, month=1)
+        make_attendance(self.first, month=2, present_days=20, leaves=10)
+        make_attendance(self.second, year=2024, month=12)
+        make_salary(self.first, month=1, total=1000, received=1000)
+        make_salary(self.second, month=1, total=800)
+        make_salary(self.first, month=2, total=1000)
+
+    def export(self, name, **params):
+        response = self.client.get(reverse(name), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return csv_rows(response)
+
+    def test_exports_stream_every_row(self):
+        response = self.client.get(reverse('hr:export_attendance_csv'), {'year': 2025, 'month': 'Feb'})
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename=attendance_Feb_2025.csv')
+        self.assertEqual(csv_rows(response), [{
+            'Employee ID': 'E001', 'Name': 'Employee E001', 'CNIC': '12345', 'Month': 'February', 'Year': '2025',
+            'Total Days': '30', 'Leaves': '10', 'Present Days': '20',
+        }])
+        self.assertEqual([row['Employee ID'] for row in self.export('hr:export_employees_csv')], ['E001', 'E002'])
+        self.assertEqual(len(self.export('hr:export_attendance_csv')), 3)
+        self.assertEqual(len(self.export('hr:export_salary_csv')), 3)
+
+    def test_filters(self):
+        def periods(rows):
+            return sorted((row['Employee ID'], row['Month'], row['Year']) for row in rows)
+        self.assertEqual(periods(self.export('hr:export_attendance_csv', year=2024)), [('E002', 'December', '2024')])
+        self.assertEqual(
+            periods(self.export('hr:export_attendance_csv', month='1')) + periods(self.export('hr:export_attendance_csv', month='december')),
+            [('E001', 'January', '2025'), ('E002', 'December', '2024')],
+        )
+        self.assertEqual(
+            periods(self.export('hr:export_salary_csv', year=2025, month=1)),
+            [('E001', 'January', '2025'), ('E002', 'January', '2025')],
+        )
+        rows = self.export('hr:export_salary_csv', year=2025, status='Unpaid')
+        self.assertEqual(periods(rows), [('E001', 'February', '2025'), ('E002', 'January', '2025')])
+        self.assertEqual({row['Status'] for row in rows}, {'Unpaid'})
+
+    def test_a_bad_year_or_month_is_a_bad_request(self):
+        for params in ({'year': 'abc'}, {'year': '-1'}, {'month': '13'}, {'month': 'Smarch'}):
+            for name in ('hr:export_attendance_csv', 'hr:export_salary_csv'):
+                response = self.client.get(reverse(name), params)
+                self.assertEqual(response.status_code, 400, (name, params))
+                self.assertIn('error', response.json())
+            response = self.client.get(reverse('hr:export_columnar', args=['salary']), params)
+            self.assertEqual(response.status_code, 400, params)
+            response = self.client.post(reverse('hr:export_job', args=['salary']) + '?' + urlencode(params))
+            self.assertEqual(response.status_code, 400, params)
+        self.assertFalse(Job.objects.exists())
+
+
+# ------------------- LETTERS -------------------
+class BulkLetterTests(HRTestCase):
+    def setUp(self):
+        super().setUp()
+        make_employee('E001', designation='Clerk')
+        make_employee('E002', designation='Driver')
+        make_employee('E003', designation='Clerk')
+        make_employee('E004', designation='Clerk', is_active=False)
+
+    def archive(self, **data):
+        response = self.client.post(reverse('hr:generate_letters_bulk'), {'letter_type': 'offer_letter', **data})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        chunks = list(response.streaming_content)
+        return chunks, zipfile.ZipFile(io.BytesIO(b''.join(chunks)))
+
+    def test_each_letter_is_a_streamed_zip_member(self):
+        chunks, archive = self.archive(designation='clerk')
+        self.assertIsNone(archive.testzip())
+        self.assertEqual(archive.namelist(), ['offer_letter_E001.html', 'offer_letter_E003.html'])
+        self.assertIn('<title>MARS BPO - Offer Letter</title>', archive.read('offer_letter_E003.html').decode())
+        # one chunk per finished member, then the central directory
+        self.assertEqual(len([chunk for chunk in chunks if chunk]), 3)
+
+    def test_listed_ids_override_the_filters(self):
+        _, archive = self.archive(employee_ids='E004, E002', designation='clerk')
+        self.assertEqual(archive.namelist(), ['offer_letter_E002.html', 'offer_letter_E004.html'])
+
+        response = self.client.post(reverse('hr:generate_letters_bulk'), {'letter_type': 'offer_letter', 'employee_ids': 'E404'})
+        self.assertEqual(response.status_code, 400)
+
+
+# ------------------- ROW FRAGMENTS -------------------
+class FragmentCacheTests(HRTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.employee = make_employee('E001')
+        self.first = make_salary(self.employee, month=1, total=1000)
+        self.second = make_salary(self.employee, month=2, total=1000)
+
+    def render(self):
+        """``(html, {pk: key} of the rows rendered rather than read from the cache)``."""
+        salaries = Salary.objects.select_related('employee').order_by('month')
+        with mock.patch('hr.fragments.cache', wraps=cache) as spy:
+            html = render_rows('hr/partials/_salary_row.html', list(salaries), 's')
+        stored = spy.set_many.call_args.args[0] if spy.set_many.called else {}
+        return html, {int(key.split(':')[3]): key for key in stored}
+
+    def test_an_updated_row_gets_a_new_key(self):
+        html, keys = self.render()
+        self.assertEqual(set(keys), {self.first.pk, self.second.pk})
+        self.assertEqual(self.render(), (html, {}))
+
+        self.first.total_salary = 1234
+        self.first.save()
+        html, rendered = self.render()
+        self.assertEqual(set(rendered), {self.first.pk})
+        self.assertNotEqual(rendered[self.first.pk], keys[self.first.pk])
+        self.assertIn('1234', html)
+
+        self.employee.name = 'Renamed'
+        self.employee.save()
+        html, rendered = self.render()
+        self.assertEqual(set(rendered), {self.first.pk, self.second.pk})
+        self.assertEqual(html.count('Renamed'), 2)
+
+
+# ------------------- TIMELINE -------------------
+class TimelineTests(HRTestCase):
+    def setUp(self):
+        super().setUp()
+        self.employee = make_employee('E001')
+        make_attendance(self.employee, year=2024, month=12, leaves=2, present_days=20)
+        make_attendance(self.employee, month=1, leaves=2, present_days=28)
+        make_salary(self.employee, month=1, total=Decimal('1000.10'), received=Decimal('400.05'))
+        make_salary(self.employee, month=2, total=1000, received=1000)
+        other = make_employee('E002')
+        make_attendance(other, month=1)
+        make_salary(other, month=3, total=5000)
+
+    def test_running_totals_across_pages(self):
+        page, summary = timeline_page(self.employee, page_size=2)
+        self.assertEqual([(row['year'], row['month']) for row in page], [(2025, 2), (2025, 1)])
+        self.assertEqual([row['to_date'] for row in page], [
+            {'present_days': 48, 'leaves': 4, 'payable': Decimal('2000.10'), 'paid': Decimal('1400.05'),
+             'outstanding': Decimal('600.05')},
+            {'present_days': 48, 'leaves': 4, 'payable': Decimal('1000.10'), 'paid': Decimal('400.05'),
+             'outstanding': Decimal('600.05')},
+        ])
+        self.assertIsNone(page.object_list[0]['attendance'])
+        self.assertEqual(page.object_list[1]['salary']['balance'], Decimal('600.05'))
+
+        older, older_summary = timeline_page(self.employee, page.next_cursor, page_size=2)
+        self.assertEqual([(row['year'], row['month']) for row in older], [(2024, 12)])
+        self.assertIsNone(older.next_cursor)
+        self.assertIsNone(older.object_list[0]['salary'])
+        self.assertEqual(older.object_list[0]['to_date'], {
+            'present_days': 20, 'leaves': 2, 'payable': Decimal('0.00'), 'paid': Decimal('0.00'),
+            'outstanding': Decimal('0.00'),
+        })
+        # every page carries the totals of the whole history
+        self.assertEqual(older_summary, summary)
+        self.assertEqual(summary, {
+            'periods': 3, 'present_days': 48, 'leaves': 4, 'payable': Decimal('2000.10'), 'paid': Decimal('1400.05'),
+            'outstanding': Decimal('600.05'),
+        })
+
+
+# ------------------- COLUMNAR EXPORTS -------------------
+@skipUnless(arrow_available(), "needs pyarrow")
+class ColumnarExportTests(HRTestCase):
+    def test_parquet_round_trip_keeps_exact_money(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        employee = make_employee('E001', designation='Clerk')
+        make_salary(employee, month=1, total=Decimal('1234.56'), received=Decimal('0.10'))
+        make_salary(employee, month=2, total=Decimal('99999999.99'))
+        make_salary(employee, year=2024, month=12, total=1)
+
+        response = self.client.get(reverse('hr:export_columnar', args=['salary']), {'year': 2025})
+        self.assertEqual(response.status_code, 200)
+        table = pq.read_table(io.BytesIO(b''.join(response.streaming_content)))
+
+        self.assertEqual(table.schema.field('total_salary').type, pa.decimal128(12, 2))
+        self.assertEqual(table.schema.field('received_salary').type, pa.decimal128(12, 2))
+        self.assertEqual(table.schema.field('year').type, pa.int32())
+        self.assertEqual(table.schema.field('updated_at').type, pa.timestamp('us', tz='UTC'))
+        rows = table.to_pylist()
+        self.assertEqual(
+            [(row['employee_id'], row['designation'], row['month'], row['total_salary'], row['received_salary'])
+             for row in rows],
+            [('E001', 'Clerk', 1, Decimal('1234.56'), Decimal('0.10')),
+             ('E001', 'Clerk', 2, Decimal('99999999.99'), Decimal('0.00'))],
+        )
+
+
+# ------------------- ADMIN -------------------
+@override_settings(HR_ADMIN_ROLLUP_COUNT_FROM=1)
+class PeriodTableAdminTests(HRTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(User.objects.create_superuser('admin', password='secret'))
+        clerk, driver = make_employee('E001', designation='Clerk'), make_employee('E002', designation='Driver')
+        make_employee('E003', designation='')
+        for employee in (clerk, driver):
+            make_attendance(employee, year=2024, month=12)
+            make_attendance(employee, month=1)
+            make_salary(employee, month=1, total=1000, received=1000 if employee is clerk else 0)
+
+    def changelist(self, model, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(f'admin:hr_{model}_changelist'), params)
+        self.assertEqual(response.status_code, 200)
+        table = f'"hr_{model}"'
+        counts = [query['sql'] for query in queries if 'COUNT(' in query['sql'] and table in query['sql']]
+        return response.context['cl'], counts
+
+    def test_period_filters_count_from_the_rollups(self):
+        for model, params, rows in (
+            ('salary', {}, 2),
+            ('salary', {'year': '2025', 'status__exact': 'Paid'}, 1),
+            ('attendance', {'year': '2024'}, 2),
+            ('attendance', {'year': '2025', 'month__exact': '1'}, 2),
+        ):
+            cl, counts = self.changelist(model, **params)
+            self.assertIsInstance(cl.paginator, EstimatedCountPaginator, params)
+            self.assertEqual((cl.result_count, len(cl.result_list)), (rows, rows), params)
+            self.assertEqual(counts, [], params)
+
+        # rows the rollups can't count are counted by the table
+        for params in ({'q': 'E001'}, {'designation': 'Clerk'}):
+            cl, counts = self.changelist('attendance', **params)
+            self.assertNotIsInstance(cl.paginator, EstimatedCountPaginator, params)
+            self.assertEqual(cl.result_count, 2, params)
+            self.assertNotEqual(counts, [], params)
+
+    def test_year_and_designation_filters(self):
+        cl, _ = self.changelist('attendance')
+        choices = {spec.parameter_name: spec.lookup_choices for spec in cl.filter_specs if hasattr(spec, 'parameter_name')}
+        self.assertEqual(choices['year'], [('2025', '2025'), ('2024', '2024')])
+        self.assertEqual(choices['designation'], [('Clerk', 'Clerk'), ('Driver', 'Driver')])
+
+        cl, _ = self.changelist('attendance', designation='Driver', year='2024')
+        self.assertEqual([(a.employee.employee_id, a.year) for a in cl.result_list], [('E002', 2024)])
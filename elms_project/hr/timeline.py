@@ -0,0 +1,118 @@
+"""
+Per-employee history: every period with attendance and/or salary, newest
+first, with running totals.
+
+One query does it all. The employee's periods come from both tables (a
+month may have only one of the two). Running totals from the first period
+up to each row, and the overall totals, are window functions over the
+whole history. Paging happens outside the windows, so every page carries
+correct totals. Money is summed in integer cents to stay exact on SQLite,
+which stores decimals as floats.
+"""
+from decimal import Decimal
+
+from django.db import connection
+
+from .models import MONTH_NAMES
+from .pagination import KeysetPage, decode_cursor, encode_cursor
+
+TIMELINE_PAGE_SIZE = 24
+CENT = Decimal('0.01')
+
+TIMELINE_SQL = """
+WITH periods AS (
+    SELECT year, month FROM hr_attendance WHERE employee_id = %(employee)s
+    UNION
+    SELECT year, month FROM hr_salary WHERE employee_id = %(employee)s
+),
+history AS (
+    SELECT
+        p.year, p.month,
+        a.total_days, a.leaves, a.present_days,
+        CAST(ROUND(s.total_salary * 100) AS BIGINT) AS payable,
+        CAST(ROUND(s.received_salary * 100) AS BIGINT) AS paid,
+        s.status, s.payment_date,
+        SUM(COALESCE(a.present_days, 0)) OVER running AS present_to_date,
+        SUM(COALESCE(a.leaves, 0)) OVER running AS leaves_to_date,
+        SUM(COALESCE(CAST(ROUND(s.total_salary * 100) AS BIGINT), 0)) OVER running AS payable_to_date,
+        SUM(COALESCE(CAST(ROUND(s.received_salary * 100) AS BIGINT), 0)) OVER running AS paid_to_date,
+        COUNT(*) OVER everything AS periods,
+        SUM(COALESCE(a.present_days, 0)) OVER everything AS present_total,
+        SUM(COALESCE(a.leaves, 0)) OVER everything AS leaves_total,
+        SUM(COALESCE(CAST(ROUND(s.total_salary * 100) AS BIGINT), 0)) OVER everything AS payable_total,
+        SUM(COALESCE(CAST(ROUND(s.received_salary * 100) AS BIGINT), 0)) OVER everything AS paid_total
+    FROM periods p
+    LEFT JOIN hr_attendance a ON a.employee_id = %(employee)s AND a.year = p.year AND a.month = p.month
+    LEFT JOIN hr_salary s ON s.employee_id = %(employee)s AND s.year = p.year AND s.month = p.month
+    WINDOW
+        running AS (ORDER BY p.year, p.month ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW),
+        everything AS ()
+)
+SELECT * FROM history
+{where}
+ORDER BY year DESC, month DESC
+LIMIT %(limit)s
+"""
+
+
+def money(cents):
+    return None if cents is None else (Decimal(int(cents)) / 100).quantize(CENT)
+
+def totals(present, leaves, payable, paid):
+    return {
+        'present_days': present,
+        'leaves': leaves,
+        'payable': money(payable),
+        'paid': money(paid),
+        'outstanding': money(payable - paid),
+    }
+
+def timeline_page(employee, cursor=None, page_size=TIMELINE_PAGE_SIZE):
+    """
+    ``(page, summary)`` for ``employee``'s history, newest period first. The
+    cursor is the (year, month) of the last period shown.
+    """
+    params = {'employee': employee.pk, 'limit': page_size + 1}
+    where = ''
+    after = decode_cursor(cursor, (int, int)) if cursor else None
+    if after:
+        where = "WHERE year < %(year)s OR (year = %(year)s AND month < %(month)s)"
+        params.update(year=after[0], month=after[1])
+    with connection.cursor() as db_cursor:
+        db_cursor.execute(TIMELINE_SQL.format(where=where), params)
+        columns = [column[0] for column in db_cursor.description]
+        rows = [dict(zip(columns, row)) for row in db_cursor.fetchall()]
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor([rows[-1]['year'], rows[-1]['month']])
+
+    periods = []
+    for row in rows:
+        periods.append({
+            'year': row['year'],
+            'month': row['month'],
+            'month_name': MONTH_NAMES[row['month']],
+            'attendance': None if row['total_days'] is None else {
+                'total_days': row['total_days'],
+                'leaves': row['leaves'],
+                'present_days': row['present_days'],
+            },
+            'salary': None if row['payable'] is None else {
+                'total_salary': money(row['payable']),
+                'received_salary': money(row['paid']),
+                'balance': money(row['payable'] - row['paid']),
+                'status': row['status'],
+                'payment_date': row['payment_date'],
+            },
+            'to_date': totals(row['present_to_date'], row['leaves_to_date'], row['payable_to_date'], row['paid_to_date']),
+        })
+
+    summary = None
+    if rows:
+        first = rows[0]
+        summary = {'periods': first['periods'], **totals(
+            first['present_total'], first['leaves_total'], first['payable_total'], first['paid_total'],
+        )}
+    return KeysetPage(periods, next_cursor), summary
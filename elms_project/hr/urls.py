@@ -6,6 +6,7 @@ app_name = 'hr'
 
 urlpatterns = [
     path('', views.dashboard, name='dashboard'),
+    path('charts/periods/', views.chart_series, name='chart_series'),  # ?from=<year>&to=<year>
     
     # 🔹 Login & Logout URLs
     path('login/', auth_views.LoginView.as_view(template_name='hr/login.html'), name='login'),
@@ -17,9 +18,11 @@ urlpatterns = [
     path('employees/<int:pk>/edit/', views.employee_edit, name='employee_edit'),
     path('employees/<int:pk>/delete/', views.employee_delete, name='employee_delete'),
     path('employees/<int:pk>/detail/', views.employee_detail, name='employee_detail'),
+    path('employees/<int:pk>/timeline/', views.employee_timeline, name='employee_timeline'),
     
     # Attendance URLs
     path('attendance/', views.attendance_list, name='attendance_list'),
+    path('attendance/grid/', views.attendance_grid, name='attendance_grid'),
     path('attendance/create/', views.attendance_create, name='attendance_create'),
     path('attendance/<int:pk>/edit/', views.attendance_edit, name='attendance_edit'),
     path('attendance/<int:pk>/delete/', views.attendance_delete, name='attendance_delete'),
@@ -29,19 +32,36 @@ urlpatterns = [
     path('salary/create/', views.salary_create, name='salary_create'),
     path('salary/<int:pk>/edit/', views.salary_edit, name='salary_edit'),
     path('salary/<int:pk>/delete/', views.salary_delete, name='salary_delete'),
+    path('salary/<int:pk>/payments/', views.salary_payment, name='salary_payment'),
+    path('salary/generate/', views.salary_generate, name='salary_generate'),
     
     # Letters URLs
     path('generate-letter/', views.generate_letter, name='generate_letter'),
     path('letters/', views.generate_letter, name='letters'),  
+    path('letters/bulk/', views.generate_letters_bulk, name='generate_letters_bulk'),
 
     # Export URLs
     path('export/employees/', views.export_employees_csv, name='export_employees_csv'),
     path('export/attendance/', views.export_attendance_csv, name='export_attendance_csv'),
     path('export/salary/', views.export_salary_csv, name='export_salary_csv'),
+    path('export/<str:name>/job/', views.export_job, name='export_job'),
+    path('export/<str:name>/columnar/', views.export_columnar, name='export_columnar'),  # ?format=parquet|arrow
+    path('export/<str:kind>/changes/', views.export_changes, name='export_changes'),  # ?since=&format=csv|jsonl
+
+    # Background jobs
+    path('jobs/<int:pk>/', views.job_status, name='job_status'),
+    path('jobs/<int:pk>/download/', views.job_download, name='job_download'),
+
+    # Import URLs
+    path('import/', views.import_payroll, name='import_payroll'),
 
     # Employee details
+    path('employee-details/', views.get_employee_details, name='get_employee_details_batch'),  # ?ids=a,b,c
     path('employee-details/<str:employee_id>/', views.get_employee_details, name='get_employee_details'),
 
+    # Response cache hit/miss counters
+    path('cache-stats/', views.cache_statistics, name='cache_statistics'),
+
     # Requests list
     path('requests/', views.requests_list, name='requests_list'),
     path('stars/', views.star_animation, name='star_animation'),  
@@ -1,49 +1,120 @@
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, get_object_or_404, redirect
-from django.http import HttpResponse, JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
 from django.template.loader import render_to_string
 from django.contrib.auth.decorators import login_required
-from django.contrib import messages
-from django.db.models import Q, Sum
+from django.contrib import admin, messages
+from django.db import IntegrityError, transaction
+from django.contrib.admin.views.decorators import staff_member_required
 from django.utils import timezone
-from datetime import datetime
-from .models import Employee, Attendance, Salary
-from .forms import EmployeeForm, AttendanceForm, SalaryForm
+from django.utils.cache import patch_cache_control
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from datetime import datetime, timedelta
+from .models import Employee, Attendance, Salary, SalaryPayment, Job, MONTH_NAMES, REFERENCE_POSTED, parse_month
+from .forms import EmployeeForm, AttendanceForm, SalaryForm, SalaryPaymentForm, PayrollImportForm, PayrollGenerateForm
+from .importers import import_file
+from .columnar import COLUMNAR_TABLES, FORMATS, arrow_available, write_table
+from .exports import CHANGE_FEEDS, EXPORT_CHUNK_SIZE, EXPORTS, attendance_export, change_export, employee_export, salary_export
+from .jobs import enqueue
+from .payroll import generate_payroll
+from .payments import import_payment_file, post_payment
+from .letters import LETTER_TEMPLATES, bulk_letter_employees, letter_documents, pdf_available, stream_zip
+from .pagination import akeyset_paginate, keyset_paginate, next_page_query
+from .caching import cache_period_response, cache_stats, shared_cache
+from .charts import cached_series, chart_etag, chart_range, local_series
+from .rollups import aget_rollup
+from .search import search_employees
+from .lookups import lookup_employees
+from .timeline import timeline_page
+from .grid import GRID_FIELDS, GRID_PAGE_SIZE, grid_rows, parse_cells, save_grid
+from . import perf
 import csv
+import hashlib
+import json
+import os
+import tempfile
+from itertools import islice
+
+# Async views render in a worker thread: templates read request.user, the
+# session and messages, which are sync-only.
+arender = sync_to_async(render)
 
 # ------------------- DASHBOARD -------------------
+def current_period(request):
+    now = timezone.now()
+    return now.year, now.month
+
 @login_required
-def dashboard(request):
-    emp_count = Employee.objects.filter(is_active=True).count()
-    current_month = timezone.now().strftime('%B')
+@cache_period_response(['attendance', 'salary'], period=current_period)
+async def dashboard(request):
+    emp_count = await Employee.objects.filter(is_active=True).acount()
+    current_month = timezone.now().month
     current_year = timezone.now().year
-
-    attendance_stats = Attendance.objects.filter(month=current_month, year=current_year)\
-                        .aggregate(total_present=Sum('present_days'), total_leaves=Sum('leaves'))
-    salary_stats = Salary.objects.filter(month=current_month, year=current_year)\
-                        .aggregate(total_payable=Sum('total_salary'), total_paid=Sum('received_salary'))
+    rollup = await aget_rollup(current_year, current_month)
 
     context = {
         'emp_count': emp_count,
-        'attendance_stats': attendance_stats,
-        'salary_stats': salary_stats,
-        'current_month': current_month,
-        'current_year': current_year
+        'rollup': rollup,
+        'attendance_stats': {'total_present': rollup.present_days, 'total_leaves': rollup.leaves},
+        'salary_stats': {'total_payable': rollup.total_payable, 'total_paid': rollup.total_paid},
+        'current_month': MONTH_NAMES[current_month],
+        'current_year': current_year,
+        # names used by the dashboard cards
+        'employees_count': emp_count,
+        'attendance_count': rollup.attendance_count,
+        'salary_count': rollup.salary_count,
+        'pending_requests': rollup.unpaid_count,
     }
-    return render(request, 'hr/dashboard.html', context)
+    return await arender(request, 'hr/dashboard.html', context)
+
+@login_required
+def chart_series(request):
+    """
+    Monthly attendance and payroll series for ``?from=<year>&to=<year>``
+    (default: this year). Polls that send back the ETag get an empty 304
+    until a row in the range changes.
+    """
+    try:
+        first, last = chart_range(request.GET, timezone.now().year)
+    except ValueError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+
+    if shared_cache():
+        etag, series = chart_etag(first, last), None
+    else:
+        etag, *series = local_series(first, last)
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match and etag in parse_etags(if_none_match):
+        response = HttpResponseNotModified()
+    else:
+        payload, last_modified = series or cached_series(first, last, etag)
+        since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+        if not if_none_match and since and last_modified and int(last_modified) <= since:
+            response = HttpResponseNotModified()
+        else:
+            response = JsonResponse(payload)
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified)
+    response['ETag'] = etag
+    # cached, but checked with the server before every reuse
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
 
 # ------------------- EMPLOYEES -------------------
 @login_required
-def employee_list(request):
+async def employee_list(request):
     query = request.GET.get('q', '')
-    employees = Employee.objects.filter(
-        Q(employee_id__icontains=query) |
-        Q(name__icontains=query) |
-        Q(cnic__icontains=query) |
-        Q(designation__icontains=query)
-    ).order_by('employee_id') if query else Employee.objects.all().order_by('employee_id')
+    if query:
+        page = await sync_to_async(search_employees)(query, request.GET.get('cursor'))
+    else:
+        page = await akeyset_paginate(Employee.objects.all(), ('employee_id',), request.GET.get('cursor'))
 
     template = 'hr/partials/_employee_table.html' if request.headers.get('HX-Request') == 'true' else 'hr/employee_list.html'
-    return render(request, template, {'employees': employees})
+    return await arender(request, template, {'employees': page, 'next_page_query': next_page_query(request, page)})
 
 @login_required
 def employee_create(request):
@@ -81,6 +152,17 @@ def employee_detail(request, pk):
     }
     return render(request, 'hr/employee_detail.html', context)
 
+@login_required
+def employee_timeline(request, pk):
+    emp = get_object_or_404(Employee, pk=pk)
+    page, summary = timeline_page(emp, request.GET.get('cursor'))
+    return JsonResponse({
+        'employee': {'employee_id': emp.employee_id, 'name': emp.name, 'designation': emp.designation},
+        'summary': summary,
+        'periods': page.object_list,
+        'next': f'{request.path}?{next_page_query(request, page)}' if page.has_next else None,
+    })
+
 @login_required
 def employee_delete(request, pk):
     emp = get_object_or_404(Employee, pk=pk)
@@ -95,13 +177,17 @@ def employee_delete(request, pk):
 
 # ------------------- ATTENDANCE -------------------
 @login_required
-def attendance_list(request):
+@cache_period_response(['attendance'])
+async def attendance_list(request):
     month = request.GET.get('month', '')
     year = request.GET.get('year', '')
-    attends = Attendance.objects.select_related('employee').all().order_by('-year', '-month')
-    if month: attends = attends.filter(month__iexact=month)
+    attends = Attendance.objects.select_related('employee').all()
+    if month: attends = attends.filter(month=parse_month(month))
     if year: attends = attends.filter(year=year)
-    return render(request, 'hr/attendance_list.html', {'attends': attends})
+    page = await akeyset_paginate(attends, ('-year', '-month', '-pk'), request.GET.get('cursor'))
+
+    template = 'hr/partials/_attendance_table.html' if request.headers.get('HX-Request') == 'true' else 'hr/attendance_list.html'
+    return await arender(request, template, {'attends': page, 'next_page_query': next_page_query(request, page)})
 
 @login_required
 def attendance_create(request):
@@ -139,17 +225,47 @@ def attendance_delete(request, pk):
         return redirect('hr:attendance_list')
     return render(request, 'hr/partials/_confirm_delete.html', {'obj': a, 'obj_type': 'attendance record'})
 
+def grid_period(data):
+    now = timezone.now()
+    month = parse_month(data.get('month', '')) or now.month
+    year = data.get('year', '')
+    return (int(year) if year.isdigit() else now.year), month
+
+@login_required
+def attendance_grid(request):
+    year, month = grid_period(request.POST if request.method == 'POST' else request.GET)
+    if request.method == 'POST':
+        rows = save_grid(year, month, parse_cells(request.POST))
+        errors = sum(1 for row in rows if row.error)
+        return render(request, 'hr/partials/_attendance_grid_saved.html', {
+            'rows': rows, 'errors': errors, 'year': year, 'month': month,
+        })
+
+    employees = Employee.objects.filter(is_active=True)
+    page = keyset_paginate(employees, ('employee_id',), request.GET.get('cursor'), page_size=GRID_PAGE_SIZE)
+    context = {
+        'rows': grid_rows(page.object_list, year, month), 'page': page,
+        'next_page_query': next_page_query(request, page),
+        'year': year, 'month': month, 'months': MONTH_NAMES, 'fields': GRID_FIELDS,
+    }
+    template = 'hr/partials/_attendance_grid_rows.html' if request.headers.get('HX-Request') == 'true' else 'hr/attendance_grid.html'
+    return render(request, template, context)
+
 # ------------------- SALARY -------------------
 @login_required
-def salary_list(request):
+@cache_period_response(['salary'])
+async def salary_list(request):
     month = request.GET.get('month', '')
     year = request.GET.get('year', '')
     status = request.GET.get('status', '')
-    salaries = Salary.objects.select_related('employee').all().order_by('-year', '-month')
-    if month: salaries = salaries.filter(month__iexact=month)
+    salaries = Salary.objects.select_related('employee').all()
+    if month: salaries = salaries.filter(month=parse_month(month))
     if year: salaries = salaries.filter(year=year)
     if status: salaries = salaries.filter(status=status)
-    return render(request, 'hr/salary_list.html', {'salaries': salaries})
+    page = await akeyset_paginate(salaries, ('-year', '-month', '-pk'), request.GET.get('cursor'))
+
+    template = 'hr/partials/_salary_table.html' if request.headers.get('HX-Request') == 'true' else 'hr/salary_list.html'
+    return await arender(request, template, {'salaries': page, 'next_page_query': next_page_query(request, page)})
 
 @login_required
 def salary_create(request):
@@ -165,16 +281,47 @@ def salary_create(request):
 
 @login_required
 def salary_edit(request, pk):
-    s = get_object_or_404(Salary, pk=pk)
-    form = SalaryForm(request.POST or None, instance=s)
-    if request.method == 'POST' and form.is_valid():
+    if request.method != 'POST':
+        s = get_object_or_404(Salary, pk=pk)
+        return render(request, 'hr/partials/_salary_form.html', {'form': SalaryForm(instance=s), 's': s})
+    with transaction.atomic():
+        # read under a row lock: save() writes every column back, received_salary
+        # included, and must not undo a payment posted since the row was read
+        s = get_object_or_404(Salary.objects.select_for_update(), pk=pk)
+        form = SalaryForm(request.POST, instance=s)
+        if not form.is_valid():
+            return render(request, 'hr/partials/_salary_form.html', {'form': form, 's': s})
         s = form.save()
-        if request.headers.get('HX-Request') == 'true':
-            html = render_to_string('hr/partials/_salary_row.html', {'s': s})
-            return HttpResponse(html)
-        messages.success(request, f'Salary record for {s.employee.name} updated successfully!')
-        return redirect('hr:salary_list')
-    return render(request, 'hr/partials/_salary_form.html', {'form': form, 's': s})
+    if request.headers.get('HX-Request') == 'true':
+        html = render_to_string('hr/partials/_salary_row.html', {'s': s})
+        return HttpResponse(html)
+    messages.success(request, f'Salary record for {s.employee.name} updated successfully!')
+    return redirect('hr:salary_list')
+
+@login_required
+def salary_payment(request, pk):
+    s = get_object_or_404(Salary.objects.select_related('employee'), pk=pk)
+    form = SalaryPaymentForm(request.POST or None, instance=SalaryPayment(salary=s))
+    if request.method == 'POST' and form.is_valid():
+        try:
+            post_payment(s, user=request.user, **form.cleaned_data)
+        except IntegrityError:
+            # the same reference was posted between validation and the insert
+            form.add_error('reference', REFERENCE_POSTED)
+        else:
+            s.refresh_from_db(fields=['received_salary', 'status', 'payment_date'])
+            if request.headers.get('HX-Request') == 'true':
+                html = render_to_string('hr/partials/_salary_row.html', {'s': s})
+                return HttpResponse(html)
+            messages.success(request, f'Payment of {form.cleaned_data["amount"]} recorded for {s.employee.name}.')
+            return redirect('hr:salary_list')
+    payments = s.payments.select_related('recorded_by')[:20]
+    response = render(request, 'hr/partials/_salary_payment_form.html', {'form': form, 's': s, 'payments': payments})
+    if request.method == 'POST':
+        # the form targets the salary row; show the errors in the modal instead
+        response['HX-Retarget'] = '#modal-body'
+        response['HX-Reswap'] = 'innerHTML'
+    return response
 
 @login_required
 def salary_delete(request, pk):
@@ -187,6 +334,20 @@ def salary_delete(request, pk):
         return redirect('hr:salary_list')
     return render(request, 'hr/partials/_confirm_delete.html', {'obj': s, 'obj_type': 'salary record'})
 
+@login_required
+def salary_generate(request):
+    form = PayrollGenerateForm(request.POST or None)
+    summary = None
+    if request.method == 'POST' and form.is_valid():
+        summary = generate_payroll(
+            form.cleaned_data['year'], form.cleaned_data['month'],
+            skip_existing=form.cleaned_data['skip_existing'],
+        )
+        if request.headers.get('HX-Request') != 'true':
+            messages.success(request, f"Payroll generated: {summary['created']} created, {summary['updated']} updated.")
+            return redirect('hr:salary_list')
+    return render(request, 'hr/partials/_payroll_form.html', {'form': form, 'summary': summary})
+
 # ------------------- LETTERS -------------------
 @login_required
 def generate_letter(request):
@@ -195,14 +356,7 @@ def generate_letter(request):
         letter_type = request.POST.get('letter_type', 'offer_letter')
 
         employee = get_object_or_404(Employee, employee_id=employee_id)
-        template_map = {
-            'offer_letter': 'hr/letters/offer_letter.html',
-            'experience_letter': 'hr/letters/experience_letter.html',
-            'resignation_letter': 'hr/letters/resignation_letter.html',
-            'termination_letter': 'hr/letters/termination_letter.html',
-            'warning_letter': 'hr/letters/warning_letter.html',
-        }
-        template_name = template_map.get(letter_type)
+        template_name = LETTER_TEMPLATES.get(letter_type)
         if not template_name:
             return HttpResponse("Invalid letter type.", status=400)
 
@@ -210,75 +364,285 @@ def generate_letter(request):
 
     return render(request, 'hr/partials/_letter_form.html')
 
-# ------------------- EXPORTS -------------------
 @login_required
-def export_employees_csv(request):
-    qs = Employee.objects.all()
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename=employees.csv'
-    writer = csv.writer(response)
-    writer.writerow(['Employee ID','Name','Father Name','Mother Name','CNIC','Designation','Contact','Address', 'Date Joined', 'Status'])
-    for e in qs:
-        writer.writerow([
-            e.employee_id, e.name, e.father_name or '', e.mother_name or '', 
-            e.cnic or '', e.designation or '', e.contact_number or '', 
-            e.address or '', e.date_joined, 'Active' if e.is_active else 'Inactive'
-        ])
+def generate_letters_bulk(request):
+    if request.method != 'POST':
+        return render(request, 'hr/partials/_letter_form.html')
+
+    letter_type = request.POST.get('letter_type', '')
+    as_pdf = request.POST.get('format') == 'pdf'
+    error = None
+    if letter_type not in LETTER_TEMPLATES:
+        error = "Invalid letter type."
+    elif as_pdf and not pdf_available():
+        error = "PDF letters require WeasyPrint (pip install weasyprint); choose HTML instead."
+    else:
+        employees = bulk_letter_employees(request.POST)
+        if not employees.exists():
+            error = "No employees match."
+    htmx = request.headers.get('HX-Request') == 'true'
+    if error:
+        # htmx only swaps 2xx responses
+        return render(request, 'hr/partials/_letter_form.html', {'bulk_error': error}, status=200 if htmx else 400)
+
+    if htmx:
+        params = {key: request.POST.get(key, '') for key in ('employee_ids', 'designation', 'status', 'letter_type', 'format')}
+        job = enqueue('letters', params, request.user)
+        return render(request, 'hr/partials/_job_status.html', {'job': job})
+
+    # one query for the whole batch, streamed so large batches stay out of memory
+    documents = letter_documents(employees.iterator(chunk_size=500), letter_type, as_pdf)
+    archive = stream_zip(documents)
+    if isinstance(request, ASGIRequest):
+        archive = aiterate(archive)
+    response = StreamingHttpResponse(archive, content_type='application/zip')
+    response['Content-Disposition'] = f'attachment; filename="{letter_type}s.zip"'
     return response
 
-@login_required
-def export_attendance_csv(request):
-    month = request.GET.get('month', '')
-    year = request.GET.get('year', '')
-    qs = Attendance.objects.select_related('employee').all()
-    if month: qs = qs.filter(month__iexact=month)
-    if year: qs = qs.filter(year=year)
-
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f'attachment; filename=attendance_{month}_{year}.csv'
-    writer = csv.writer(response)
-    writer.writerow(['Employee ID','Name','CNIC','Month','Year','Total Days','Leaves','Present Days'])
-    for a in qs:
-        writer.writerow([
-            a.employee.employee_id, a.employee.name, a.employee.cnic or '', 
-            a.month, a.year, a.total_days, a.leaves, a.present_days
-        ])
+# ------------------- EXPORTS -------------------
+class Echo:
+    """File-like object whose write() hands the encoded row straight back."""
+    def write(self, value):
+        return value
+
+def export_rows(request, queryset, row):
+    """
+    ``row(*values)`` for each row of a values_list() queryset, read in chunks.
+    Under ASGI this is an async iterator and under WSGI a plain one, because
+    Django buffers the whole stream when its kind does not match the server.
+    """
+    values = queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    if isinstance(request, ASGIRequest):
+        # What aiterator() does, which for values_list() querysets runs the
+        # query on the event loop itself: a lazy sync iterator advanced one
+        # chunk at a time in a worker thread.
+        async def rows():
+            while chunk := await sync_to_async(list)(islice(values, EXPORT_CHUNK_SIZE)):
+                for fields in chunk:
+                    yield row(*fields)
+        return rows()
+    return (row(*fields) for fields in values)
+
+async def aiterate(iterable):
+    """
+    ``iterable`` as an async iterator, advanced one item at a time in a
+    worker thread; for sync generators that query the database, like
+    export_rows() does under ASGI.
+    """
+    iterator = iter(iterable)
+    advance = sync_to_async(next)
+    while (item := await advance(iterator, None)) is not None:
+        yield item
+
+def stream_csv(filename, header, rows):
+    writer = csv.writer(Echo())
+
+    if hasattr(rows, '__aiter__'):
+        async def generate():
+            yield writer.writerow(header)
+            async for row in rows:
+                yield writer.writerow(row)
+    else:
+        def generate():
+            yield writer.writerow(header)
+            for row in rows:
+                yield writer.writerow(row)
+
+    response = StreamingHttpResponse(generate(), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename={filename}'
+    return response
+
+def stream_jsonl(filename, header, rows):
+    def line(row):
+        return json.dumps(dict(zip(header, row)), cls=DjangoJSONEncoder) + '\n'
+
+    if hasattr(rows, '__aiter__'):
+        async def generate():
+            async for row in rows:
+                yield line(row)
+    else:
+        def generate():
+            for row in rows:
+                yield line(row)
+
+    response = StreamingHttpResponse(generate(), content_type='application/x-ndjson')
+    response['Content-Disposition'] = f'attachment; filename={filename}'
     return response
 
 @login_required
-def export_salary_csv(request):
-    month = request.GET.get('month', '')
-    year = request.GET.get('year', '')
-    status = request.GET.get('status', '')
-    qs = Salary.objects.select_related('employee').all()
-    if month: qs = qs.filter(month__iexact=month)
-    if year: qs = qs.filter(year=year)
-    if status: qs = qs.filter(status=status)
-
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f'attachment; filename=salary_{month}_{year}.csv'
-    writer = csv.writer(response)
-    writer.writerow(['Employee ID','Name','CNIC','Month','Year','Total Salary','Received Salary','Status','Payment Date'])
-    for s in qs:
-        writer.writerow([
-            s.employee.employee_id, s.employee.name, s.employee.cnic or '', 
-            s.month, s.year, s.total_salary, s.received_salary, 
-            s.status, s.payment_date or ''
-        ])
+@cache_period_response([])
+async def export_employees_csv(request):
+    filename, header, qs, row = employee_export(request.GET)
+    return stream_csv(filename, header, export_rows(request, qs, row))
+
+@login_required
+@cache_period_response(['attendance'])
+async def export_attendance_csv(request):
+    try:
+        filename, header, qs, row = attendance_export(request.GET)
+    except ValueError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    return stream_csv(filename, header, export_rows(request, qs, row))
+
+@login_required
+@cache_period_response(['salary'])
+async def export_salary_csv(request):
+    try:
+        filename, header, qs, row = salary_export(request.GET)
+    except ValueError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    return stream_csv(filename, header, export_rows(request, qs, row))
+
+@login_required
+async def export_changes(request, kind):
+    """
+    Change feed for incremental syncs: ``?since=<watermark>`` returns only
+    rows saved or deleted after it, as CSV or ``format=jsonl``. Pass the
+    X-Watermark header of each response as the next ``since``.
+    """
+    if kind not in CHANGE_FEEDS:
+        raise Http404("Unknown change feed.")
+    since = None
+    if request.GET.get('since'):
+        # an unencoded "+00:00" offset arrives as " 00:00"
+        since = parse_datetime(request.GET['since'].replace(' ', '+'))
+        if since is None:
+            return JsonResponse({'error': 'since must be an ISO 8601 date and time'}, status=400)
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+    # rows saved in transactions still open now can carry earlier
+    # timestamps; stopping short of "now" keeps them in the next window
+    until = timezone.now() - timedelta(seconds=settings.HR_CHANGE_FEED_LAG)
+
+    filename, header, qs, row = change_export(kind, since, until)
+    if request.GET.get('format') == 'jsonl':
+        response = stream_jsonl(filename.replace('.csv', '.jsonl'), header, export_rows(request, qs, row))
+    else:
+        response = stream_csv(filename, header, export_rows(request, qs, row))
+    response['X-Watermark'] = until.isoformat()
     return response
 
-# ------------------- UTILITIES -------------------
 @login_required
-def get_employee_details(request, employee_id):
+def export_columnar(request, name):
+    """Typed Parquet (default) or ``format=arrow`` file of a table, with the CSV exports' filters."""
+    fmt = request.GET.get('format', 'parquet')
+    if name not in COLUMNAR_TABLES or fmt not in FORMATS:
+        raise Http404("Unknown table or format.")
+    if not arrow_available():
+        return HttpResponse("Parquet and Arrow exports require pyarrow (pip install pyarrow).", status=400)
+    # built in record batches into a temporary file, which is deleted once sent
+    output = tempfile.TemporaryFile()
+    try:
+        write_table(output, name, request.GET, fmt, compression='zstd')
+    except ValueError as exc:
+        output.close()
+        return JsonResponse({'error': str(exc)}, status=400)
+    output.seek(0)
+    return FileResponse(output, as_attachment=True, filename=f'{name}{FORMATS[fmt]}')
+
+# ------------------- JOBS -------------------
+def user_job(request, pk):
+    jobs = Job.objects.all() if request.user.is_staff else Job.objects.filter(created_by=request.user)
+    return get_object_or_404(jobs, pk=pk)
+
+@login_required
+def export_job(request, name):
+    if request.method != 'POST' or name not in EXPORTS:
+        return HttpResponse(status=400)
+    params = {key: request.GET.get(key, '') for key in ('month', 'year', 'status', 'format')}
+    if params['format'] in FORMATS and not arrow_available():
+        return HttpResponse("Parquet and Arrow exports require pyarrow (pip install pyarrow).", status=400)
     try:
-        employee = Employee.objects.get(employee_id=employee_id)
-        return JsonResponse({
-            'name': employee.name,
-            'designation': employee.designation,
-            'cnic': employee.cnic
+        EXPORTS[name](params)  # checks the filters now rather than failing every attempt
+    except ValueError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    job = enqueue('export', {'export': name, **params}, request.user)
+    return render(request, 'hr/partials/_job_status.html', {'job': job})
+
+@login_required
+def job_status(request, pk):
+    return render(request, 'hr/partials/_job_status.html', {'job': user_job(request, pk)})
+
+@login_required
+def job_download(request, pk):
+    job = user_job(request, pk)
+    if job.status != 'done' or not job.file:
+        raise Http404("This job has no file yet.")
+    path = os.path.join(settings.MEDIA_ROOT, job.file)
+    if not os.path.exists(path):
+        raise Http404("The job's file has been removed.")
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=job.filename)
+
+# ------------------- IMPORTS -------------------
+@login_required
+def import_payroll(request):
+    form = PayrollImportForm(request.POST or None, request.FILES or None)
+    result = None
+    if request.method == 'POST' and form.is_valid():
+        upload = form.cleaned_data['file']
+        try:
+            if form.cleaned_data['kind'] == 'payments':
+                result = import_payment_file(upload, upload.name, user=request.user, dry_run=form.cleaned_data['dry_run'])
+            else:
+                result = import_file(form.cleaned_data['kind'], upload, upload.name, dry_run=form.cleaned_data['dry_run'])
+        except (ValueError, csv.Error) as exc:
+            form.add_error('file', f'Could not read file: {exc}')
+        except IntegrityError:
+            # a reference in the file was posted by someone else during the import
+            form.add_error('file', f'{REFERENCE_POSTED} Nothing was imported; post the file again to skip it.')
+    return render(request, 'hr/partials/_import_form.html', {'form': form, 'result': result})
+
+# ------------------- UTILITIES -------------------
+EMPLOYEE_LOOKUP_BATCH_LIMIT = 500
+
+def lookup_response(request, payload):
+    """JSON response with an ETag; a matching If-None-Match gets an empty 304."""
+    response = JsonResponse(payload)
+    etag = quote_etag(hashlib.md5(response.content).hexdigest())
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        response = HttpResponseNotModified()
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, max_age=settings.HR_LOOKUP_MAX_AGE)
+    return response
+
+@login_required
+async def get_employee_details(request, employee_id=None):
+    if employee_id is None:
+        employee_ids = [value.strip() for value in request.GET.get('ids', '').split(',') if value.strip()]
+        if not employee_ids:
+            return JsonResponse({'error': 'Pass employee IDs as ?ids=a,b,c'}, status=400)
+        if len(employee_ids) > EMPLOYEE_LOOKUP_BATCH_LIMIT:
+            return JsonResponse({'error': f'At most {EMPLOYEE_LOOKUP_BATCH_LIMIT} IDs per request'}, status=400)
+        found = await lookup_employees(employee_ids)
+        return lookup_response(request, {
+            'employees': {employee_id: details for employee_id, details in found.items() if details},
+            'missing': [employee_id for employee_id, details in found.items() if not details],
         })
-    except Employee.DoesNotExist:
+
+    details = (await lookup_employees([employee_id]))[employee_id]
+    if details is None:
         return JsonResponse({'error': 'Employee not found'}, status=404)
+    return lookup_response(request, details)
+
+@login_required
+def cache_statistics(request):
+    return JsonResponse(cache_stats())
+
+@staff_member_required
+def perf_report(request):
+    if request.method == 'POST':
+        perf.clear()
+        return redirect(request.path)
+    rows = perf.report()
+    if request.GET.get('format') == 'json':
+        return JsonResponse({'buffered': len(perf.records()), 'views': rows})
+    context = {
+        **admin.site.each_context(request),
+        'title': 'View performance',
+        'rows': rows,
+        'buffered': len(perf.records()),
+    }
+    return render(request, 'admin/hr/perf_report.html', context)
 
 @login_required
 def requests_list(request):
@@ -286,15 +650,3 @@ def requests_list(request):
 @login_required
 def star_animation(request):
     return render(request, 'hr/stars.html')
-def dashboard(request):
-    context = {
-        'employees_count': 42,
-        'attendance_count': 127,
-        'salary_count': 86,
-        'pending_requests': 12,
-    }
-    return render(request, 'hr/dashboard.html', context)
-def employee_list(request):
-    employees = Employee.objects.all()  # or any other queryset
-    return render(request, 'hr/employee_list.html', {'employees': employees})
-